@@ -18,8 +18,9 @@ sys.path.insert(0, current_dir)
 def check_spacy_model():
     """Check if en_core_web_sm model is installed"""
     try:
-        import spacy
-        nlp = spacy.load('en_core_web_sm')
+        # the registry keeps the pipeline loaded across Streamlit reruns
+        from pyresparser import ResumeParser
+        ResumeParser.warm_up()
         return True
     except (OSError, IOError):
         return False
@@ -66,11 +67,15 @@ if not check_spacy_model():
 
 try:
     from pyresparser import ResumeParser
+    from pyresparser.extraction import ExtractionLimits
 except ImportError as e:
     st.error(f"Error: Could not import ResumeParser. {str(e)}")
     st.info("Make sure you're running from the pyresparser directory and that the package is properly set up.")
     st.stop()
 
+# keep an oversized upload from blocking the app
+UPLOAD_LIMITS = ExtractionLimits(max_seconds=30, max_pages=50)
+
 # Page configuration
 st.set_page_config(
     page_title="Resume Parser - HireLens",
@@ -178,8 +183,13 @@ if uploaded_file is not None:
                     f.write(uploaded_file.getbuffer())
                 
                 # Parse resume
-                parser = ResumeParser(temp_file_path)
+                parser = ResumeParser(temp_file_path, limits=UPLOAD_LIMITS)
                 data = parser.get_extracted_data()
+                if data.get('truncated'):
+                    st.warning(
+                        "Resume is too long, only part of it was parsed "
+                        f"({data['truncated']} limit reached)."
+                    )
                 
                 # Clean up temp file
                 if os.path.exists(temp_file_path):
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""
+Compare every installed text extraction backend, see
+`pyresparser.backends`, on the same synthetic corpus. For each backend
+the extraction time is reported together with two fidelity scores
+against the lines the documents were generated from: the share of
+source words found in the text and the share of source lines kept as a
+line of their own, which section based extraction relies on.
+
+    python benchmarks/bench_backends.py [documents] [pages]
+"""
+import io
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pyresparser import backends, utils  # noqa: F401, registers backends
+from benchmarks.corpus import make_docx, make_pdf, resume_lines
+
+
+def flatten(pages):
+    return [line for page in pages for line in page]
+
+
+def make_txt(pages):
+    return '\n'.join(flatten(pages)).encode('utf-8')
+
+
+# builders take the lines of every page
+FORMATS = [
+    ('.pdf', make_pdf),
+    ('.docx', lambda pages: make_docx(flatten(pages))),
+    ('.txt', make_txt),
+]
+
+
+def get_resume(data, extension):
+    resume = io.BytesIO(data)
+    resume.name = 'resume' + extension
+    return resume
+
+
+def fidelity(source, text):
+    expected = Counter(' '.join(source).split())
+    found = Counter(text.split())
+    words = sum((expected & found).values()) / float(sum(expected.values()))
+    text_lines = set(line.strip() for line in text.splitlines())
+    lines = sum(line in text_lines for line in source) / float(len(source))
+    return words, lines
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    pages = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    documents = [
+        [resume_lines(seed + page) for page in range(pages)]
+        for seed in range(count)
+    ]
+    sources = [flatten(document) for document in documents]
+    print('{} documents of {} pages'.format(count, pages))
+    for extension, build in FORMATS:
+        corpus = [build(document) for document in documents]
+        for backend in backends.registry.backends(extension):
+            start = time.perf_counter()
+            texts = [
+                backend.extract(get_resume(data, extension)).text
+                for data in corpus
+            ]
+            seconds = time.perf_counter() - start
+            scores = [
+                fidelity(source, text)
+                for source, text in zip(sources, texts)
+            ]
+            print('{:<6} {:<10} {:8.2f} ms/doc  words {:6.1%}  '
+                  'lines {:6.1%}'.format(
+                      extension,
+                      backend.name,
+                      seconds * 1000 / count,
+                      sum(score[0] for score in scores) / count,
+                      sum(score[1] for score in scores) / count
+                  ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+"""
+Compare the streaming .docx reader, `pyresparser.docx_reader`, with
+docx2txt on large documents with embedded images: time per document,
+peak memory allocated while extracting and whether both give the same
+text.
+
+    python benchmarks/bench_docx.py [documents] [pages] [images]
+"""
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import docx2txt
+from pyresparser.docx_reader import extract_docx
+from benchmarks.corpus import make_docx, resume_lines
+
+
+def previous(resume):
+    temp = docx2txt.process(resume)
+    text = [line.replace('\t', ' ') for line in temp.split('\n') if line]
+    return ' '.join(text)
+
+
+def measure(extract, corpus):
+    start = time.perf_counter()
+    texts = [extract(io.BytesIO(data)) for data in corpus]
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    extract(io.BytesIO(corpus[0]))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return texts, seconds, peak
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    pages = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    images = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+    corpus = [
+        make_docx(
+            [line for page in range(pages)
+             for line in resume_lines(seed + page)],
+            images=images
+        )
+        for seed in range(count)
+    ]
+    print('{} documents of {} pages and {} images, {:.1f} MB each'.format(
+        count,
+        pages,
+        images,
+        len(corpus[0]) / 1024.0 / 1024.0
+    ))
+    results = []
+    for name, extract in [('docx2txt', previous), ('stream', extract_docx)]:
+        texts, seconds, peak = measure(extract, corpus)
+        results.append(texts)
+        print('{:<10} {:8.1f} ms/doc  peak {:8.1f} MB'.format(
+            name,
+            seconds * 1000 / count,
+            peak / 1024.0 / 1024.0
+        ))
+    print('same text: {}'.format(results[0] == results[1]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+"""
+Compare the throughput of the full and the targeted NLP mode, see
+`pyresparser.plan.NLPOptions`, on long synthetic resumes. Text
+extraction is timed on its own as well, the difference to the parse
+time is mostly spent in spaCy.
+
+    python benchmarks/bench_nlp_modes.py [resumes] [pages] [model]
+"""
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pyresparser import models, utils, ResumeParser
+from pyresparser.plan import NLPOptions
+from benchmarks.corpus import make_resume_pdf
+
+
+def get_resume(data):
+    resume = io.BytesIO(data)
+    resume.name = 'resume.pdf'
+    return resume
+
+
+def measure(corpus, nlp_options):
+    start = time.perf_counter()
+    results = []
+    for data in corpus:
+        parser = ResumeParser(get_resume(data), nlp_options=nlp_options)
+        results.append(parser.get_extracted_data())
+    return results, time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    pages = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    if len(sys.argv) > 3:
+        models.configure(model=sys.argv[3])
+    ResumeParser.warm_up()
+    corpus = [make_resume_pdf(pages, seed) for seed in range(count)]
+    start = time.perf_counter()
+    for data in corpus:
+        utils.extract_document(get_resume(data), '.pdf')
+    extraction = time.perf_counter() - start
+    print('{} resumes of {} pages, text extraction {:.2f} s'.format(
+        count,
+        pages,
+        extraction
+    ))
+    modes = [
+        ('full', NLPOptions()),
+        ('targeted', NLPOptions(mode='targeted')),
+        ('full, 2000 tokens', NLPOptions(max_tokens=2000)),
+    ]
+    for name, nlp_options in modes:
+        results, seconds = measure(corpus, nlp_options)
+        print('{:<18} {:8.2f} resumes/s  {:6.2f} s beyond extraction  '
+              'names {}'.format(
+                  name,
+                  count / seconds,
+                  seconds - extraction,
+                  sorted(set(result['name'] for result in results))
+              ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+"""
+Benchmark the shared-resource PDF engine against the previous approach of
+building a new pdfminer resource manager, converter and interpreter for
+every page.
+
+    python benchmarks/bench_pdf_engine.py [documents] [pages]
+"""
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pdfminer.converter import TextConverter
+from pdfminer.pdfinterp import PDFPageInterpreter
+from pdfminer.pdfinterp import PDFResourceManager
+from pdfminer.layout import LAParams
+from pdfminer.pdfpage import PDFPage
+from pyresparser.pdf import PDFTextEngine
+from benchmarks.corpus import make_resume_pdf
+
+
+def per_page_extract(data):
+    pages = []
+    for page in PDFPage.get_pages(
+            io.BytesIO(data),
+            caching=True,
+            check_extractable=True
+    ):
+        resource_manager = PDFResourceManager()
+        fake_file_handle = io.StringIO()
+        converter = TextConverter(
+            resource_manager,
+            fake_file_handle,
+            codec='utf-8',
+            laparams=LAParams()
+        )
+        page_interpreter = PDFPageInterpreter(resource_manager, converter)
+        page_interpreter.process_page(page)
+        pages.append(fake_file_handle.getvalue())
+        converter.close()
+        fake_file_handle.close()
+    return pages
+
+
+def engine_extract(engine):
+    def extract(data):
+        return engine.extract(io.BytesIO(data)).pages
+    return extract
+
+
+def measure(extract, corpus):
+    start = time.perf_counter()
+    for data in corpus:
+        extract(data)
+    return (time.perf_counter() - start) / len(corpus)
+
+
+def main():
+    documents = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    pages = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    corpus = [make_resume_pdf(pages, seed=i) for i in range(documents)]
+    candidates = [
+        ('per page objects (previous)', per_page_extract),
+        ('engine, default layout', engine_extract(PDFTextEngine())),
+        ('engine, lines layout', engine_extract(PDFTextEngine('lines'))),
+        ('engine, no layout', engine_extract(PDFTextEngine('none'))),
+    ]
+    print('{} documents of {} pages'.format(documents, pages))
+    baseline = None
+    for name, extract in candidates:
+        seconds = measure(extract, corpus)
+        baseline = baseline or seconds
+        print('{:<30} {:8.2f} ms/doc  {:5.2f}x'.format(
+            name,
+            seconds * 1000,
+            baseline / seconds
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""
+Compare per-document latency of serial and page-parallel PDF extraction
+on a synthetic corpus where a few applicants upload long portfolios.
+
+    python benchmarks/bench_pdf_parallel.py [documents] [processes]
+"""
+import io
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pyresparser import pdf
+from benchmarks.corpus import make_resume_pdf
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(pct / 100.0 * (len(values) - 1))))
+    return values[index]
+
+
+def measure(extract, corpus):
+    latencies = []
+    for data in corpus:
+        start = time.perf_counter()
+        extract(io.BytesIO(data))
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main():
+    documents = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    processes = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    rng = random.Random(0)
+    # one in ten documents is a 20 to 60 page portfolio
+    corpus = [
+        make_resume_pdf(
+            rng.randint(20, 60) if rng.random() < 0.1 else rng.randint(1, 3),
+            seed=i
+        )
+        for i in range(documents)
+    ]
+    executor = pdf.get_executor(processes)
+    # start the workers before measuring
+    pdf.extract_pdf_parallel(
+        io.BytesIO(make_resume_pdf(processes * 2)),
+        threshold=1,
+        executor=executor
+    )
+    candidates = [
+        ('serial', pdf.extract_pdf),
+        ('parallel >= 20 pages', lambda data: pdf.extract_pdf_parallel(
+            data,
+            threshold=20,
+            executor=executor
+        )),
+    ]
+    print('{} documents, {} processes'.format(documents, processes))
+    for name, extract in candidates:
+        latencies = measure(extract, corpus)
+        print('{:<22} p50 {:8.1f} ms  p95 {:8.1f} ms  p99 {:8.1f} ms'.format(
+            name,
+            percentile(latencies, 50) * 1000,
+            percentile(latencies, 95) * 1000,
+            percentile(latencies, 99) * 1000
+        ))
+    pdf.shutdown_executor()
+
+
+if __name__ == '__main__':
+    main()
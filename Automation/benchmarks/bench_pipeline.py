@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+"""
+Compare `ParserPool`, where every worker reads, extracts and parses a
+resume serially, with `StagedPipeline` on a directory of synthetic
+resumes, and print the utilisation and queue depth of every stage to
+tune the concurrency of each.
+
+    python benchmarks/bench_pipeline.py [resumes] [pages] [readers]
+                                        [extractors] [nlp processes]
+                                        [model]
+"""
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pyresparser import models
+from pyresparser.pipeline import StagedPipeline
+from pyresparser.workers import ParserPool, iter_resumes
+from benchmarks.corpus import make_resume_pdf
+
+
+def measure(runner, directory):
+    start = time.perf_counter()
+    with runner:
+        results = dict(
+            (result.resume, result.data)
+            for result in runner.imap(iter_resumes(directory))
+        )
+    return results, time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    pages = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    readers = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+    extractors = int(sys.argv[4]) if len(sys.argv) > 4 else None
+    nlp_processes = int(sys.argv[5]) if len(sys.argv) > 5 else 1
+    if len(sys.argv) > 6:
+        models.configure(model=sys.argv[6])
+    directory = tempfile.mkdtemp()
+    for seed in range(count):
+        path = os.path.join(directory, '{}.pdf'.format(seed))
+        with open(path, 'wb') as fh:
+            fh.write(make_resume_pdf(pages, seed))
+    print('{} resumes of {} pages'.format(count, pages))
+
+    pool_results, seconds = measure(ParserPool(), directory)
+    print('{:<10} {:8.2f} resumes/s'.format('pool', count / seconds))
+
+    pipeline = StagedPipeline(
+        readers=readers,
+        extractors=extractors,
+        nlp_processes=nlp_processes
+    )
+    results, seconds = measure(pipeline, directory)
+    print('{:<10} {:8.2f} resumes/s  same results: {}'.format(
+        'staged',
+        count / seconds,
+        results == pool_results
+    ))
+    print(pipeline.report())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""
+Compare fetching resumes one URL at a time with `urlopen`, as
+`--remotefile` does, with `RemoteFetcher` feeding a `ParserPool`, against
+a local HTTP server that adds a fixed latency to every response.
+
+    python benchmarks/bench_remote.py [documents] [latency ms] [fetchers]
+"""
+import io
+import os
+import sys
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.request import Request, urlopen
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pyresparser import ResumeParser
+from pyresparser.remote import RemoteFetcher
+from pyresparser.workers import ParserPool
+from benchmarks.corpus import make_resume_pdf
+
+# regex fields only, so the numbers show the network overlap rather than
+# the speed of the models
+FIELDS = ['email', 'mobile_number']
+
+
+def serve(corpus, latency):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            time.sleep(latency)
+            data = corpus[int(self.path.strip('/').split('.')[0])]
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/pdf')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd
+
+
+def sequential(urls):
+    for url in urls:
+        req = Request(url, headers={'User-Agent': 'Mozilla/5.0'})
+        _file = io.BytesIO(urlopen(req).read())
+        _file.name = url.split('/')[-1]
+        ResumeParser(_file, fields=FIELDS).get_extracted_data()
+
+
+def concurrent(urls, fetchers):
+    with RemoteFetcher(fetchers=fetchers) as fetcher, \
+            ParserPool(fields=FIELDS) as pool:
+        resumes = (fetched.resume for fetched in fetcher.imap(urls))
+        for _ in pool.imap(resumes, ordered=False):
+            pass
+        return fetcher.stats
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    latency = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.05
+    fetchers = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+    corpus = [make_resume_pdf(seed=seed) for seed in range(count)]
+    httpd = serve(corpus, latency)
+    urls = ['http://127.0.0.1:{}/{}.pdf'.format(httpd.server_address[1], i)
+            for i in range(count)]
+    print('{} resumes, {:.0f} ms latency'.format(count, latency * 1000))
+
+    start = time.perf_counter()
+    sequential(urls)
+    seconds = time.perf_counter() - start
+    print('{:<12} {:8.1f} resumes/s'.format('urlopen', count / seconds))
+
+    start = time.perf_counter()
+    stats = concurrent(urls, fetchers)
+    seconds = time.perf_counter() - start
+    print('{:<12} {:8.1f} resumes/s  {} connections'.format(
+        'fetcher',
+        count / seconds,
+        stats['sessions']
+    ))
+    httpd.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+"""
+Measure the per-resume cost of skill matching, comparing the previous
+approach (read skills.csv with pandas for every resume and scan a list
+for every token) with the compiled `pyresparser.skills.SkillsIndex`,
+then the cost of the phrase automaton as the vocabulary grows.
+
+    python benchmarks/bench_skills.py [resumes]
+"""
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import spacy
+import pandas as pd
+from pyresparser.skills import DEFAULT_SKILLS_FILE, SkillsIndex, load_skills
+from benchmarks.corpus import WORDS, resume_lines
+
+
+def previous(doc, noun_chunks):
+    tokens = [token.text for token in doc if not token.is_stop]
+    data = pd.read_csv(DEFAULT_SKILLS_FILE)
+    skills = list(data.columns.values)
+    skillset = []
+    for token in tokens:
+        if token.lower() in skills:
+            skillset.append(token)
+    for token in noun_chunks:
+        token = token.text.lower().strip()
+        if token in skills:
+            skillset.append(token)
+    return [i.capitalize() for i in set([i.lower() for i in skillset])]
+
+
+def current(doc, noun_chunks):
+    return load_skills().extract(doc, noun_chunks)
+
+
+def vocabulary(size):
+    rng = random.Random(size)
+    skills = set(load_skills().skills)
+    while len(skills) < size:
+        skills.add('{} {}{}'.format(
+            rng.choice(WORDS),
+            rng.choice(WORDS),
+            rng.randrange(1000)
+        ))
+    return skills
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    # the tokenizer is all skill matching needs; bigrams stand in for
+    # the noun chunks of a full pipeline
+    nlp = spacy.blank('en')
+    docs = [
+        nlp(' '.join(resume_lines(seed=seed, lines=80)))
+        for seed in range(count)
+    ]
+    chunks = [
+        [doc[i:i + 2] for i in range(len(doc) - 1)]
+        for doc in docs
+    ]
+    tokens = sum(len(doc) for doc in docs)
+    print('{} resumes, {} tokens'.format(count, tokens))
+    results = []
+    for name, match in [('previous', previous), ('current', current)]:
+        start = time.perf_counter()
+        skills = [match(doc, chunk) for doc, chunk in zip(docs, chunks)]
+        seconds = time.perf_counter() - start
+        results.append([sorted(found) for found in skills])
+        print('{:<10} {:8.3f} ms per resume'.format(
+            name,
+            seconds * 1000 / count
+        ))
+    # the previous approach only matched multi-word skills equal to a
+    # noun chunk, the automaton also finds them inside longer chunks
+    for old, new in zip(*results):
+        assert set(old) <= set(new)
+
+    for size in [1000, 10000, 50000]:
+        start = time.perf_counter()
+        index = SkillsIndex(vocabulary(size))
+        build = time.perf_counter() - start
+        start = time.perf_counter()
+        for doc in docs:
+            index.extract(doc)
+        seconds = time.perf_counter() - start
+        print('{:>6} skills  build {:8.1f} ms  {:8.3f} ms per resume'.format(
+            size,
+            build * 1000,
+            seconds * 1000 / count
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+"""
+Measure time and peak memory of building the raw and whitespace
+normalised text of a document from its page chunks, comparing the
+previous `text += ' ' + page` / `' '.join(text.split())` approach with
+`pyresparser.extraction.ExtractedText`.
+
+    python benchmarks/bench_text_assembly.py [pages]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pyresparser.extraction import ExtractedText
+from benchmarks.corpus import resume_lines
+
+
+def previous(pages):
+    text = ''
+    for page in pages:
+        text += ' ' + page
+    normalized = ' '.join(text.split())
+    return text, normalized
+
+
+def current(pages):
+    document = ExtractedText(pages)
+    return document.text, document.normalized
+
+
+def measure(assemble, pages):
+    tracemalloc.start()
+    start = time.perf_counter()
+    views = assemble(pages)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return views, seconds, peak
+
+
+def main():
+    page_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    pages = [
+        '\n'.join(resume_lines(seed=page, lines=60)) + '\n\f'
+        for page in range(page_count)
+    ]
+    size = sum(len(page) for page in pages)
+    print('{} pages, {:.1f} MB of text'.format(page_count, size / 1e6))
+    results = []
+    for name, assemble in [('previous', previous), ('current', current)]:
+        views, seconds, peak = measure(assemble, pages)
+        results.append(views)
+        print('{:<10} {:8.2f} ms  peak {:8.2f} MB'.format(
+            name,
+            seconds * 1000,
+            peak / 1e6
+        ))
+    assert results[0] == results[1]
+
+
+if __name__ == '__main__':
+    main()
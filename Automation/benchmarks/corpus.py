@@ -0,0 +1,144 @@
+"""
+Synthetic resume corpus used by the benchmarks and tests
+"""
+import io
+import random
+import zipfile
+from xml.sax.saxutils import escape
+
+WORDS = [
+    'python', 'java', 'machine', 'learning', 'developed', 'managed',
+    'team', 'project', 'data', 'analysis', 'engineer', 'software',
+    'design', 'cloud', 'services', 'customers', 'reporting', 'sql',
+    'django', 'testing', 'automation', 'linux', 'api', 'pipelines',
+]
+
+SECTIONS = ['Experience', 'Education', 'Projects', 'Skills', 'Summary']
+
+
+def make_pdf(pages):
+    '''
+    Build a minimal PDF with one line of Helvetica text per entry of
+    each page
+    '''
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        '<< /Type /Pages /Kids [{}] /Count {} >>'.format(
+            ' '.join('{} 0 R'.format(4 + 2 * i) for i in range(len(pages))),
+            len(pages)
+        ).encode(),
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+    ]
+    for i, lines in enumerate(pages):
+        stream = 'BT /F1 11 Tf 14 TL 50 780 Td {} ET'.format(
+            ' '.join('({}) Tj T*'.format(line) for line in lines)
+        )
+        objects.append(
+            '<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+            '/Resources << /Font << /F1 3 0 R >> >> '
+            '/Contents {} 0 R >>'.format(5 + 2 * i).encode()
+        )
+        objects.append('<< /Length {} >>\nstream\n{}\nendstream'.format(
+            len(stream),
+            stream
+        ).encode())
+    data = b'%PDF-1.4\n'
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(data))
+        data += '{} 0 obj\n'.format(number).encode() + body + b'\nendobj\n'
+    xref = len(data)
+    data += 'xref\n0 {}\n0000000000 65535 f \n'.format(
+        len(objects) + 1
+    ).encode()
+    for offset in offsets:
+        data += '{:010d} 00000 n \n'.format(offset).encode()
+    data += 'trailer\n<< /Size {} /Root 1 0 R >>\nstartxref\n{}\n%%EOF\n' \
+        .format(len(objects) + 1, xref).encode()
+    return data
+
+
+def resume_lines(seed=0, lines=45):
+    '''
+    Generate the lines of one page of a plausible resume
+    '''
+    rng = random.Random(seed)
+    page = ['Omkar Pathak', 'omkarpathak27@gmail.com', '8087996634']
+    while len(page) < lines:
+        if rng.random() < 0.1:
+            page.append(rng.choice(SECTIONS))
+        else:
+            page.append(' '.join(rng.choice(WORDS) for _ in range(12)))
+    return page
+
+
+def make_resume_pdf(pages=2, seed=0):
+    '''
+    Build a synthetic resume PDF with the given number of pages
+    '''
+    return make_pdf([
+        resume_lines(seed + page) for page in range(pages)
+    ])
+
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/'
+    'content-types">'
+    '<Default Extension="rels" ContentType="application/'
+    'vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+
+_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/'
+    'relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/'
+    'officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '</Relationships>'
+)
+
+
+def make_docx(lines, images=0, image_size=512 * 1024):
+    '''
+    Build a minimal .docx file with one paragraph per line, optionally
+    with incompressible images in its media folder
+    '''
+    body = ''.join(
+        '<w:p><w:r><w:t xml:space="preserve">{}</w:t></w:r></w:p>'.format(
+            escape(line)
+        )
+        for line in lines
+    )
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/'
+        'wordprocessingml/2006/main"><w:body>{}</w:body></w:document>'
+    ).format(body)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', _CONTENT_TYPES)
+        archive.writestr('_rels/.rels', _RELS)
+        archive.writestr('word/document.xml', document)
+        rng = random.Random(len(lines))
+        for index in range(images):
+            archive.writestr(
+                'word/media/image{}.png'.format(index + 1),
+                bytes(rng.getrandbits(8) for _ in range(image_size))
+            )
+    return buffer.getvalue()
+
+
+def make_resume_docx(pages=2, seed=0):
+    '''
+    Build a synthetic resume .docx with the given number of pages
+    '''
+    lines = []
+    for page in range(pages):
+        lines.extend(resume_lines(seed + page))
+    return make_docx(lines)
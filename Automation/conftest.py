@@ -0,0 +1,118 @@
+import io
+import random
+import zipfile
+from xml.sax.saxutils import escape
+import pytest
+import spacy
+from spacy.training import Example
+from pyresparser import models
+
+
+@pytest.fixture
+def tiny_model(tmp_path):
+    '''
+    Path of a small untrained English pipeline with a tagger, an
+    attribute ruler and an entity recognizer, configured as both the base
+    and the custom model for the duration of a test
+    '''
+    nlp = spacy.blank('en')
+    nlp.add_pipe('tagger')
+    nlp.add_pipe('attribute_ruler')
+    nlp.add_pipe('ner')
+    doc = nlp.make_doc('Omkar Pathak works at Acme')
+    example = Example.from_dict(doc, {
+        'tags': ['NNP', 'NNP', 'VBZ', 'IN', 'NNP'],
+        'entities': ['B-Name', 'L-Name', 'O', 'O', 'O'],
+    })
+    nlp.initialize(lambda: [example])
+    ruler = nlp.get_pipe('attribute_ruler')
+    ruler.add([[{'IS_TITLE': True}]], {'POS': 'PROPN'})
+    ruler.add([[{'IS_TITLE': False}]], {'POS': 'NOUN'})
+    path = str(tmp_path / 'tiny_model')
+    nlp.to_disk(path)
+    previous = (models.registry.model, models.registry.custom_model)
+    models.configure(model=path, custom_model=path)
+    yield path
+    models.configure(model=previous[0], custom_model=previous[1])
+
+
+def _pdf(pages):
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        '<< /Type /Pages /Kids [{}] /Count {} >>'.format(
+            ' '.join('{} 0 R'.format(4 + 2 * i) for i in range(len(pages))),
+            len(pages)
+        ).encode(),
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+    ]
+    for i, lines in enumerate(pages):
+        stream = 'BT /F1 11 Tf 14 TL 50 780 Td {} ET'.format(
+            ' '.join('({}) Tj T*'.format(line) for line in lines)
+        )
+        objects.append(
+            '<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+            '/Resources << /Font << /F1 3 0 R >> >> '
+            '/Contents {} 0 R >>'.format(5 + 2 * i).encode()
+        )
+        objects.append('<< /Length {} >>\nstream\n{}\nendstream'.format(
+            len(stream),
+            stream
+        ).encode())
+    data = b'%PDF-1.4\n'
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(data))
+        data += '{} 0 obj\n'.format(number).encode() + body + b'\nendobj\n'
+    xref = len(data)
+    data += 'xref\n0 {}\n0000000000 65535 f \n'.format(
+        len(objects) + 1
+    ).encode()
+    for offset in offsets:
+        data += '{:010d} 00000 n \n'.format(offset).encode()
+    data += 'trailer\n<< /Size {} /Root 1 0 R >>\nstartxref\n{}\n%%EOF\n' \
+        .format(len(objects) + 1, xref).encode()
+    return data
+
+
+_W = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+
+
+def _docx(lines, images=0, image_size=512 * 1024):
+    body = ''.join(
+        '<w:p><w:r><w:t xml:space="preserve">{}</w:t></w:r></w:p>'.format(
+            escape(line)
+        )
+        for line in lines
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(
+            'word/document.xml',
+            '<w:document xmlns:w="{}"><w:body>{}</w:body></w:document>'
+            .format(_W, body)
+        )
+        rng = random.Random(len(lines))
+        for index in range(images):
+            archive.writestr(
+                'word/media/image{}.png'.format(index + 1),
+                bytes(rng.getrandbits(8) for _ in range(image_size))
+            )
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def make_pdf():
+    '''
+    Builds a minimal PDF with one line of Helvetica text per entry of
+    each page, e.g. `make_pdf([['Omkar Pathak'], ['Python']])`
+    '''
+    return _pdf
+
+
+@pytest.fixture
+def make_docx():
+    '''
+    Builds a minimal .docx file with one paragraph per line, optionally
+    with incompressible images in its media folder
+    '''
+    return _docx
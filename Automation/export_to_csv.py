@@ -1,59 +1,169 @@
-from pyresparser.resume_parser import ResumeParser
+from pyresparser.manifest import BatchManifest, DONE, FAILED
+from pyresparser.workers import ParserPool, iter_resumes
 from rank_candidate import sort_candidates
 from datetime import datetime
 import pandas as pd
+import itertools
+import argparse
 import sys
 import csv
 import os
 
-result = []
+RESULTS_NAME = 'Extracted-Resumes.csv'
+
 fields = ['Date', 'Skills', 'Name', 'Contact Number', 'Email ID', 'Current Company', 'Experience', 'College Name', 'Designation', 'Filename']
 
-for root, directories, filenames in os.walk(sys.argv[1]):
-    for filename in filenames:
-        try:
-            file_name = os.path.join(root, filename)
-            print('Extracting data from ' + file_name)
-            parser = ResumeParser(file_name)
-            data = parser.get_extracted_data()
-            name = data.get('name')
-            email = data.get('email')
-            mobile_number = data.get('mobile_number')
-            skills = ', '.join(data.get('skills')) if data.get('skills') else ''
-            total_experience = str(data.get('total_experience'))
-            experience = ' '.join(data.get('experience')) if data.get('experience') else ''
-            company_names = ', '.join(data.get('company_names')) if data.get('company_names') else ''
-            college_name = data.get('college_name')
-            designation = ', '.join(data.get('designation')) if data.get('designation') else ''
-
-            result.append(
-                [
-                    datetime.today().strftime('%d-%B-%y'),
-                    skills,
-                    name,
-                    mobile_number,
-                    email,
-                    company_names, 
-                    experience,
-                    college_name,
-                    designation,
-                    file_name
-                ]
-            )
-        except:
-            continue
-
-# writing to csv file
-df = pd.DataFrame(result, columns=fields)
-
-try:
-    ranked_df = sort_candidates(sys.argv[2], df)
+
+def to_row(file_name, data):
+    name = data.get('name')
+    email = data.get('email')
+    mobile_number = data.get('mobile_number')
+    skills = ', '.join(data.get('skills')) if data.get('skills') else ''
+    total_experience = str(data.get('total_experience'))
+    experience = ' '.join(data.get('experience')) if data.get('experience') else ''
+    company_names = ', '.join(data.get('company_names')) if data.get('company_names') else ''
+    college_name = data.get('college_name')
+    designation = ', '.join(data.get('designation')) if data.get('designation') else ''
+
+    return [
+        datetime.today().strftime('%d-%B-%y'),
+        skills,
+        name,
+        mobile_number,
+        email,
+        company_names, 
+        experience,
+        college_name,
+        designation,
+        file_name
+    ]
+
+
+def rank_and_save(df, job_description, path):
+    if job_description is None:
+        df.to_csv(path, index=False)
+        return
+    ranked_df = sort_candidates(job_description, df)
 
     # Sort candidates in descending order of score
     ranked_df.sort_values(by="Score", ascending=False, inplace=True)
-    ranked_df.to_csv(os.path.join(root, (datetime.today().strftime('Extracted-Resumes-%d-%m-%y.csv'))), index=False)
-except IndexError:
-    df.to_csv(os.path.join(root, (datetime.today().strftime('Extracted-Resumes-%d-%m-%y.csv'))), index=False)
+    ranked_df.to_csv(path, index=False)
+
+
+def run(directory, job_description):
+    result = []
+    resumes = []
+    for root, directories, filenames in os.walk(directory):
+        for filename in filenames:
+            resumes.append(os.path.join(root, filename))
+
+    # the models are loaded once and shared by the worker processes
+    pool = ParserPool()
+    with pool:
+        for parsed in pool.imap(resumes):
+            if parsed.error is not None:
+                continue
+            print('Extracted data from ' + parsed.resume)
+            result.append(to_row(parsed.resume, parsed.data))
+    print(pool.report(), file=sys.stderr)
+
+    # writing to csv file
+    df = pd.DataFrame(result, columns=fields)
+    rank_and_save(df, job_description, os.path.join(root, (datetime.today().strftime('Extracted-Resumes-%d-%m-%y.csv'))))
+
+
+def is_batch_output(path, manifest_path):
+    # the manifest, its journal and the exports written next to it are
+    # never parsed as resumes
+    if path.startswith(manifest_path):
+        return True
+    return os.path.dirname(path) == os.path.dirname(manifest_path) and \
+        os.path.basename(path).startswith('Extracted-Resumes')
+
+
+def run_batch(directory, job_description, manifest_path):
+    # files are recorded by absolute path, so re-runs may start anywhere
+    manifest_path = os.path.abspath(manifest_path)
+    output_dir = os.path.dirname(manifest_path)
+    results_path = os.path.join(output_dir, RESULTS_NAME)
+    resumes = (
+        resume for resume in iter_resumes(os.path.abspath(directory))
+        if not is_batch_output(resume, manifest_path)
+    )
+
+    with BatchManifest(manifest_path) as manifest:
+        # unchanged files already done are skipped on a stat and a lookup,
+        # the models are only loaded when something is left to parse
+        pending = manifest.pending(resumes)
+        first = next(pending, None)
+        if first is not None:
+            with open(results_path, 'a', newline='', encoding='utf-8') as fh:
+                writer = csv.writer(fh)
+                if fh.tell() == 0:
+                    writer.writerow(fields)
+                pool = ParserPool()
+                with pool:
+                    resumes = itertools.chain([first], pending)
+                    for parsed in pool.imap(resumes, ordered=False):
+                        if parsed.error is not None:
+                            manifest.record(
+                                parsed.resume,
+                                FAILED,
+                                parsed.seconds,
+                                parsed.error
+                            )
+                            continue
+                        print('Extracted data from ' + parsed.resume)
+                        # the row is on disk before the file is marked done
+                        writer.writerow(to_row(parsed.resume, parsed.data))
+                        fh.flush()
+                        manifest.record(parsed.resume, DONE, parsed.seconds)
+                print(pool.report(), file=sys.stderr)
+        stats = manifest.stats
+        print('{} skipped, {} parsed, {} failed'.format(
+            stats['skipped'],
+            stats[DONE],
+            stats[FAILED]
+        ), file=sys.stderr)
+
+        if not os.path.exists(results_path):
+            return
+        # rows of files parsed again are appended, the last one wins; rows
+        # of files that now fail or were removed are left out
+        df = pd.read_csv(results_path, dtype=str, keep_default_na=False)
+        df.drop_duplicates(subset='Filename', keep='last', inplace=True)
+        statuses = manifest.statuses()
+        done = df['Filename'].map(
+            lambda path: statuses.get(path) == DONE and os.path.exists(path)
+        )
+        df = df.loc[done.astype(bool)].reset_index(drop=True)
+
+    rank_and_save(df, job_description, os.path.join(output_dir, (datetime.today().strftime('Extracted-Resumes-%d-%m-%y.csv'))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export the resumes of a directory to CSV')
+    parser.add_argument('directory', help='directory of resumes')
+    parser.add_argument(
+        'job_description',
+        nargs='?',
+        help='job description to rank the candidates against'
+    )
+    parser.add_argument(
+        '--manifest',
+        help='batch mode: SQLite checkpoint of the processed files; a '
+             're-run skips unchanged files, retries failures and appends '
+             'to the results kept next to it'
+    )
+    args = parser.parse_args()
+    if args.manifest:
+        run_batch(args.directory, args.job_description, args.manifest)
+    else:
+        run(args.directory, args.job_description)
+
+
+if __name__ == '__main__':
+    main()
 
 # with open(os.path.join(root, (datetime.today().strftime('%d-%m-%y.csv'))), 'w', encoding="utf-8") as csvfile: 
 #     try:
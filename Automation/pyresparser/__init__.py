@@ -1,9 +1,11 @@
 from . import utils
 from . import constants
+from . import models
 from .resume_parser import ResumeParser
 
 __all__ = [
     'utils',
     'constants',
+    'models',
     'ResumeParser'
 ]
@@ -0,0 +1,358 @@
+import io
+import time
+import warnings
+import threading
+import importlib.util
+from . import pdf
+from .extraction import ExtractedText
+
+PDF = 'application/pdf'
+DOCX = (
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+)
+DOC = 'application/msword'
+TEXT = 'text/plain'
+
+MIME_TYPES = {
+    '.pdf': PDF,
+    '.docx': DOCX,
+    '.doc': DOC,
+    '.txt': TEXT,
+}
+
+# Capabilities a backend may declare:
+# - pages: one text per page and the page count of the document
+# - lines: keeps line breaks, which section based extraction relies on
+# - limits: enforces `ExtractionLimits` while extracting; the limits of
+#   other backends are applied once the text has been extracted
+CAPABILITIES = frozenset(['pages', 'lines', 'limits'])
+
+
+def get_mime_type(extension):
+    '''
+    Helper function to map a file extension to the MIME type backends are
+    registered for
+
+    :param extension: extension of the file, e.g. '.pdf'
+    :return: MIME type, or None for unsupported extensions
+    '''
+    return MIME_TYPES.get(extension.lower())
+
+
+class Backend(object):
+    '''
+    Base class of text extraction backends
+
+    Subclasses set the MIME types they read, the modules they need, a
+    speed rank (lower is faster, tried first) and their capabilities,
+    and implement `extract`. A backend whose modules are not installed
+    is skipped.
+    '''
+
+    name = None
+    mime_types = ()
+    requires = ()
+    speed = 100
+    capabilities = frozenset()
+    __available = None
+
+    def available(self):
+        '''
+        :return: True if every module in `requires` can be imported
+        '''
+        if self.__available is None:
+            self.__available = all(
+                importlib.util.find_spec(module) is not None
+                for module in self.requires
+            )
+        return self.__available
+
+    def extract(self, resume, limits=None):
+        '''
+        Extract the text of a resume
+
+        :param resume: path of the resume file or `io.BytesIO` object
+        :param limits: object of `pyresparser.extraction.ExtractionLimits`
+        :return: object of `pyresparser.extraction.ExtractedText`
+        '''
+        raise NotImplementedError
+
+    def __repr__(self):
+        return '<{} name={} speed={}>'.format(
+            type(self).__name__,
+            self.name,
+            self.speed
+        )
+
+
+class FunctionBackend(Backend):
+    '''
+    Backend wrapping a function that returns the text of a whole document
+
+    :param name: unique name of the backend
+    :param mime_types: MIME type or list of MIME types read
+    :param function: callable taking the path of the resume file or an
+                     `io.BytesIO` object and returning a string
+    :param speed: rank among the backends of a MIME type, lower is tried
+                  first
+    :param capabilities: iterable of `CAPABILITIES`
+    :param requires: modules the function needs
+    '''
+
+    def __init__(
+        self,
+        name,
+        mime_types,
+        function,
+        speed=100,
+        capabilities=(),
+        requires=()
+    ):
+        if isinstance(mime_types, str):
+            mime_types = (mime_types,)
+        self.name = name
+        self.mime_types = tuple(mime_types)
+        self.speed = speed
+        self.capabilities = frozenset(capabilities)
+        self.requires = tuple(requires)
+        self.__function = function
+
+    def extract(self, resume, limits=None):
+        return ExtractedText([self.__function(resume)])
+
+
+class PdfminerBackend(Backend):
+    '''
+    pdfminer.six, with full layout analysis and budgets enforced while
+    pages are interpreted; the slowest PDF backend and the fallback of
+    every other one
+    '''
+
+    name = 'pdfminer'
+    mime_types = (PDF,)
+    requires = ('pdfminer',)
+    speed = 100
+    capabilities = frozenset(['pages', 'lines', 'limits'])
+
+    def extract(self, resume, limits=None):
+        return pdf.extract_pdf(resume, limits=limits)
+
+
+class PyMuPDFBackend(Backend):
+    '''
+    PyMuPDF, used when installed; an order of magnitude faster than
+    pdfminer on simple single column resumes
+    '''
+
+    name = 'pymupdf'
+    mime_types = (PDF,)
+    requires = ('fitz',)
+    speed = 10
+    capabilities = frozenset(['pages', 'lines'])
+
+    def extract(self, resume, limits=None):
+        import fitz
+        if isinstance(resume, io.BytesIO):
+            document = fitz.open(stream=resume.getvalue(), filetype='pdf')
+        else:
+            document = fitz.open(resume)
+        deadline = limits.deadline() if limits is not None else None
+        max_pages = limits.max_pages if limits is not None else None
+        pages = []
+        timings = []
+        truncated = None
+        with document:
+            page_count = document.page_count
+            for page in document:
+                if max_pages is not None and len(pages) >= max_pages:
+                    truncated = 'max_pages'
+                    break
+                if deadline is not None and time.perf_counter() > deadline:
+                    truncated = 'max_seconds'
+                    break
+                started = time.perf_counter()
+                pages.append(page.get_text())
+                timings.append(time.perf_counter() - started)
+        return ExtractedText(
+            pages,
+            page_count=page_count,
+            timings=timings,
+            truncated=truncated
+        )
+
+
+class PlainTextBackend(Backend):
+    '''
+    Plain text resumes, decoded as UTF-8 without any parsing
+    '''
+
+    name = 'plain'
+    mime_types = (TEXT,)
+    speed = 0
+    capabilities = frozenset(['lines'])
+
+    def extract(self, resume, limits=None):
+        if isinstance(resume, io.BytesIO):
+            data = resume.getvalue()
+        else:
+            with open(resume, 'rb') as fh:
+                data = fh.read()
+        return ExtractedText([data.decode('utf-8', 'replace')])
+
+
+class BackendRegistry(object):
+    '''
+    Text extraction backends by MIME type
+
+    For every document the available backends of its MIME type are tried
+    from the fastest to the slowest, optionally restricted to those with
+    some capabilities; when a backend fails the next one is used, so the
+    slow but thorough ones act as fallbacks. A preferred backend can be
+    set per MIME type, it is then tried first.
+    '''
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__backends = []
+        self.__preferred = {}
+        self.__failures = set()
+
+    def register(self, backend):
+        '''
+        Add a backend, replacing any backend registered with the same name
+
+        :param backend: object of `Backend`
+        :return: the backend
+        '''
+        unknown = backend.capabilities.difference(CAPABILITIES)
+        if unknown:
+            raise ValueError('Unknown capabilities {}'.format(
+                sorted(unknown)
+            ))
+        with self.__lock:
+            backends = [
+                other for other in self.__backends
+                if other.name != backend.name
+            ]
+            backends.append(backend)
+            backends.sort(key=lambda other: other.speed)
+            self.__backends = backends
+        return backend
+
+    def unregister(self, name):
+        with self.__lock:
+            self.__backends = [
+                backend for backend in self.__backends
+                if backend.name != name
+            ]
+
+    def get(self, name):
+        for backend in self.__backends:
+            if backend.name == name:
+                return backend
+        raise KeyError(name)
+
+    def prefer(self, mime_type, name=None):
+        '''
+        Try a backend first for a MIME type
+
+        :param mime_type: MIME type, or file extension such as '.pdf'
+        :param name: name of a registered backend, None to go back to the
+                     speed ranking
+        '''
+        mime_type = get_mime_type(mime_type) or mime_type
+        if name is None:
+            self.__preferred.pop(mime_type, None)
+        else:
+            self.get(name)
+            self.__preferred[mime_type] = name
+
+    def backends(self, mime_type, require=()):
+        '''
+        List the available backends of a MIME type in the order they are
+        tried
+
+        :param mime_type: MIME type, or file extension such as '.pdf'
+        :param require: iterable of `CAPABILITIES` every backend must have
+        :return: list of `Backend`
+        '''
+        mime_type = get_mime_type(mime_type) or mime_type
+        require = frozenset(require)
+        candidates = [
+            backend for backend in self.__backends
+            if mime_type in backend.mime_types and
+            require <= backend.capabilities and backend.available()
+        ]
+        preferred = self.__preferred.get(mime_type)
+        candidates.sort(key=lambda backend: backend.name != preferred)
+        return candidates
+
+    def identity(self):
+        '''
+        :return: names of the backends in use, for each MIME type in the
+                 order they are tried; part of the result cache key
+        '''
+        return dict(
+            (mime_type, [backend.name for backend in self.backends(mime_type)])
+            for mime_type in sorted(set(MIME_TYPES.values()))
+        )
+
+    def extract(self, resume, extension, limits=None, require=()):
+        '''
+        Extract the text of a resume with the fastest backend that
+        succeeds
+
+        :param resume: path of the resume file or `io.BytesIO` object
+        :param extension: extension of the resume, e.g. '.pdf'
+        :param limits: object of `pyresparser.extraction.ExtractionLimits`
+        :param require: iterable of `CAPABILITIES` the backend must have
+        :return: object of `pyresparser.extraction.ExtractedText`
+        '''
+        candidates = self.backends(extension, require)
+        if not candidates:
+            return ExtractedText([])
+        if limits is not None and limits.too_large(resume):
+            return ExtractedText([], truncated='max_bytes')
+        for index, backend in enumerate(candidates):
+            if isinstance(resume, io.BytesIO):
+                resume.seek(0)
+            started = time.perf_counter()
+            try:
+                document = backend.extract(resume, limits=limits)
+            except Exception as error:
+                if index == len(candidates) - 1:
+                    raise
+                self.__warn(backend, error)
+                continue
+            if limits is not None and 'limits' not in backend.capabilities:
+                limits.apply(document, started)
+            return document
+
+    def __warn(self, backend, error):
+        # once per backend, a broken backend would otherwise warn for
+        # every resume
+        if backend.name in self.__failures:
+            return
+        self.__failures.add(backend.name)
+        warnings.warn(
+            'Text extraction with {} failed ({!r}), falling back to the '
+            'next backend'.format(backend.name, error)
+        )
+
+
+registry = BackendRegistry()
+registry.register(PdfminerBackend())
+registry.register(PyMuPDFBackend())
+registry.register(PlainTextBackend())
+
+
+def register(backend):
+    return registry.register(backend)
+
+
+def prefer(mime_type, name=None):
+    return registry.prefer(mime_type, name)
+
+
+def extract(resume, extension, limits=None, require=()):
+    return registry.extract(resume, extension, limits=limits, require=require)
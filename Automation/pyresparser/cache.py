@@ -0,0 +1,266 @@
+import io
+import os
+import json
+import hashlib
+import tempfile
+import threading
+from . import models
+from . import backends
+from .skills import DEFAULT_SKILLS_FILE
+
+# bump whenever a change to the extraction logic invalidates stored results
+CACHE_VERSION = 1
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_resume(resume):
+    '''
+    Helper function to hash the bytes of a resume
+
+    :param resume: path of the resume file or `io.BytesIO` object
+    :return: hex digest of the resume content
+    '''
+    digest = hashlib.sha256()
+    if isinstance(resume, io.BytesIO):
+        digest.update(resume.getbuffer())
+    else:
+        with open(resume, 'rb') as fh:
+            for chunk in iter(lambda: fh.read(_CHUNK_SIZE), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+_file_hashes = {}
+
+
+def hash_file(path):
+    '''
+    Helper function to hash a file, memoised by path and mtime
+
+    :param path: path of the file
+    :return: hex digest of the file content
+    '''
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    digest = _file_hashes.get(key)
+    if digest is None:
+        digest = hash_resume(path)
+        _file_hashes[key] = digest
+    return digest
+
+
+def _headers_identity(headers):
+    if headers is None:
+        return None
+    if isinstance(headers, dict):
+        return sorted(headers.items())
+    return sorted(headers)
+
+
+class ResultCache(object):
+    '''
+    Content-addressed, size-bounded on-disk cache of parse results
+
+    Results are keyed by a hash of the resume bytes together with
+    everything else that influences the output: the models and their
+    versions, the text extraction backends, the content of the skills
+    file (the bundled one when none is given), the custom regex and the
+    requested fields. When the cache grows over `max_bytes` the least
+    recently used entries are removed.
+    '''
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.__directory = directory
+        self.__max_bytes = max_bytes
+        self.__size = None
+        self.__lock = threading.Lock()
+        self.__stats = {'hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0}
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def directory(self):
+        return self.__directory
+
+    @property
+    def stats(self):
+        return dict(self.__stats)
+
+    @property
+    def size(self):
+        '''
+        :return: bytes taken by the entries, as tracked by this process
+        '''
+        with self.__lock:
+            if self.__size is None:
+                self.__size = self.__disk_usage()
+            return self.__size
+
+    def key(
+        self,
+        resume,
+        skills_file=None,
+        custom_regex=None,
+        fields=None,
+        limits=None,
+        section_headers=None,
+        nlp_options=None
+    ):
+        '''
+        Compute the cache key of a resume
+
+        :param resume: path of the resume file or `io.BytesIO` object
+        :param skills_file: custom skills CSV file
+        :param custom_regex: custom regex for parsing mobile numbers
+        :param fields: iterable of requested field names
+        :param limits: object of `pyresparser.extraction.ExtractionLimits`
+        :param section_headers: header phrases, or dictionary of header
+                                phrase to section name
+        :param nlp_options: object of `pyresparser.plan.NLPOptions`
+        :return: string cache key
+        '''
+        identity = {
+            'version': CACHE_VERSION,
+            'resume': hash_resume(resume),
+            'model': models.registry.model,
+            'model_version': models.model_version(models.registry.model),
+            'custom_model': models.registry.custom_model,
+            'custom_model_version': models.model_version(
+                models.registry.custom_model
+            ),
+            'skills_file': hash_file(skills_file or DEFAULT_SKILLS_FILE),
+            'custom_regex': custom_regex,
+            'fields': sorted(fields) if fields is not None else None,
+            'limits': limits.as_dict() if limits is not None else None,
+            'section_headers': _headers_identity(section_headers),
+            'nlp_options': (
+                nlp_options.as_dict() if nlp_options is not None else None
+            ),
+            'backends': backends.registry.identity(),
+        }
+        return hashlib.sha256(
+            json.dumps(identity, sort_keys=True).encode('utf-8')
+        ).hexdigest()
+
+    def get(self, key):
+        '''
+        Look up a stored result
+
+        :param key: cache key as returned by `key`
+        :return: dictionary of extracted data, or None on a miss
+        '''
+        path = self.__path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as fd:
+                data = json.load(fd)
+            # refresh the modification time, which orders LRU eviction
+            os.utime(path)
+        except (OSError, ValueError):
+            with self.__lock:
+                self.__stats['misses'] += 1
+            return None
+        with self.__lock:
+            self.__stats['hits'] += 1
+        return data
+
+    def set(self, key, data):
+        '''
+        Store a result, evicting old entries if the cache is full
+
+        :param key: cache key as returned by `key`
+        :param data: dictionary of extracted data
+        '''
+        path = self.__path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, 'w', encoding='utf-8') as fh:
+            json.dump(data, fh)
+        size = os.path.getsize(temp_path)
+        try:
+            # an overwritten entry no longer takes up its old size
+            size -= os.path.getsize(path)
+        except OSError:
+            pass
+        os.replace(temp_path, path)
+        with self.__lock:
+            self.__stats['writes'] += 1
+            if self.__size is None:
+                self.__size = self.__disk_usage()
+            else:
+                self.__size += size
+            if self.__size > self.__max_bytes:
+                self.__evict()
+
+    def clear(self):
+        for path, _, _ in self.__entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self.__size = 0
+
+    def __path(self, key):
+        return os.path.join(self.__directory, key[:2], key + '.json')
+
+    def __entries(self):
+        for root, _, filenames in os.walk(self.__directory):
+            for filename in filenames:
+                if not filename.endswith('.json'):
+                    continue
+                path = os.path.join(root, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                yield path, stat.st_size, stat.st_mtime
+
+    def __disk_usage(self):
+        return sum(size for _, size, _ in self.__entries())
+
+    def __evict(self):
+        # entries may have been added or removed by other processes, so
+        # eviction always works from a fresh listing of the directory
+        entries = sorted(self.__entries(), key=lambda entry: entry[2])
+        size = sum(entry[1] for entry in entries)
+        target = self.__max_bytes * 0.9
+        for path, entry_size, _ in entries:
+            if size <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            size -= entry_size
+            self.__stats['evictions'] += 1
+        self.__size = size
+
+
+def format_stats(stats):
+    '''
+    Helper function to describe cache statistics in one line
+
+    :param stats: dictionary as returned by `ResultCache.stats`
+    :return: string, e.g. 'cache: 3 hits, 1 misses, 1 writes, 0 evictions'
+    '''
+    return 'cache: {hits} hits, {misses} misses, {writes} writes, ' \
+        '{evictions} evictions'.format(**stats)
+
+
+_caches = {}
+
+
+def get_cache(directory, max_bytes=DEFAULT_MAX_BYTES):
+    '''
+    Return the `ResultCache` of a directory, shared within the process
+
+    :param directory: cache directory
+    :param max_bytes: size limit of the cache
+    :return: object of `ResultCache`
+    '''
+    key = os.path.abspath(directory)
+    cache = _caches.get(key)
+    if cache is None:
+        cache = _caches.setdefault(key, ResultCache(directory, max_bytes))
+    return cache
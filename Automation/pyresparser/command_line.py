@@ -6,10 +6,22 @@ import argparse
 from pprint import pprint
 import io
 import sys
-import multiprocessing as mp
 import urllib
+from collections import deque
 from urllib.request import Request, urlopen
 from pyresparser import ResumeParser
+from pyresparser import doc
+from pyresparser.cache import format_stats, get_cache
+from pyresparser.extraction import ExtractionLimits
+from pyresparser.plan import MODES as NLP_MODES, NLPOptions
+from pyresparser.export import STREAMING_FORMATS, get_writer
+from pyresparser.remote import DEFAULT_FETCHERS, RemoteFetcher, read_urls
+from pyresparser.workers import (
+    ParseResult,
+    ParserPool,
+    Progress,
+    iter_resumes
+)
 
 
 def print_cyan(text):
@@ -32,6 +44,15 @@ class ResumeParserCli(object):
             '-r',
             '--remotefile',
             help="remote path for resume file to be extracted")
+        self.__parser.add_argument(
+            '--remote-list',
+            help="text file with the URLs of the resumes to be extracted, "
+                 "one per line")
+        self.__parser.add_argument(
+            '--fetchers',
+            type=int,
+            default=DEFAULT_FETCHERS,
+            help="resumes of --remote-list downloaded concurrently")
         self.__parser.add_argument(
             '-re',
             '--custom-regex',
@@ -41,10 +62,49 @@ class ResumeParserCli(object):
             '--skillsfile',
             help="custom skills CSV file against \
                   which skills are searched for")
+        self.__parser.add_argument(
+            '-c',
+            '--cache-dir',
+            help="directory used to cache results of already parsed resumes")
+        self.__parser.add_argument(
+            '--max-seconds',
+            type=float,
+            help="stop extracting the text of a resume after this many "
+                 "seconds")
+        self.__parser.add_argument(
+            '--max-pages',
+            type=int,
+            help="extract at most this many pages of a resume")
+        self.__parser.add_argument(
+            '--max-chars',
+            type=int,
+            help="extract at most this many characters of a resume")
+        self.__parser.add_argument(
+            '--max-bytes',
+            type=int,
+            help="skip resume files larger than this many bytes")
+        self.__parser.add_argument(
+            '--nlp-mode',
+            choices=NLP_MODES,
+            default='full',
+            help="run spaCy over the whole resume (full) or only over the "
+                 "header and the sections that matter (targeted)")
+        self.__parser.add_argument(
+            '--max-tokens',
+            type=int,
+            help="hand at most this many words of a resume to spaCy")
+        self.__parser.add_argument(
+            '--doc-timeout',
+            type=float,
+            default=doc.DEFAULT_TIMEOUT,
+            help="seconds allowed to convert a .doc file before its "
+                 "converter is killed")
         self.__parser.add_argument(
             '-e',
             '--export-format',
-            help="the information export format (json)")
+            choices=('json',) + STREAMING_FORMATS,
+            help="the information export format (json, jsonl or csv); "
+                 "jsonl and csv are written while a directory is parsed")
         self.__parser.add_argument(
             '-o',
             '--export-filepath',
@@ -62,8 +122,12 @@ class ResumeParserCli(object):
         '''
         print(banner_string)
 
-    def export_data(self, exported_data, args):
+    def export_data(self, exported_data, args, resume=None):
         '''function to export resume data in specified format
+
+        :param resume: path or URL of the resume the data was extracted
+                       from, written to the file column of csv and jsonl
+                       exports
         '''
         if args.export_format:
             if args.export_format == 'json':
@@ -72,23 +136,89 @@ class ResumeParserCli(object):
                     abs_path = os.path.abspath(args.export_filepath)
                     print('Data exported successfully at: ' + abs_path)
                     sys.exit(0)
+            else:
+                with self.__open_export(args) as fd:
+                    writer = get_writer(args.export_format, fd)
+                    for data in exported_data:
+                        writer.write(resume, data)
+                abs_path = os.path.abspath(args.export_filepath)
+                print('Data exported successfully at: ' + abs_path)
+                sys.exit(0)
         else:
             return exported_data
 
+    def __open_export(self, args):
+        return open(
+            args.export_filepath,
+            'w',
+            encoding='utf-8',
+            newline='' if args.export_format == 'csv' else None
+        )
+
+    def __export_directory(self, args):
+        # results are written as they complete, so memory stays bounded
+        # and an interrupted run keeps everything parsed so far
+        with self.__open_export(args) as fd:
+            writer = get_writer(args.export_format, fd)
+            if args.remote_list:
+                self.__extract_from_remote_list(args, writer=writer)
+            else:
+                self.__extract_from_directory(
+                    args.directory,
+                    args.skillsfile,
+                    args.custom_regex,
+                    args.cache_dir,
+                    self.__limits(args),
+                    self.__nlp_options(args),
+                    args.doc_timeout,
+                    writer=writer,
+                    export=os.path.abspath(args.export_filepath)
+                )
+        abs_path = os.path.abspath(args.export_filepath)
+        print('Data exported successfully at: ' + abs_path)
+        sys.exit(0)
+
+    def __limits(self, args):
+        limits = ExtractionLimits(
+            max_seconds=args.max_seconds,
+            max_pages=args.max_pages,
+            max_chars=args.max_chars,
+            max_bytes=args.max_bytes
+        )
+        if any(value is not None for value in limits.as_dict().values()):
+            return limits
+        return None
+
+    def __nlp_options(self, args):
+        return NLPOptions(mode=args.nlp_mode, max_tokens=args.max_tokens)
+
     def extract_resume_data(self):
         args = self.__parser.parse_args()
 
         if args.export_format and not args.export_filepath:
             print('Please specify output file path using -o option')
             sys.exit(1)
+        doc.configure(timeout=args.doc_timeout)
 
         if args.remotefile:
             return self.export_data(
                 self.__extract_from_remote_file(
                     args.remotefile,
                     args.skillsfile,
-                    args.custom_regex
+                    args.custom_regex,
+                    args.cache_dir,
+                    self.__limits(args),
+                    self.__nlp_options(args)
                 ),
+                args,
+                resume=args.remotefile
+            )
+
+        if args.remote_list:
+            if args.export_format in STREAMING_FORMATS:
+                return self.__export_directory(args)
+            return self.export_data(
+                self.__extract_from_remote_list(args),
                 args
             )
 
@@ -97,27 +227,57 @@ class ResumeParserCli(object):
                 self.__extract_from_file(
                     args.file,
                     args.skillsfile,
-                    args.custom_regex
+                    args.custom_regex,
+                    args.cache_dir,
+                    self.__limits(args),
+                    self.__nlp_options(args)
                 ),
-                args
+                args,
+                resume=args.file
             )
         elif args.directory and not args.file:
+            if args.export_format in STREAMING_FORMATS:
+                return self.__export_directory(args)
             return self.export_data(
                 self.__extract_from_directory(
                     args.directory,
                     args.skillsfile,
-                    args.custom_regex
+                    args.custom_regex,
+                    args.cache_dir,
+                    self.__limits(args),
+                    self.__nlp_options(args),
+                    args.doc_timeout
                 ),
                 args
             )
         else:
             self.__parser.print_help()
 
-    def __extract_from_file(self, file, skills_file=None, custom_regex=None):
+    def __extract_from_file(
+        self,
+        file,
+        skills_file=None,
+        custom_regex=None,
+        cache_dir=None,
+        limits=None,
+        nlp_options=None
+    ):
         if os.path.exists(file):
             print_cyan('Extracting data from: {}'.format(file))
-            resume_parser = ResumeParser(file, skills_file, custom_regex)
-            return [resume_parser.get_extracted_data()]
+            resume_parser = ResumeParser(
+                file,
+                skills_file,
+                custom_regex,
+                cache=get_cache(cache_dir) if cache_dir else None,
+                limits=limits,
+                nlp_options=nlp_options
+            )
+            data = resume_parser.get_extracted_data()
+            if cache_dir:
+                sys.stderr.write(
+                    format_stats(get_cache(cache_dir).stats) + '\n'
+                )
+            return [data]
         else:
             print('File not found. Please provide a valid file name')
             sys.exit(1)
@@ -126,30 +286,139 @@ class ResumeParserCli(object):
         self,
         directory,
         skills_file=None,
-        custom_regex=None
+        custom_regex=None,
+        cache_dir=None,
+        limits=None,
+        nlp_options=None,
+        doc_timeout=doc.DEFAULT_TIMEOUT,
+        writer=None,
+        export=None
     ):
         if os.path.exists(directory):
-            pool = mp.Pool(mp.cpu_count())
+            pool = ParserPool(
+                skills_file=skills_file,
+                custom_regex=custom_regex,
+                cache_dir=cache_dir,
+                limits=limits,
+                nlp_options=nlp_options,
+                doc_timeout=doc_timeout
+            )
+            if writer is not None:
+                # the export may be written inside the directory being
+                # parsed
+                resumes = (
+                    resume for resume in iter_resumes(directory)
+                    if export is None or os.path.abspath(resume) != export
+                )
+                with pool:
+                    self.__write_results(
+                        pool.imap(resumes, ordered=False),
+                        writer
+                    )
+                sys.stderr.write(pool.report() + '\n')
+                return None
 
-            resumes = []
-            for root, _, filenames in os.walk(directory):
-                for filename in filenames:
-                    file = os.path.join(root, filename)
-                    resumes.append([file, skills_file, custom_regex])
-            results = pool.map(resume_result_wrapper, resumes)
-            pool.close()
-            pool.join()
+            with pool:
+                results = self.__collect_results(
+                    pool.imap(list(iter_resumes(directory)))
+                )
+            sys.stderr.write(pool.report() + '\n')
 
             return results
         else:
             print('Directory not found. Please provide a valid directory')
             sys.exit(1)
 
+    def __extract_from_remote_list(self, args, writer=None):
+        if not os.path.exists(args.remote_list):
+            print('File not found. Please provide a valid list of URLs')
+            sys.exit(1)
+        pool = ParserPool(
+            skills_file=args.skillsfile,
+            custom_regex=args.custom_regex,
+            cache_dir=args.cache_dir,
+            limits=self.__limits(args),
+            nlp_options=self.__nlp_options(args),
+            doc_timeout=args.doc_timeout
+        )
+        with RemoteFetcher(
+            fetchers=args.fetchers,
+            max_bytes=args.max_bytes
+        ) as fetcher, pool:
+            results = self.__parse_remote(
+                pool,
+                fetcher,
+                read_urls(args.remote_list)
+            )
+            if writer is not None:
+                self.__write_results(results, writer)
+                results = None
+            else:
+                results = self.__collect_results(results)
+            stats = fetcher.stats
+        sys.stderr.write(pool.report() + '\n')
+        sys.stderr.write(
+            '{downloads} downloads, {errors} failed, {bytes} bytes over '
+            '{sessions} connections\n'.format(**stats)
+        )
+        return results
+
+    def __parse_remote(self, pool, fetcher, urls):
+        # resumes are handed to the workers as soon as they are downloaded,
+        # so downloads overlap with parsing; failed downloads are reported
+        # alongside the parse results
+        failed = deque()
+
+        def resumes():
+            for fetched in fetcher.imap(urls):
+                if fetched.error is None:
+                    yield fetched.resume
+                else:
+                    failed.append(ParseResult(
+                        fetched.url,
+                        None,
+                        fetched.error,
+                        None,
+                        fetched.seconds
+                    ))
+
+        for result in pool.imap(resumes(), ordered=False):
+            while failed:
+                yield failed.popleft()
+            yield result
+        while failed:
+            yield failed.popleft()
+
+    def __collect_results(self, results):
+        data = []
+        for result in results:
+            print_cyan('Extracted data from: {}'.format(result.resume))
+            if result.error is not None:
+                sys.stderr.write('Could not parse {}: {}\n'.format(
+                    result.resume,
+                    result.error
+                ))
+            else:
+                data.append(result.data)
+        return data
+
+    def __write_results(self, results, writer):
+        progress = Progress()
+        try:
+            for result in results:
+                writer.write(result.resume, result.data, result.error)
+                progress.update(result)
+        finally:
+            progress.close()
+
     def __extract_from_remote_file(
         self,
         remote_file,
         skills_file,
-        custom_regex
+        custom_regex,
+        cache_dir=None,
+        limits=None,
+        nlp_options=None
     ):
         try:
             print_cyan('Extracting data from: {}'.format(remote_file))
@@ -157,19 +426,25 @@ class ResumeParserCli(object):
             webpage = urlopen(req).read()
             _file = io.BytesIO(webpage)
             _file.name = remote_file.split('/')[-1]
-            resume_parser = ResumeParser(_file, skills_file, custom_regex)
-            return [resume_parser.get_extracted_data()]
+            resume_parser = ResumeParser(
+                _file,
+                skills_file,
+                custom_regex,
+                cache=get_cache(cache_dir) if cache_dir else None,
+                limits=limits,
+                nlp_options=nlp_options
+            )
+            data = resume_parser.get_extracted_data()
+            if cache_dir:
+                sys.stderr.write(
+                    format_stats(get_cache(cache_dir).stats) + '\n'
+                )
+            return [data]
         except urllib.error.HTTPError:
             print('File not found. Please provide correct URL for resume file')
             sys.exit(1)
 
 
-def resume_result_wrapper(args):
-    print_cyan('Extracting data from: {}'.format(args[0]))
-    parser = ResumeParser(args[0], args[1], args[2])
-    return parser.get_extracted_data()
-
-
 def main():
     cli_obj = ResumeParserCli()
     pprint(cli_obj.extract_resume_data())
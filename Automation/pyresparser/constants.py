@@ -53,3 +53,9 @@ RESUME_SECTIONS_GRAD = [
                     'summary',
                     'leadership'
                 ]
+
+# headers naming the same section as a shorter header
+RESUME_SECTION_ALIASES = {
+                    'professional experience': 'experience',
+                    'career objective': 'objective'
+                }
@@ -0,0 +1,164 @@
+import re
+import threading
+from collections import namedtuple
+
+EMAIL = r'(?<![^@|\s])[^@|\s]+@[^@\s]+\.[^@|\s]+'
+
+# Found this complicated regex on :
+# https://zapier.com/blog/extract-links-email-phone-regex/
+# mob_num_regex = r'''(?:(?:\+?([1-9]|[0-9][0-9]|
+#     [0-9][0-9][0-9])\s*(?:[.-]\s*)?)?(?:\(\s*([2-9]1[02-9]|
+#     [2-9][02-8]1|[2-9][02-8][02-9])\s*\)|([0-9][1-9]|
+#     [0-9]1[02-9]|[2-9][02-8]1|
+#     [2-9][02-8][02-9]))\s*(?:[.-]\s*)?)?([2-9]1[02-9]|
+#     [2-9][02-9]1|[2-9][02-9]{2})\s*(?:[.-]\s*)?([0-9]{7})
+#     (?:\s*(?:#|x\.?|ext\.?|
+#     extension)\s*(\d+))?'''
+MOBILE_NUMBER = r'''(\d{3}[-\.\s]??\d{3}[-\.\s]??\d{4}|\(\d{3}\)
+                        [-\.\s]*\d{3}[-\.\s]??\d{4}|\d{3}[-\.\s]??\d{4})'''
+
+_MONTH = (
+    r'(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?'
+    r'|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?'
+    r'|dec(?:ember)?)'
+)
+_DATE = r'\b' + _MONTH + r'\.?[\s,\']*(?:19|20)\d{2}\b'
+
+DATE_RANGE = (
+    r'(?i:(?P<start>' + _DATE + r')\s*(?:-|–|—|to|till|until)\s*'
+    r'(?P<end>' + _DATE + r'|present|current|now))'
+)
+
+ContactMatch = namedtuple('ContactMatch', ['kind', 'value', 'start', 'end'])
+
+
+class ScanResult(object):
+    '''
+    Emails, phone numbers and date ranges found in a text, each as a list
+    of `ContactMatch` in the order they appear
+    '''
+
+    def __init__(self, emails, phones, date_ranges):
+        self.emails = emails
+        self.phones = phones
+        self.date_ranges = date_ranges
+
+    @property
+    def email(self):
+        for match in self.emails:
+            email = match.value.strip(';')
+            if email:
+                return email
+        return None
+
+    @property
+    def mobile_number(self):
+        if self.phones:
+            return self.phones[0].value
+        return None
+
+    def __repr__(self):
+        return '<ScanResult emails={} phones={} date_ranges={}>'.format(
+            len(self.emails),
+            len(self.phones),
+            len(self.date_ranges)
+        )
+
+
+class ContactScanner(object):
+    '''
+    Finds emails, phone numbers and date ranges in a single pass
+
+    The patterns are joined into one compiled alternation, so the text
+    is scanned once no matter how many kinds of matches are wanted. A
+    custom phone regex is compiled on its own, its groups may not
+    survive being joined with the other patterns. Date ranges can be
+    left out when only the contact details are needed.
+
+    The scanner works on plain text and does not need any spaCy model.
+    '''
+
+    def __init__(self, custom_regex=None, date_ranges=True):
+        self.__custom_regex = custom_regex
+        patterns = [r'(?P<email>' + EMAIL + r')']
+        if date_ranges:
+            patterns.append(r'(?P<date_range>' + DATE_RANGE + r')')
+        if custom_regex:
+            self.__phone_re = re.compile(custom_regex)
+        else:
+            self.__phone_re = None
+            patterns.append(r'(?P<phone>' + MOBILE_NUMBER + r')')
+        self.__combined_re = re.compile('|'.join(patterns))
+
+    @property
+    def custom_regex(self):
+        return self.__custom_regex
+
+    def scan(self, text):
+        '''
+        Scan a text
+
+        :param text: plain text extracted from resume file
+        :return: object of `ScanResult`
+        '''
+        found = {'email': [], 'phone': [], 'date_range': []}
+        for match in self.__combined_re.finditer(text):
+            kind = match.lastgroup
+            if kind == 'date_range':
+                value = (match.group('start'), match.group('end'))
+            else:
+                value = match.group(kind)
+            found[kind].append(
+                ContactMatch(kind, value, match.start(), match.end())
+            )
+        if self.__phone_re is not None:
+            for match in self.__phone_re.finditer(text):
+                # same value `re.findall` would have returned
+                if self.__phone_re.groups:
+                    value = ''.join(match.groups(''))
+                else:
+                    value = match.group(0)
+                found['phone'].append(
+                    ContactMatch('phone', value, match.start(), match.end())
+                )
+        return ScanResult(
+            found['email'],
+            found['phone'],
+            found['date_range']
+        )
+
+
+_scanners = {}
+_lock = threading.Lock()
+
+
+def get_scanner(custom_regex=None, date_ranges=True):
+    '''
+    Return the `ContactScanner` of a custom regex, compiled once per
+    process
+
+    :param custom_regex: custom regex for parsing mobile numbers
+    :param date_ranges: whether date ranges are scanned for as well
+    :return: object of `ContactScanner`
+    '''
+    key = (custom_regex, date_ranges)
+    scanner = _scanners.get(key)
+    if scanner is None:
+        with _lock:
+            scanner = _scanners.get(key)
+            if scanner is None:
+                scanner = ContactScanner(custom_regex, date_ranges)
+                _scanners[key] = scanner
+    return scanner
+
+
+def scan_contacts(text, custom_regex=None, date_ranges=True):
+    '''
+    Helper function to find emails, phone numbers and date ranges in text
+
+    :param text: plain text extracted from resume file
+    :param custom_regex: custom regex for parsing mobile numbers
+    :param date_ranges: whether date ranges are scanned for as well
+    :return: object of `ScanResult`
+    '''
+    return get_scanner(custom_regex, date_ranges).scan(text)
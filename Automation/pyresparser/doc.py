@@ -0,0 +1,89 @@
+import io
+import os
+import shutil
+import tempfile
+import subprocess
+
+# program converting .doc files to text; textract runs the same one for
+# .doc files
+ANTIWORD = 'antiword'
+
+# seconds the converter may spend on one document before it is killed
+DEFAULT_TIMEOUT = 30
+
+
+class DocConversionError(Exception):
+    pass
+
+
+class DocConversionTimeout(DocConversionError):
+    pass
+
+
+_options = {
+    'timeout': DEFAULT_TIMEOUT,
+}
+
+
+def configure(**options):
+    '''
+    Change the options used by `pyresparser.utils.extract_text_from_doc`
+
+    :param timeout: seconds allowed per document
+    '''
+    unknown = set(options).difference(_options)
+    if unknown:
+        raise ValueError('Unknown options {}'.format(sorted(unknown)))
+    _options.update(options)
+
+
+def available():
+    '''
+    :return: True if the converter is installed
+    '''
+    return shutil.which(ANTIWORD) is not None
+
+
+def convert(resume, timeout=None):
+    '''
+    Extract the text of a .doc file. The converter runs in a child process
+    that is killed when it takes longer than the timeout, so a malformed
+    document can not hold up a parsing worker.
+
+    :param resume: path of the resume file or `io.BytesIO` object
+    :param timeout: seconds allowed for this document, defaults to the
+                    configured timeout
+    :return: string of extracted text
+    '''
+    if timeout is None:
+        timeout = _options['timeout']
+    if not isinstance(resume, io.BytesIO):
+        return _run(resume, timeout)
+    fd, path = tempfile.mkstemp(suffix='.doc')
+    try:
+        with os.fdopen(fd, 'wb') as fh:
+            fh.write(resume.getbuffer())
+        return _run(path, timeout)
+    finally:
+        os.remove(path)
+
+
+def _run(path, timeout):
+    try:
+        completed = subprocess.run(
+            [ANTIWORD, path],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            timeout=timeout
+        )
+    except subprocess.TimeoutExpired:
+        raise DocConversionTimeout(
+            'No text after {} seconds'.format(timeout)
+        )
+    except OSError as error:
+        raise DocConversionError(repr(error))
+    if completed.returncode != 0:
+        raise DocConversionError(
+            completed.stderr.decode('utf-8', 'replace').strip()
+        )
+    return completed.stdout.decode('utf-8')
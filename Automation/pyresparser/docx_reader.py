@@ -0,0 +1,106 @@
+import os
+import re
+import zipfile
+from xml.etree.ElementTree import iterparse
+
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_P = _W + 'p'
+_T = _W + 't'
+_TAB = _W + 'tab'
+_BREAKS = (_W + 'br', _W + 'cr')
+
+DOCUMENT_PART = 'word/document.xml'
+HEADER_PART = re.compile(r'word/header[0-9]*\.xml')
+FOOTER_PART = re.compile(r'word/footer[0-9]*\.xml')
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+def _iter_part_lines(archive, name):
+    # paragraphs and line breaks start a new line, as in docx2txt; the
+    # part is decompressed and parsed in chunks, and every paragraph is
+    # cleared once read so the tree never holds more than one of them
+    line = []
+    with archive.open(name) as part:
+        for event, element in iterparse(part, events=('start', 'end')):
+            tag = element.tag
+            if event == 'start':
+                if tag == _P or tag in _BREAKS:
+                    if line:
+                        yield ''.join(line)
+                        line = []
+                elif tag == _TAB:
+                    line.append('\t')
+            elif tag == _T:
+                if element.text:
+                    line.append(element.text)
+            elif tag == _P:
+                element.clear()
+    if line:
+        yield ''.join(line)
+
+
+def iter_lines(docx, headers=True):
+    '''
+    Stream the lines of text of a .docx file
+
+    Only the XML parts holding text are read: the headers, the body and
+    the footers, in that order. Images and other media are never
+    decompressed.
+
+    :param docx: path of the .docx file or file-like object
+    :param headers: whether the headers and footers are read as well
+    :return: iterator of strings, one per paragraph or line break
+    '''
+    with zipfile.ZipFile(docx) as archive:
+        names = archive.namelist()
+        parts = [DOCUMENT_PART]
+        if headers:
+            parts = [name for name in names if HEADER_PART.match(name)] + \
+                parts + [name for name in names if FOOTER_PART.match(name)]
+        for name in parts:
+            for line in _iter_part_lines(archive, name):
+                yield line
+
+
+def extract_images(docx, directory):
+    '''
+    Helper function to copy the images of a .docx file into a directory
+
+    :param docx: path of the .docx file or file-like object
+    :param directory: existing directory the images are written to
+    :return: list of paths of the written images
+    '''
+    paths = []
+    with zipfile.ZipFile(docx) as archive:
+        for name in archive.namelist():
+            if os.path.splitext(name)[1] in IMAGE_EXTENSIONS:
+                path = os.path.join(directory, os.path.basename(name))
+                with archive.open(name) as source, open(path, 'wb') as fh:
+                    while True:
+                        chunk = source.read(1024 * 1024)
+                        if not chunk:
+                            break
+                        fh.write(chunk)
+                paths.append(path)
+    return paths
+
+
+def extract_docx(docx, headers=True, images_dir=None):
+    '''
+    Extract the plain text of a .docx file, with the same result as
+    reading it with docx2txt and joining its lines with spaces
+
+    :param docx: path of the .docx file or file-like object
+    :param headers: whether the headers and footers are read as well
+    :param images_dir: directory to copy the images to; images are
+                       skipped entirely when None
+    :return: string of extracted text
+    '''
+    text = ' '.join(
+        line.replace('\t', ' ') for line in iter_lines(docx, headers)
+    ).strip()
+    if images_dir is not None:
+        if hasattr(docx, 'seek'):
+            docx.seek(0)
+        extract_images(docx, images_dir)
+    return text
@@ -0,0 +1,113 @@
+import csv
+import json
+
+# formats written one resume at a time, as results complete
+STREAMING_FORMATS = ('jsonl', 'csv')
+
+# columns of CSV exports, the file and error of every resume followed by
+# the fields of `ResumeParser`
+CSV_FIELDS = [
+    'file',
+    'error',
+    'name',
+    'email',
+    'mobile_number',
+    'skills',
+    'college_name',
+    'degree',
+    'designation',
+    'experience',
+    'company_names',
+    'no_of_pages',
+    'total_experience',
+    'truncated',
+]
+
+
+def to_record(resume, data, error=None):
+    '''
+    Helper function to build the exported record of a resume
+
+    :param resume: path or name of the resume
+    :param data: dictionary of extracted data, None when parsing failed
+    :param error: error message when parsing failed
+    :return: dictionary with the file, the error and the extracted data
+    '''
+    record = dict(data or {})
+    record['file'] = resume
+    record['error'] = error
+    return record
+
+
+class JsonLinesWriter(object):
+    '''
+    Writes one JSON object per line and flushes it right away, so the
+    results of an interrupted run are kept
+
+    :param fh: text file object
+    '''
+
+    def __init__(self, fh):
+        self.__fh = fh
+
+    def write(self, resume, data, error=None):
+        self.__fh.write(json.dumps(
+            to_record(resume, data, error),
+            sort_keys=True
+        ) + '\n')
+        self.__fh.flush()
+
+
+class CsvWriter(object):
+    '''
+    Writes one CSV row per resume, with `CSV_FIELDS` as columns; lists
+    are joined with commas. The header is only written to an empty file,
+    so runs can append to an existing export.
+
+    :param fh: text file object opened with newline=''
+    '''
+
+    def __init__(self, fh):
+        self.__fh = fh
+        self.__writer = csv.DictWriter(
+            fh,
+            fieldnames=CSV_FIELDS,
+            extrasaction='ignore'
+        )
+        self.__header = fh.tell() == 0
+
+    def write(self, resume, data, error=None):
+        if self.__header:
+            self.__writer.writeheader()
+            self.__header = False
+        record = to_record(resume, data, error)
+        for key, value in record.items():
+            if isinstance(value, (list, tuple)):
+                record[key] = ', '.join(str(item) for item in value)
+        self.__writer.writerow(record)
+        self.__fh.flush()
+
+
+WRITERS = {
+    'jsonl': JsonLinesWriter,
+    'csv': CsvWriter,
+}
+
+
+def get_writer(export_format, fh):
+    '''
+    Helper function to create the streaming writer of an export format
+
+    :param export_format: any of `STREAMING_FORMATS`
+    :param fh: text file object the results are written to
+    :return: writer with a `write(resume, data, error=None)` method
+    '''
+    try:
+        return WRITERS[export_format](fh)
+    except KeyError:
+        raise ValueError(
+            'Unknown export format {!r}, expected any of {}'.format(
+                export_format,
+                ', '.join(STREAMING_FORMATS)
+            )
+        )
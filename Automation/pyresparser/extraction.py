@@ -0,0 +1,162 @@
+import io
+import os
+import time
+
+
+def normalize_whitespace(text):
+    '''
+    Helper function to collapse every run of whitespace into a single
+    space
+
+    :param text: string to normalise
+    :return: normalised string
+    '''
+    return ' '.join(text.split())
+
+
+class ExtractedText(object):
+    '''
+    Text extracted from a resume file
+
+    The raw and whitespace normalised views of the document are built
+    once, on first access, from a single join of the page chunks.
+
+    :param pages: list of page texts; formats without pages hold the
+                  whole document as a single entry
+    :param page_count: number of pages, None for formats without pages
+    :param timings: seconds spent extracting each page
+    :param truncated: name of the `ExtractionLimits` limit that stopped
+                      the extraction, None if the document is complete
+    '''
+
+    def __init__(self, pages, page_count=None, timings=None, truncated=None):
+        self.pages = pages
+        self.page_count = page_count
+        self.timings = timings if timings is not None else []
+        self.truncated = truncated
+        self.__text = None
+        self.__normalized = None
+
+    @property
+    def text(self):
+        if self.__text is None:
+            # every page is preceded by a space, as pages used to be
+            # appended one by one with `text += ' ' + page`
+            self.__text = ' '.join([''] + self.pages) if self.pages else ''
+        return self.__text
+
+    @property
+    def normalized(self):
+        if self.__normalized is None:
+            # the pages are separated by whitespace in the raw text, so
+            # normalising them one at a time only ever holds the words of
+            # a single page instead of a list of every word in the document
+            self.__normalized = ' '.join(filter(None, (
+                normalize_whitespace(page) for page in self.pages
+            )))
+        return self.__normalized
+
+    def truncate(self, pages, reason):
+        '''
+        Replace the pages with a shortened list and record why
+
+        :param pages: list of the page texts to keep
+        :param reason: name of the limit that was hit
+        '''
+        self.pages = pages
+        self.truncated = self.truncated or reason
+        self.__text = None
+        self.__normalized = None
+
+    def __repr__(self):
+        return '<ExtractedText pages={} page_count={} truncated={}>'.format(
+            len(self.pages),
+            self.page_count,
+            self.truncated
+        )
+
+
+class ExtractionLimits(object):
+    '''
+    Per-document resource budget for text extraction
+
+    When a limit is hit the extraction stops and returns the text read so
+    far, flagged with the name of the limit in `ExtractedText.truncated`.
+    The time limit is enforced while pdfminer interprets a page; for other
+    formats it is only checked once the text has been extracted.
+
+    :param max_seconds: wall-clock seconds spent extracting the text
+    :param max_pages: number of pages to extract
+    :param max_chars: number of characters to extract
+    :param max_bytes: size of the input file, larger files are skipped
+    '''
+
+    def __init__(
+        self,
+        max_seconds=None,
+        max_pages=None,
+        max_chars=None,
+        max_bytes=None
+    ):
+        self.max_seconds = max_seconds
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self.max_bytes = max_bytes
+
+    def as_dict(self):
+        return {
+            'max_seconds': self.max_seconds,
+            'max_pages': self.max_pages,
+            'max_chars': self.max_chars,
+            'max_bytes': self.max_bytes,
+        }
+
+    def deadline(self):
+        '''
+        :return: `time.perf_counter` value at which time runs out, or None
+        '''
+        if self.max_seconds is None:
+            return None
+        return time.perf_counter() + self.max_seconds
+
+    def too_large(self, resume):
+        '''
+        Check the size of a resume against `max_bytes`
+
+        :param resume: path of the resume file or `io.BytesIO` object
+        :return: True if the resume must not be extracted
+        '''
+        if self.max_bytes is None:
+            return False
+        if isinstance(resume, io.BytesIO):
+            size = resume.getbuffer().nbytes
+        else:
+            size = os.path.getsize(resume)
+        return size > self.max_bytes
+
+    def apply(self, document, started=None):
+        '''
+        Enforce the page, character and time limits on a document that
+        was extracted without checking them along the way
+
+        :param document: object of `ExtractedText`
+        :param started: `time.perf_counter` value when extraction started
+        :return: the document, truncated if needed
+        '''
+        if self.max_pages is not None and \
+                len(document.pages) > self.max_pages:
+            document.truncate(document.pages[:self.max_pages], 'max_pages')
+        if self.max_chars is not None:
+            remaining = self.max_chars
+            for index, page in enumerate(document.pages):
+                if len(page) > remaining:
+                    document.truncate(
+                        document.pages[:index] + [page[:remaining]],
+                        'max_chars'
+                    )
+                    break
+                remaining -= len(page)
+        if started is not None and self.max_seconds is not None and \
+                time.perf_counter() - started > self.max_seconds:
+            document.truncate(document.pages, 'max_seconds')
+        return document
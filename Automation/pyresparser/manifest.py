@@ -0,0 +1,201 @@
+import os
+import time
+import sqlite3
+from collections import namedtuple
+from .cache import hash_resume
+
+DONE = 'done'
+FAILED = 'failed'
+
+# records written between two commits; a crash loses at most this many
+# checkpoints, whose files are then parsed again
+COMMIT_EVERY = 100
+
+FileSnapshot = namedtuple('FileSnapshot', ['size', 'mtime_ns', 'hash'])
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER,
+    mtime_ns INTEGER,
+    hash TEXT,
+    status TEXT,
+    duration REAL,
+    error TEXT,
+    updated REAL
+)
+'''
+
+
+class BatchManifest(object):
+    '''
+    Checkpoint of a batch run, kept in a SQLite file
+
+    Every processed file is recorded with its size, modification time,
+    content hash, status and parsing time. A later run skips the files
+    recorded as done whose size and modification time did not change;
+    when only the modification time changed the content hash decides.
+    Failed files are always tried again. The size, modification time and
+    hash of a file are taken before it is parsed, so a file modified while
+    it is parsed is parsed again by the next run.
+
+    :param path: path of the SQLite file, created if needed
+    '''
+
+    def __init__(self, path):
+        self.__path = path
+        self.__connection = sqlite3.connect(path)
+        self.__connection.execute(_SCHEMA)
+        self.__connection.commit()
+        self.__uncommitted = 0
+        # snapshots of the files handed out by `pending`, until recorded
+        self.__snapshots = {}
+        self.__stats = {'skipped': 0, DONE: 0, FAILED: 0}
+
+    @property
+    def path(self):
+        return self.__path
+
+    @property
+    def stats(self):
+        return dict(self.__stats)
+
+    def __row(self, path):
+        return self.__connection.execute(
+            'SELECT size, mtime_ns, hash, status FROM files WHERE path = ?',
+            (path,)
+        ).fetchone()
+
+    def is_done(self, path):
+        '''
+        Check whether a file was processed and is unchanged since
+
+        :param path: path of the file
+        :return: True if the file can be skipped
+        '''
+        row = self.__row(path)
+        if row is None or row[3] != DONE:
+            return False
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        if (stat.st_size, stat.st_mtime_ns) == (row[0], row[1]):
+            return True
+        try:
+            if stat.st_size != row[0] or hash_resume(path) != row[2]:
+                return False
+        except OSError:
+            return False
+        # touched but not modified
+        self.__connection.execute(
+            'UPDATE files SET mtime_ns = ? WHERE path = ?',
+            (stat.st_mtime_ns, path)
+        )
+        self.__count_write()
+        return True
+
+    def snapshot(self, path):
+        '''
+        Read the size, modification time and content hash of a file
+
+        :param path: path of the file
+        :return: `FileSnapshot`, None if the file can not be read
+        '''
+        try:
+            stat = os.stat(path)
+            return FileSnapshot(
+                stat.st_size,
+                stat.st_mtime_ns,
+                hash_resume(path)
+            )
+        except OSError:
+            return None
+
+    def pending(self, paths):
+        '''
+        Filter out the files that do not need to be processed again. The
+        snapshot of every file yielded is kept for `record`.
+
+        :param paths: iterable of file paths
+        :return: iterator of the paths that are new, changed or failed
+        '''
+        for path in paths:
+            if self.is_done(path):
+                self.__stats['skipped'] += 1
+            else:
+                self.__snapshots[path] = self.snapshot(path)
+                yield path
+
+    def record(self, path, status, duration=None, error=None, snapshot=None):
+        '''
+        Record the outcome of a file
+
+        :param path: path of the file
+        :param status: `DONE` or `FAILED`
+        :param duration: seconds spent parsing the file
+        :param error: error message of a failure
+        :param snapshot: `FileSnapshot` taken before the file was parsed;
+                         defaults to the one taken by `pending`, or to a
+                         new one. A file that could not be read is
+                         recorded without one and parsed again next time.
+        '''
+        if snapshot is None:
+            if path in self.__snapshots:
+                snapshot = self.__snapshots.pop(path)
+            else:
+                snapshot = self.snapshot(path)
+        else:
+            self.__snapshots.pop(path, None)
+        size, mtime_ns, content_hash = snapshot or (None, None, None)
+        self.__connection.execute(
+            'INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            (
+                path,
+                size,
+                mtime_ns,
+                content_hash,
+                status,
+                duration,
+                error,
+                time.time(),
+            )
+        )
+        self.__stats[status] += 1
+        self.__count_write()
+
+    def statuses(self):
+        '''
+        :return: dictionary of every recorded path to its status
+        '''
+        return dict(self.__connection.execute(
+            'SELECT path, status FROM files'
+        ).fetchall())
+
+    def counts(self):
+        '''
+        :return: dictionary of status to the number of files recorded
+                 with it, over every run
+        '''
+        return dict(self.__connection.execute(
+            'SELECT status, COUNT(*) FROM files GROUP BY status'
+        ).fetchall())
+
+    def commit(self):
+        self.__connection.commit()
+        self.__uncommitted = 0
+
+    def close(self):
+        self.commit()
+        self.__connection.close()
+
+    def __count_write(self):
+        self.__uncommitted += 1
+        if self.__uncommitted >= COMMIT_EVERY:
+            self.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,337 @@
+import os
+import threading
+import warnings
+import spacy
+from spacy.matcher import Matcher
+from . import constants as cs
+
+DEFAULT_MODEL = 'en_core_web_sm'
+DEFAULT_CUSTOM_MODEL = os.path.dirname(os.path.abspath(__file__))
+
+# pipeline components, by factory, that produce each kind of annotation
+# the parser reads; 'POS' feeds the name matcher, 'DEP' the noun chunks
+# and 'ENT' the entities of the custom model
+ANNOTATION_FACTORIES = {
+    'POS': ('tagger', 'morphologizer', 'attribute_ruler'),
+    'DEP': ('tagger', 'morphologizer', 'attribute_ruler', 'parser'),
+    'ENT': ('ner', 'entity_ruler'),
+}
+
+# annotations any pass of the parser reads; pipelines are loaded without
+# the components producing none of them, e.g. the parser and lemmatizer
+LOADED_ANNOTATIONS = ('POS', 'ENT')
+
+# components that may be excluded when their output is not needed;
+# anything else, e.g. custom components, is always kept
+OPTIONAL_FACTORIES = frozenset([
+    'tok2vec',
+    'tagger',
+    'morphologizer',
+    'attribute_ruler',
+    'parser',
+    'ner',
+    'entity_ruler',
+    'lemmatizer',
+    'senter',
+    'sentencizer',
+])
+
+_LISTENER_ARCHITECTURE = 'spacy.Tok2VecListener'
+
+
+def _model_path(name):
+    if os.path.isdir(name):
+        return name
+    if spacy.util.is_package(name):
+        path = str(spacy.util.get_package_path(name))
+        # packages keep the pipeline in a versioned sub directory
+        for entry in sorted(os.listdir(path)):
+            if os.path.isfile(os.path.join(path, entry, 'config.cfg')):
+                return os.path.join(path, entry)
+        return path
+    return None
+
+
+def _model_config(name):
+    path = _model_path(name)
+    if path is None:
+        return None
+    config_path = os.path.join(path, 'config.cfg')
+    if not os.path.isfile(config_path):
+        return None
+    return spacy.util.load_config(config_path, interpolate=False)
+
+
+_model_versions = {}
+
+
+def model_version(name):
+    '''
+    Helper function to read the version of a spaCy pipeline from its
+    meta.json, without loading the pipeline
+
+    :param name: name or path of a spaCy pipeline
+    :return: version string, or None when the pipeline or its meta.json
+             can not be found
+    '''
+    path = _model_path(name)
+    if path is None:
+        return None
+    meta_path = os.path.join(path, 'meta.json')
+    try:
+        key = (os.path.abspath(meta_path), os.stat(meta_path).st_mtime_ns)
+    except OSError:
+        return None
+    if key not in _model_versions:
+        _model_versions[key] = spacy.util.load_meta(meta_path).get('version')
+    return _model_versions[key]
+
+
+def _listened_components(config):
+    # upstream components, e.g. a shared tok2vec, a component listens to
+    upstream = set()
+    if isinstance(config, dict):
+        if str(config.get('@architectures', '')).startswith(
+            _LISTENER_ARCHITECTURE
+        ):
+            upstream.add(config.get('upstream', '*'))
+        for value in config.values():
+            upstream.update(_listened_components(value))
+    return upstream
+
+
+def _unused_components(config, annotations):
+    components = config.get('components', {})
+    factories = dict(
+        (component, settings.get('factory', component))
+        for component, settings in components.items()
+    )
+    wanted = set()
+    for annotation in annotations:
+        wanted.update(ANNOTATION_FACTORIES[annotation])
+    keep = set(
+        component for component, factory in factories.items()
+        if factory in wanted or factory not in OPTIONAL_FACTORIES
+    )
+    for component in list(keep):
+        for upstream in _listened_components(components.get(component)):
+            if upstream == '*':
+                keep.update(
+                    other for other, factory in factories.items()
+                    if factory == 'tok2vec'
+                )
+            else:
+                keep.add(upstream)
+    return [
+        component for component in config['nlp'].get('pipeline', [])
+        if component not in keep
+    ]
+
+
+def excluded_components(name, annotations):
+    '''
+    Helper function to find the components of a pipeline that do not
+    contribute to the requested annotations
+
+    :param name: name or path of a spaCy pipeline
+    :param annotations: iterable of keys of `ANNOTATION_FACTORIES`, or
+                        None to keep the whole pipeline
+    :return: list of component names that can be excluded when loading
+    '''
+    if annotations is None:
+        return []
+    config = _model_config(name)
+    if config is None:
+        return []
+    return _unused_components(config, annotations)
+
+
+def disabled_components(nlp, annotations):
+    '''
+    Helper function to find the components of a loaded pipeline that can
+    be disabled for a call that only reads some annotations
+
+    :param nlp: object of `spacy.language.Language`
+    :param annotations: iterable of keys of `ANNOTATION_FACTORIES`, or
+                        None to run the whole pipeline
+    :return: list of component names to pass as `disable`
+    '''
+    if annotations is None or not hasattr(nlp, 'pipe_names'):
+        return []
+    unused = _unused_components(nlp.config, annotations)
+    return [component for component in nlp.pipe_names if component in unused]
+
+
+class ModelRegistry(object):
+    '''
+    Process-wide cache of loaded spaCy pipelines
+
+    Each pipeline is loaded at most once per process and the same
+    `spacy.language.Language` object is handed to every caller, so
+    parsing many resumes only pays the model loading cost once.
+    Components that produce none of the `LOADED_ANNOTATIONS` are not
+    loaded; callers that only read some annotations disable the other
+    components per call, see `disabled_components`.
+    '''
+
+    def __init__(
+        self,
+        model=DEFAULT_MODEL,
+        custom_model=DEFAULT_CUSTOM_MODEL
+    ):
+        self.__lock = threading.RLock()
+        self.__model = model
+        self.__custom_model = custom_model
+        self.__pipelines = {}
+        self.__custom_pipelines = {}
+        self.__matchers = {}
+        self.__custom_model_fallback = False
+
+    @property
+    def model(self):
+        return self.__model
+
+    @property
+    def custom_model(self):
+        return self.__custom_model
+
+    @property
+    def custom_model_fallback(self):
+        '''
+        True when the custom NER model could not be loaded and the
+        default pipeline is used in its place
+        '''
+        self.get_custom_nlp()
+        return self.__custom_model_fallback
+
+    def configure(self, model=None, custom_model=None):
+        '''
+        Swap the model names or paths used by the registry. Pipelines
+        loaded for the previous configuration are dropped.
+
+        :param model: name or path of the base spaCy pipeline
+        :param custom_model: name or path of the custom NER pipeline
+        '''
+        with self.__lock:
+            if model is not None:
+                self.__model = model
+            if custom_model is not None:
+                self.__custom_model = custom_model
+            self.clear()
+
+    def clear(self):
+        '''
+        Forget every loaded pipeline
+        '''
+        with self.__lock:
+            self.__pipelines = {}
+            self.__custom_pipelines = {}
+            self.__matchers = {}
+            self.__custom_model_fallback = False
+
+    def load(self, name):
+        '''
+        Load the spaCy pipeline `name` once and return the cached object
+        on every following call
+
+        :param name: name or path of a spaCy pipeline
+        :return: object of `spacy.language.Language`
+        '''
+        nlp = self.__pipelines.get(name)
+        if nlp is not None:
+            return nlp
+        with self.__lock:
+            nlp = self.__pipelines.get(name)
+            if nlp is None:
+                exclude = excluded_components(name, LOADED_ANNOTATIONS)
+                nlp = spacy.load(name, exclude=exclude)
+                self.get_name_matcher(nlp.vocab)
+                self.__pipelines[name] = nlp
+            return nlp
+
+    def get_name_matcher(self, vocab):
+        '''
+        Return the `Matcher` of the NAME pattern for a vocabulary
+
+        The matcher is built once per loaded pipeline and never modified
+        afterwards, so it can be shared between threads.
+
+        :param vocab: object of `spacy.vocab.Vocab`
+        :return: object of `spacy.matcher.Matcher`
+        '''
+        # vocabularies can not be weakly referenced, the matcher keeps
+        # its vocabulary alive so the id is not reused
+        matcher = self.__matchers.get(id(vocab))
+        if matcher is not None:
+            return matcher
+        with self.__lock:
+            matcher = self.__matchers.get(id(vocab))
+            if matcher is None:
+                matcher = Matcher(vocab)
+                matcher.add('NAME', [cs.NAME_PATTERN])
+                self.__matchers[id(vocab)] = matcher
+            return matcher
+
+    def get_nlp(self):
+        return self.load(self.__model)
+
+    def get_custom_nlp(self):
+        key = self.__custom_model
+        nlp = self.__custom_pipelines.get(key)
+        if nlp is not None:
+            return nlp
+        with self.__lock:
+            nlp = self.__custom_pipelines.get(key)
+            if nlp is not None:
+                return nlp
+            try:
+                nlp = self.load(self.__custom_model)
+            except (OSError, IOError):
+                # Custom model packaged with the library was trained on an
+                # older spaCy version and might not contain the
+                # configuration needed for newer spaCy releases (v3+). In
+                # that case we gracefully fall back to the default English
+                # model so that parsing still works. Both roles then share
+                # one pipeline, and one Doc per text.
+                nlp = self.get_nlp()
+                if not self.__custom_model_fallback:
+                    self.__custom_model_fallback = True
+                    warnings.warn(
+                        "Falling back to spaCy '{}' model because the "
+                        "custom NER model could not be loaded. Results "
+                        "might be less accurate.".format(self.__model),
+                        RuntimeWarning,
+                    )
+            self.__custom_pipelines[key] = nlp
+            return nlp
+
+    def warm_up(self):
+        '''
+        Load every configured pipeline ahead of the first parse
+        '''
+        self.get_nlp()
+        self.get_custom_nlp()
+        return self
+
+
+registry = ModelRegistry()
+
+
+def get_nlp():
+    return registry.get_nlp()
+
+
+def get_custom_nlp():
+    return registry.get_custom_nlp()
+
+
+def get_name_matcher(vocab):
+    return registry.get_name_matcher(vocab)
+
+
+def warm_up():
+    return registry.warm_up()
+
+
+def configure(model=None, custom_model=None):
+    registry.configure(model=model, custom_model=custom_model)
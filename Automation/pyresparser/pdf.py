@@ -0,0 +1,496 @@
+import io
+import math
+import time
+import threading
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from pdfminer.converter import TextConverter
+from pdfminer.pdfinterp import PDFPageInterpreter
+from pdfminer.pdfinterp import PDFResourceManager
+from pdfminer.layout import LAParams
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdfparser import PDFSyntaxError
+from pdfminer.pdftypes import resolve1
+from .extraction import ExtractedText
+
+# Layout analysis presets:
+# - default: full layout analysis, reconstructs lines and text boxes
+# - lines: groups characters into lines and boxes but keeps the boxes in
+#   content stream order instead of sorting them, which is the costly step
+# - none: no layout analysis at all; fastest, but lines are not separated
+#   so section based extraction will not find anything
+LAYOUT_PRESETS = {
+    'default': lambda: LAParams(),
+    'lines': lambda: LAParams(boxes_flow=None),
+    'none': lambda: None,
+}
+
+
+def get_laparams(layout='default'):
+    '''
+    Helper function to build the `LAParams` of a layout preset
+
+    :param layout: name of a preset in `LAYOUT_PRESETS`
+    :return: object of `pdfminer.layout.LAParams` or None
+    '''
+    try:
+        return LAYOUT_PRESETS[layout]()
+    except KeyError:
+        raise ValueError(
+            'Unknown layout {!r}, expected any of {}'.format(
+                layout,
+                ', '.join(LAYOUT_PRESETS)
+            )
+        )
+
+
+class _BudgetExceeded(Exception):
+
+    def __init__(self, reason):
+        Exception.__init__(self, reason)
+        self.reason = reason
+
+
+class _Budget(object):
+    '''
+    Tracks the `ExtractionLimits` of the document being extracted
+    '''
+
+    def __init__(self, limits=None):
+        self.deadline = limits.deadline() if limits is not None else None
+        self.max_pages = limits.max_pages if limits is not None else None
+        self.max_chars = limits.max_chars if limits is not None else None
+        self.chars = 0
+        self.page_chars = 0
+        self.pages = 0
+        self.page_count = 0
+        self.truncated = None
+
+    def check_time(self):
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise _BudgetExceeded('max_seconds')
+
+    def count_char(self):
+        self.page_chars += 1
+        if self.max_chars is not None and \
+                self.chars + self.page_chars > self.max_chars:
+            raise _BudgetExceeded('max_chars')
+
+
+class _BudgetedTextConverter(TextConverter):
+    '''
+    `TextConverter` that aborts the page being interpreted once the
+    document runs out of time or characters
+    '''
+
+    budget = _Budget()
+
+    def render_char(self, *args, **kwargs):
+        self.budget.count_char()
+        self.budget.check_time()
+        return TextConverter.render_char(self, *args, **kwargs)
+
+    def paint_path(self, *args, **kwargs):
+        self.budget.check_time()
+        return TextConverter.paint_path(self, *args, **kwargs)
+
+    def render_image(self, *args, **kwargs):
+        self.budget.check_time()
+        return TextConverter.render_image(self, *args, **kwargs)
+
+    def begin_figure(self, *args, **kwargs):
+        self.budget.check_time()
+        return TextConverter.begin_figure(self, *args, **kwargs)
+
+    def end_page(self, *args, **kwargs):
+        # layout analysis is the most expensive step of a page
+        self.budget.check_time()
+        return TextConverter.end_page(self, *args, **kwargs)
+
+
+class PDFTextEngine(object):
+    '''
+    Text extraction engine built around a single pdfminer resource
+    manager, converter and interpreter per document
+
+    Sharing the resource manager across the pages of a document lets
+    pdfminer parse each font once instead of once per page. Fonts are
+    cached by object id, which is only unique within a document, so every
+    document gets new pdfminer objects; the engine itself can be kept
+    and used for any number of documents.
+
+    :param layout: name of a preset in `LAYOUT_PRESETS`
+    '''
+
+    def __init__(self, layout='default'):
+        self.__laparams = get_laparams(layout)
+        self.__layout = layout
+
+    @property
+    def layout(self):
+        return self.__layout
+
+    def iter_pages(self, pdf_path, pagenos=None):
+        '''
+        Extract the plain text of every page of a PDF
+
+        :param pdf_path: path to PDF file or `io.BytesIO` object
+        :param pagenos: zero based numbers of the pages to extract, all
+                        pages when None
+        :return: iterator of tuples of page text and seconds spent on it
+        '''
+        return self.__iter_pages(pdf_path, pagenos, _Budget())
+
+    def extract(self, pdf_path, pagenos=None, limits=None):
+        '''
+        Extract the text of a PDF together with its page count in a
+        single pass over the document
+
+        :param pdf_path: path to PDF file or `io.BytesIO` object
+        :param pagenos: zero based numbers of the pages to extract, all
+                        pages when None
+        :param limits: object of `pyresparser.extraction.ExtractionLimits`
+        :return: object of `pyresparser.extraction.ExtractedText`
+        '''
+        if limits is not None and limits.too_large(pdf_path):
+            return ExtractedText([], truncated='max_bytes')
+        budget = _Budget(limits)
+        pages = []
+        timings = []
+        for text, seconds in self.__iter_pages(pdf_path, pagenos, budget):
+            pages.append(text)
+            timings.append(seconds)
+        document = ExtractedText(
+            pages,
+            page_count=budget.page_count,
+            timings=timings,
+            truncated=budget.truncated
+        )
+        if limits is not None:
+            # characters are counted as glyphs while interpreting; trim
+            # the text to the exact limit
+            limits.apply(document)
+        return document
+
+    def __open(self):
+        resource_manager = PDFResourceManager(caching=True)
+        output = io.StringIO()
+        converter = _BudgetedTextConverter(
+            resource_manager,
+            output,
+            codec='utf-8',
+            laparams=self.__laparams
+        )
+        interpreter = PDFPageInterpreter(resource_manager, converter)
+        return output, converter, interpreter
+
+    def __iter_pages(self, pdf_path, pagenos, budget):
+        # https://www.blog.pythonlibrary.org/2018/05/03/exporting-data-from-pdfs-with-python/
+        if isinstance(pdf_path, io.BytesIO):
+            # extract text from remote pdf file
+            for page in self.__iter_file_pages(pdf_path, pagenos, budget):
+                yield page
+        else:
+            # extract text from local pdf file
+            with open(pdf_path, 'rb') as fh:
+                for page in self.__iter_file_pages(fh, pagenos, budget):
+                    yield page
+
+    def __iter_file_pages(self, fh, pagenos, budget):
+        output, converter, interpreter = self.__open()
+        converter.budget = budget
+        try:
+            start = time.perf_counter()
+            for page in PDFPage.get_pages(
+                    fh,
+                    pagenos=pagenos,
+                    caching=True,
+                    check_extractable=True
+            ):
+                budget.page_count += 1
+                if budget.truncated:
+                    # only count the pages that are left
+                    continue
+                if budget.max_pages is not None and \
+                        budget.pages >= budget.max_pages:
+                    budget.truncated = 'max_pages'
+                    continue
+                budget.page_chars = 0
+                try:
+                    budget.check_time()
+                    interpreter.process_page(page)
+                except _BudgetExceeded as exceeded:
+                    budget.truncated = exceeded.reason
+                    self.__close_page(output, converter, page, exceeded)
+                text = output.getvalue()
+                output.seek(0)
+                output.truncate()
+                budget.pages += 1
+                budget.chars += len(text)
+                if text or not budget.truncated:
+                    yield text, time.perf_counter() - start
+                if budget.truncated == 'max_seconds':
+                    # the page count is unknown, don't spend more time
+                    budget.page_count = None
+                    return
+                start = time.perf_counter()
+        except PDFSyntaxError:
+            # the page count of an unreadable document is unknown
+            budget.page_count = None
+            return
+        finally:
+            converter.budget = _Budget()
+
+    def __close_page(self, output, converter, page, exceeded):
+        if exceeded.reason == 'max_chars':
+            # lay out the characters read before the limit was hit
+            converter.budget = _Budget()
+            try:
+                converter.end_page(page)
+                return
+            except AssertionError:
+                # the page was aborted inside a figure
+                pass
+        output.seek(0)
+        output.truncate()
+
+
+# Module wide defaults used by `extract_pdf`, see `configure`
+_options = {
+    'layout': 'default',
+    'parallel_threshold': None,
+    'processes': None,
+}
+
+
+def configure(**options):
+    '''
+    Change the defaults used by `extract_pdf` and therefore by
+    `ResumeParser`
+
+    :param layout: name of a preset in `LAYOUT_PRESETS`
+    :param parallel_threshold: page count from which the pages of a PDF
+                               are extracted by a process pool, None to
+                               always extract serially
+    :param processes: size of the process pool, defaults to the number
+                      of CPUs
+    '''
+    unknown = set(options).difference(_options)
+    if unknown:
+        raise ValueError('Unknown options {}'.format(sorted(unknown)))
+    if 'layout' in options:
+        get_laparams(options['layout'])
+    _options.update(options)
+
+
+def iter_pages(pdf_path, layout=None):
+    '''
+    Helper function to extract the plain text of every page of a PDF
+
+    :param pdf_path: path to PDF file or `io.BytesIO` object
+    :param layout: name of a preset in `LAYOUT_PRESETS`
+    :return: iterator of tuples of page text and seconds spent on the page
+    '''
+    return PDFTextEngine(layout or _options['layout']).iter_pages(pdf_path)
+
+
+def extract_pdf(pdf_path, layout=None, engine=None, limits=None):
+    '''
+    Extract the text of a PDF together with its page count in a single
+    pass over the document
+
+    :param pdf_path: path to PDF file or `io.BytesIO` object
+    :param layout: name of a preset in `LAYOUT_PRESETS`
+    :param engine: object of `PDFTextEngine` to use instead of a new one
+    :param limits: object of `pyresparser.extraction.ExtractionLimits`
+    :return: object of `pyresparser.extraction.ExtractedText`
+    '''
+    if engine is not None:
+        return engine.extract(pdf_path, limits=limits)
+    layout = layout or _options['layout']
+    if _options['parallel_threshold'] is not None:
+        return extract_pdf_parallel(
+            pdf_path,
+            layout=layout,
+            threshold=_options['parallel_threshold'],
+            processes=_options['processes'],
+            limits=limits
+        )
+    return PDFTextEngine(layout).extract(pdf_path, limits=limits)
+
+
+def count_pages(data):
+    '''
+    Helper function to read the page count of a PDF from its page tree
+    without interpreting any page
+
+    :param data: bytes of the PDF
+    :return: number of pages, None if it cannot be determined
+    '''
+    try:
+        document = PDFDocument(PDFParser(io.BytesIO(data)))
+        count = resolve1(resolve1(document.catalog['Pages']).get('Count'))
+    except Exception:
+        return None
+    return count if isinstance(count, int) else None
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor(processes=None):
+    '''
+    Return the process pool shared by page-parallel extraction, creating
+    it on first use
+
+    :param processes: size of the pool, defaults to the number of CPUs
+    :return: object of `concurrent.futures.ProcessPoolExecutor`
+    '''
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(processes)
+        return _executor
+
+
+def shutdown_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown()
+            _executor = None
+
+
+def _discard_executor(executor):
+    # the chunks still running when a document ran out of time cannot be
+    # cancelled; the next documents get a new pool instead of queueing
+    # behind them, and the old one exits once they stop at their own
+    # deadline
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+_worker_engines = {}
+
+
+def _extract_page_range(data, first, last, layout, limits):
+    engine = _worker_engines.get(layout)
+    if engine is None:
+        engine = _worker_engines[layout] = PDFTextEngine(layout)
+    document = engine.extract(
+        io.BytesIO(data),
+        pagenos=range(first, last),
+        limits=limits
+    )
+    return list(zip(document.pages, document.timings)), document.truncated
+
+
+def extract_pdf_parallel(
+    pdf_path,
+    layout=None,
+    threshold=20,
+    processes=None,
+    executor=None,
+    limits=None
+):
+    '''
+    Extract the text of a long PDF by splitting its pages across a
+    process pool. Documents shorter than `threshold` pages are extracted
+    serially, as the pool overhead would outweigh the gain, and so are
+    all documents in a daemonic process, e.g. a `multiprocessing.Pool`
+    worker, which cannot start the shared pool.
+
+    :param pdf_path: path to PDF file or `io.BytesIO` object
+    :param layout: name of a preset in `LAYOUT_PRESETS`
+    :param threshold: minimum number of pages to extract in parallel
+    :param processes: size of the shared pool when `executor` is None
+    :param executor: object of `concurrent.futures.Executor` to use
+    :param limits: object of `pyresparser.extraction.ExtractionLimits`
+    :return: object of `pyresparser.extraction.ExtractedText`
+    '''
+    layout = layout or _options['layout']
+    if limits is not None and limits.too_large(pdf_path):
+        return ExtractedText([], truncated='max_bytes')
+    started = time.perf_counter()
+    if isinstance(pdf_path, io.BytesIO):
+        data = pdf_path.getvalue()
+    else:
+        with open(pdf_path, 'rb') as fh:
+            data = fh.read()
+    page_count = count_pages(data)
+    if page_count is None or page_count < threshold:
+        return PDFTextEngine(layout).extract(io.BytesIO(data), limits=limits)
+    if executor is None:
+        if mp.current_process().daemon:
+            return PDFTextEngine(layout).extract(
+                io.BytesIO(data),
+                limits=limits
+            )
+        executor = get_executor(processes)
+        shared = True
+    else:
+        shared = False
+    deadline = limits.deadline() if limits is not None else None
+    last_page = page_count
+    truncated = None
+    if limits is not None and limits.max_pages is not None and \
+            limits.max_pages < page_count:
+        last_page = limits.max_pages
+        truncated = 'max_pages'
+    # a few chunks per worker keep the pool busy when some pages, e.g.
+    # those full of images, are much slower than others
+    workers = getattr(executor, '_max_workers', None) or 1
+    chunk_size = max(1, int(math.ceil(last_page / float(workers * 2))))
+    futures = [
+        executor.submit(
+            _extract_page_range,
+            data,
+            first,
+            min(first + chunk_size, last_page),
+            layout,
+            limits
+        )
+        for first in range(0, last_page, chunk_size)
+    ]
+    pages = []
+    timings = []
+    try:
+        for future in futures:
+            timeout = None
+            if deadline is not None:
+                timeout = max(0, deadline - time.perf_counter())
+            try:
+                chunk, chunk_truncated = future.result(timeout)
+            except FutureTimeoutError:
+                chunk_truncated = 'max_seconds'
+                chunk = []
+            for text, seconds in chunk:
+                pages.append(text)
+                timings.append(seconds)
+            if chunk_truncated:
+                # pages after a truncated chunk would leave a gap in the
+                # text
+                truncated = chunk_truncated
+                break
+    finally:
+        for future in futures:
+            future.cancel()
+    if shared and truncated == 'max_seconds' and \
+            not all(future.done() for future in futures):
+        _discard_executor(executor)
+    document = ExtractedText(
+        pages,
+        page_count=page_count,
+        timings=timings,
+        truncated=truncated
+    )
+    if limits is not None:
+        limits.apply(document, started)
+    return document
@@ -0,0 +1,420 @@
+import io
+import os
+import time
+import queue
+import threading
+import multiprocessing as mp
+from . import doc
+from . import utils
+from .skills import load_skills
+from .resume_parser import ResumeParser
+from .workers import ParseResult, resume_name
+
+# items waiting in front of a stage per unit of its concurrency; the
+# queues are bounded, so a slow stage holds back the stages before it
+PENDING_ITEMS = 2
+
+# seconds between two checks of the stop flag while blocked on a queue
+_POLL = 0.1
+
+# marks the end of a stream in the queues between stages
+_END = object()
+
+STAGES = ('read', 'extract', 'nlp')
+
+
+def _extension(resume):
+    if isinstance(resume, io.BytesIO):
+        return '.' + resume.name.split('.')[1]
+    return '.' + os.path.splitext(resume)[1].split('.')[1]
+
+
+def _init_extractor(doc_timeout):
+    doc.configure(timeout=doc_timeout)
+
+
+def _extract(resume, limits):
+    started = time.perf_counter()
+    try:
+        document = utils.extract_document(
+            resume,
+            _extension(resume),
+            limits=limits
+        )
+        error = None
+    except Exception as exception:
+        document = None
+        error = repr(exception)
+    return document, error, os.getpid(), time.perf_counter() - started
+
+
+class _Stage(object):
+
+    def __init__(self, workers, waiting):
+        self.workers = workers
+        self.items = 0
+        self.busy = 0.0
+        self.max_queue = 0
+        self.__waiting = waiting
+        self.__samples = 0
+        self.__depths = 0
+        self.__lock = threading.Lock()
+
+    def sample(self):
+        depth = self.__waiting()
+        with self.__lock:
+            self.__samples += 1
+            self.__depths += depth
+            self.max_queue = max(self.max_queue, depth)
+
+    def done(self, seconds):
+        with self.__lock:
+            self.items += 1
+            self.busy += seconds
+
+    def as_dict(self, elapsed):
+        with self.__lock:
+            return {
+                'workers': self.workers,
+                'items': self.items,
+                'busy': self.busy,
+                'utilisation': self.busy / (elapsed * self.workers)
+                if elapsed else 0.0,
+                'queue': self.__waiting(),
+                'mean_queue': self.__depths / float(self.__samples)
+                if self.__samples else 0.0,
+                'max_queue': self.max_queue,
+            }
+
+
+class StagedPipeline(object):
+    '''
+    Parses resumes in three stages connected by bounded queues
+
+    - read: threads load the bytes of every resume file
+    - extract: a process pool extracts the text, e.g. with pdfminer
+    - nlp: the calling process streams the texts through spaCy with
+      `nlp.pipe` in batches, with `nlp_processes` processes
+
+    Every stage has its own concurrency, so I/O, text extraction and
+    inference can each be given the cores they need. A stage only takes
+    new work while the queue after it has room, so memory stays bounded
+    and a slow stage holds back the ones before it. `stats` reports the
+    queue depth and utilisation of every stage for tuning.
+
+    Results are yielded in order of completion, as `ParseResult` with
+    the extraction worker and the seconds it spent on the resume; a
+    resume that fails in any stage is reported in its result instead of
+    stopping the run.
+
+    :param readers: number of reader threads
+    :param extractors: number of text extraction processes, defaults to
+                       the number of CPUs
+    :param nlp_processes: number of processes used by `nlp.pipe`
+    :param batch_size: number of texts spaCy processes per batch
+    :param doc_timeout: seconds allowed to convert a .doc file
+    '''
+
+    def __init__(
+        self,
+        readers=4,
+        extractors=None,
+        nlp_processes=1,
+        batch_size=32,
+        skills_file=None,
+        custom_regex=None,
+        fields=None,
+        limits=None,
+        section_headers=None,
+        nlp_options=None,
+        doc_timeout=doc.DEFAULT_TIMEOUT
+    ):
+        self.__readers = readers
+        self.__extractors = extractors or mp.cpu_count()
+        self.__nlp_processes = nlp_processes
+        self.__batch_size = batch_size
+        self.__skills_file = skills_file
+        self.__custom_regex = custom_regex
+        self.__fields = fields
+        self.__limits = limits
+        self.__section_headers = section_headers
+        self.__nlp_options = nlp_options
+        self.__doc_timeout = doc_timeout
+        self.__pool = None
+        self.__stages = None
+        self.__started = None
+
+    def start(self):
+        '''
+        Start the extraction processes and load the models
+        '''
+        if self.__pool is not None:
+            return
+        # started before the models are loaded, which the extractors
+        # never use
+        self.__pool = mp.Pool(
+            self.__extractors,
+            initializer=_init_extractor,
+            initargs=(self.__doc_timeout,)
+        )
+        ResumeParser.warm_up(self.__fields, self.__nlp_options)
+        load_skills(self.__skills_file)
+
+    def imap(self, resumes):
+        '''
+        Parse resumes through the stages
+
+        :param resumes: iterable of resume file paths or `io.BytesIO`
+                        objects, read lazily
+        :return: iterator of `ParseResult`, in order of completion
+        '''
+        self.start()
+        stop = threading.Event()
+        paths = queue.Queue(self.__readers * PENDING_ITEMS)
+        loaded = queue.Queue(self.__extractors * PENDING_ITEMS)
+        # extracted texts; bounded by the slots, taken back by the nlp
+        # stage as it reads them
+        extracted = queue.Queue()
+        slots = threading.BoundedSemaphore(
+            self.__extractors * PENDING_ITEMS + self.__batch_size
+        )
+        self.__stages = {
+            'read': _Stage(self.__readers, paths.qsize),
+            'extract': _Stage(self.__extractors, loaded.qsize),
+            'nlp': _Stage(1, extracted.qsize),
+        }
+        self.__started = time.perf_counter()
+        errors = []
+        threads = [
+            threading.Thread(
+                target=self.__feed,
+                args=(resumes, paths, stop, errors)
+            ),
+            threading.Thread(
+                target=self.__dispatch,
+                args=(loaded, extracted, slots, stop, errors)
+            ),
+        ] + [
+            threading.Thread(target=self.__read, args=(paths, loaded, stop))
+            for _ in range(self.__readers)
+        ]
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+        try:
+            for result in self.__parse(extracted, slots):
+                yield result
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+        if errors:
+            raise errors[0]
+
+    def __feed(self, resumes, paths, stop, errors):
+        try:
+            for resume in resumes:
+                if not _put(paths, resume, stop):
+                    return
+        except Exception as exception:
+            errors.append(exception)
+        for _ in range(self.__readers):
+            _put(paths, _END, stop)
+
+    def __read(self, paths, loaded, stop):
+        stage = self.__stages['read']
+        while True:
+            resume = _get(paths, stop)
+            if resume is None or resume is _END:
+                _put(loaded, _END, stop)
+                return
+            stage.sample()
+            started = time.perf_counter()
+            name = resume_name(resume)
+            if isinstance(resume, io.BytesIO):
+                item = (name, resume, None)
+            else:
+                try:
+                    with open(resume, 'rb') as fh:
+                        buffer = io.BytesIO(fh.read())
+                    buffer.name = os.path.basename(resume)
+                    item = (name, buffer, None)
+                except OSError as exception:
+                    item = (name, None, repr(exception))
+            stage.done(time.perf_counter() - started)
+            if not _put(loaded, item, stop):
+                return
+
+    def __dispatch(self, loaded, extracted, slots, stop, errors):
+        stage = self.__stages['extract']
+        readers = self.__readers
+        submitted = 0
+        try:
+            while readers:
+                item = _get(loaded, stop)
+                if item is None:
+                    return
+                if item is _END:
+                    readers -= 1
+                    continue
+                stage.sample()
+                while not slots.acquire(timeout=_POLL):
+                    if stop.is_set():
+                        return
+                name, buffer, error = item
+                if error is not None:
+                    submitted += 1
+                    extracted.put((name, None, error, None, 0.0))
+                    continue
+
+                def done(result, name=name):
+                    document, error, worker, seconds = result
+                    stage.done(seconds)
+                    extracted.put((name, document, error, worker, seconds))
+
+                def failed(exception, name=name):
+                    extracted.put((name, None, repr(exception), None, 0.0))
+
+                self.__pool.apply_async(
+                    _extract,
+                    (buffer, self.__limits),
+                    callback=done,
+                    error_callback=failed
+                )
+                submitted += 1
+        except Exception as exception:
+            errors.append(exception)
+        finally:
+            # the nlp stage waits for as many results as were submitted,
+            # however the dispatch ends
+            extracted.put((_END, submitted))
+
+    def __parse(self, extracted, slots):
+        stage = self.__stages['nlp']
+        failed = []
+        waited = [0.0]
+
+        def documents():
+            received = 0
+            total = None
+            while total is None or received < total:
+                started = time.perf_counter()
+                item = extracted.get()
+                waited[0] += time.perf_counter() - started
+                if item[0] is _END:
+                    total = item[1]
+                    continue
+                received += 1
+                slots.release()
+                stage.sample()
+                name, document, error, worker, seconds = item
+                if document is None:
+                    failed.append(
+                        ParseResult(name, None, error, worker, seconds)
+                    )
+                else:
+                    # the key stands in for the resume, whose text is
+                    # already extracted
+                    yield (name, worker, seconds), document
+
+        results = ResumeParser.parse_documents(
+            documents(),
+            self.__skills_file,
+            self.__custom_regex,
+            fields=self.__fields,
+            limits=self.__limits,
+            section_headers=self.__section_headers,
+            nlp_options=self.__nlp_options,
+            batch_size=self.__batch_size,
+            n_process=self.__nlp_processes
+        )
+        while True:
+            started = time.perf_counter()
+            waited_before = waited[0]
+            try:
+                (name, worker, seconds), data, error = next(results)
+            except StopIteration:
+                break
+            stage.done(
+                time.perf_counter() - started - (waited[0] - waited_before)
+            )
+            while failed:
+                yield failed.pop(0)
+            yield ParseResult(name, data, error, worker, seconds)
+        while failed:
+            yield failed.pop(0)
+
+    @property
+    def stats(self):
+        '''
+        :return: dictionary of stage name to its number of workers, the
+                 resumes it handled, the seconds it was busy, its
+                 utilisation (busy time over elapsed time and workers),
+                 and the current, mean and highest number of resumes
+                 waiting in front of it; the nlp stage is measured in
+                 the calling process, which feeds the `nlp.pipe`
+                 processes
+        '''
+        if self.__stages is None:
+            return {}
+        elapsed = time.perf_counter() - self.__started
+        return dict(
+            (name, self.__stages[name].as_dict(elapsed)) for name in STAGES
+        )
+
+    def report(self):
+        '''
+        :return: multi-line string with the utilisation and queue depth of
+                 every stage
+        '''
+        lines = []
+        for name, stats in sorted(
+            self.stats.items(),
+            key=lambda item: STAGES.index(item[0])
+        ):
+            lines.append(
+                '{:<8} {:>3} workers: {} resumes, {:.0%} busy, queue '
+                'mean {:.1f} max {}'.format(
+                    name,
+                    stats['workers'],
+                    stats['items'],
+                    stats['utilisation'],
+                    stats['mean_queue'],
+                    stats['max_queue']
+                )
+            )
+        return '\n'.join(lines)
+
+    def close(self):
+        if self.__pool is not None:
+            self.__pool.close()
+            self.__pool.join()
+            self.__pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        if exc_info[0] is not None and self.__pool is not None:
+            self.__pool.terminate()
+        self.close()
+
+
+def _put(items, item, stop):
+    # blocks while the queue is full, unless the pipeline is stopped
+    while not stop.is_set():
+        try:
+            items.put(item, timeout=_POLL)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _get(items, stop):
+    while not stop.is_set():
+        try:
+            return items.get(timeout=_POLL)
+        except queue.Empty:
+            pass
+    return None
@@ -0,0 +1,264 @@
+import re
+import itertools
+from . import models
+
+
+class ExecutionPlan(object):
+    '''
+    Describes which spaCy pipeline runs over which view of the resume text
+
+    Every role (e.g. the base or the custom NER pass) is mapped to a
+    pipeline, a text view and the annotations it reads. Roles sharing the
+    same pipeline and view are collapsed into a single step running the
+    components of all their annotations, so each distinct pipeline runs
+    over each distinct text exactly once and the resulting `Doc` is
+    shared.
+    '''
+
+    def __init__(self):
+        self.__steps = []
+        self.__roles = {}
+
+    @property
+    def steps(self):
+        return [(nlp, view) for nlp, view, _ in self.__steps]
+
+    @property
+    def roles(self):
+        return list(self.__roles.keys())
+
+    def add(self, role, nlp, view, annotations=None):
+        '''
+        Register a pipeline pass
+
+        :param role: name under which the resulting `Doc` is returned
+        :param nlp: object of `spacy.language.Language`
+        :param view: name of the text view the pipeline runs over
+        :param annotations: iterable of the annotations the role reads,
+                            any of `models.ANNOTATION_FACTORIES`; the
+                            other components are disabled. The whole
+                            pipeline runs when None.
+        :return: the plan itself
+        '''
+        if annotations is not None:
+            annotations = frozenset(annotations)
+        for index, (step_nlp, step_view, wanted) in enumerate(self.__steps):
+            if step_nlp is nlp and step_view == view:
+                if wanted is None or annotations is None:
+                    wanted = None
+                else:
+                    wanted = wanted | annotations
+                self.__steps[index] = (nlp, view, wanted)
+                break
+        else:
+            index = len(self.__steps)
+            self.__steps.append((nlp, view, annotations))
+        self.__roles[role] = index
+        return self
+
+    def run(self, views):
+        '''
+        Execute the plan over the text views of a single document
+
+        :param views: dictionary of view name to text
+        :return: dictionary of role to `spacy.tokens.doc.Doc`
+        '''
+        done = {}
+        docs = []
+        for nlp, view, annotations in self.__steps:
+            # different views may still hold the same text
+            key = (id(nlp), annotations, views[view])
+            if key not in done:
+                disabled = models.disabled_components(nlp, annotations)
+                if disabled:
+                    done[key] = nlp(views[view], disable=disabled)
+                else:
+                    done[key] = nlp(views[view])
+            docs.append(done[key])
+        return self.__by_role(docs)
+
+    def pipe(self, views, batch_size=32, n_process=1):
+        '''
+        Execute the plan over a stream of documents with `nlp.pipe`
+
+        :param views: iterable of dictionaries of view name to text
+        :param batch_size: number of texts spaCy processes per batch
+        :param n_process: number of processes used by `nlp.pipe`
+        :return: iterator of dictionaries of role to `Doc`, in input order
+        '''
+        if not self.__steps:
+            for _ in views:
+                yield {}
+            return
+        streams = itertools.tee(views, len(self.__steps))
+        doc_streams = []
+        for (nlp, view, annotations), stream in zip(self.__steps, streams):
+            options = {'batch_size': batch_size, 'n_process': n_process}
+            disabled = models.disabled_components(nlp, annotations)
+            if disabled:
+                options['disable'] = disabled
+            doc_streams.append(
+                nlp.pipe((item[view] for item in stream), **options)
+            )
+        for docs in zip(*doc_streams):
+            yield self.__by_role(docs)
+
+    def __by_role(self, docs):
+        return {role: docs[index] for role, index in self.__roles.items()}
+
+
+# tokens at the start of a resume searched for the name
+NAME_WINDOW = 100
+
+# sections the custom NER model runs over in targeted mode
+NER_SECTIONS = ('education', 'experience')
+
+MODES = ('full', 'targeted')
+
+_WORD_RE = re.compile(r'\S+')
+
+
+class NLPOptions(object):
+    '''
+    Bounds on the spaCy work spent on a single resume
+
+    In 'full' mode every pipeline runs over the whole resume. In
+    'targeted' mode the base pipeline only runs over the header window,
+    where the name is, and the custom NER model over the header window
+    and the sections listed in `NER_SECTIONS`, so the cost of the
+    statistical components no longer grows with the length of the
+    resume. Skills are matched on the output of the tokenizer in both
+    modes.
+
+    :param mode: 'full' or 'targeted'
+    :param name_window: number of tokens at the start of the resume
+                        searched for the name, the whole resume when None
+    :param max_tokens: number of words of each text handed to spaCy,
+                       unbounded when None
+    '''
+
+    def __init__(self, mode='full', name_window=NAME_WINDOW, max_tokens=None):
+        if mode not in MODES:
+            raise ValueError(
+                'Unknown mode {!r}, expected any of {}'.format(
+                    mode,
+                    ', '.join(MODES)
+                )
+            )
+        self.mode = mode
+        self.name_window = name_window
+        self.max_tokens = max_tokens
+
+    def as_dict(self):
+        return {
+            'mode': self.mode,
+            'name_window': self.name_window,
+            'max_tokens': self.max_tokens,
+        }
+
+
+class Tokenizer(object):
+    '''
+    Runs only the tokenizer of a pipeline, behind the same `__call__`
+    and `pipe` interface as `spacy.language.Language`
+
+    :param nlp: object of `spacy.language.Language`
+    '''
+
+    def __init__(self, nlp):
+        self.__nlp = nlp
+
+    def __call__(self, text):
+        return self.__nlp.make_doc(text)
+
+    def pipe(self, texts, batch_size=32, n_process=1):
+        return self.__nlp.tokenizer.pipe(texts, batch_size=batch_size)
+
+
+def head(text, words):
+    '''
+    Helper function to cut a text after a number of words
+
+    :param text: text to cut
+    :param words: number of whitespace separated words to keep, or None
+                  to keep the whole text
+    :return: prefix of the text, with its original whitespace
+    '''
+    if words is None:
+        return text
+    if words <= 0:
+        return ''
+    for count, match in enumerate(_WORD_RE.finditer(text), 1):
+        if count == words:
+            return text[:match.end()]
+    return text
+
+
+FIELDS = (
+    'name',
+    'email',
+    'mobile_number',
+    'skills',
+    'college_name',
+    'degree',
+    'designation',
+    'experience',
+    'company_names',
+    'no_of_pages',
+    'total_experience',
+)
+
+# spaCy passes each field depends on; fields that are not listed are
+# extracted with regexes or from the raw text only
+FIELD_ROLES = {
+    'name': ('nlp', 'custom_nlp'),
+    'skills': ('tokens',),
+    'degree': ('custom_nlp',),
+    'designation': ('custom_nlp',),
+    'company_names': ('custom_nlp',),
+}
+
+# annotations, see `pyresparser.models.ANNOTATION_FACTORIES`, each spaCy
+# pass needs; pipeline components producing anything else are disabled
+ROLE_ANNOTATIONS = {
+    'nlp': ('POS',),
+    'custom_nlp': ('ENT',),
+    'tokens': (),
+}
+
+# fields read from the resume sections
+SECTION_FIELDS = frozenset(['college_name', 'experience', 'total_experience'])
+
+
+def select_fields(fields=None):
+    '''
+    Validate the requested fields
+
+    :param fields: iterable of field names, or None for every field
+    :return: frozenset of field names
+    '''
+    if fields is None:
+        return frozenset(FIELDS)
+    fields = frozenset(fields)
+    unknown = fields.difference(FIELDS)
+    if unknown:
+        raise ValueError(
+            'Unknown fields {}, expected any of {}'.format(
+                sorted(unknown),
+                ', '.join(FIELDS)
+            )
+        )
+    return fields
+
+
+def roles_for(fields):
+    '''
+    Helper function to find the spaCy passes needed by a set of fields
+
+    :param fields: iterable of field names
+    :return: set of roles, e.g. {'nlp', 'custom_nlp'}
+    '''
+    roles = set()
+    for field in fields:
+        roles.update(FIELD_ROLES.get(field, ()))
+    return roles
@@ -0,0 +1,224 @@
+import io
+import os
+import time
+import threading
+import posixpath
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import unquote, urlsplit
+import requests
+from .backends import MIME_TYPES
+
+# concurrent downloads; fetching is network bound, so a few threads per
+# parsing process keep the workers busy
+DEFAULT_FETCHERS = 8
+
+# seconds to wait for the server to connect and to send data
+DEFAULT_TIMEOUT = 30
+
+# downloads started per thread ahead of the results being consumed
+PENDING_DOWNLOADS = 2
+
+USER_AGENT = 'Mozilla/5.0'
+
+_CHUNK_SIZE = 64 * 1024
+
+_EXTENSIONS = dict(
+    (mime_type, extension) for extension, mime_type in MIME_TYPES.items()
+)
+
+FetchResult = namedtuple('FetchResult', ['url', 'resume', 'error', 'seconds'])
+
+
+class DownloadTooLarge(Exception):
+    pass
+
+
+class UnsupportedType(Exception):
+    pass
+
+
+def read_urls(path):
+    '''
+    Helper function to read a list of URLs lazily, one per line; blank
+    lines and lines starting with # are skipped
+
+    :param path: path of the text file
+    :return: iterator of URLs
+    '''
+    with open(path, encoding='utf-8') as fh:
+        for line in fh:
+            url = line.strip()
+            if url and not url.startswith('#'):
+                yield url
+
+
+def resume_filename(url, content_type=None):
+    '''
+    Helper function to name a downloaded resume after its URL; the
+    extension comes from the Content-Type when the URL has none the
+    parser supports
+
+    :param url: URL of the resume
+    :param content_type: Content-Type header of the response
+    :return: file name, e.g. 'resume.pdf'; its extension is not one the
+             parser supports when neither the URL nor the Content-Type
+             tell the type of the resume
+    '''
+    name = posixpath.basename(unquote(urlsplit(url).path))
+    if os.path.splitext(name)[1].lower() not in MIME_TYPES and content_type:
+        extension = _EXTENSIONS.get(content_type.split(';')[0].strip().lower())
+        if extension is not None:
+            name = (name or 'resume') + extension
+    return name
+
+
+class RemoteFetcher(object):
+    '''
+    Downloads resumes concurrently from a thread pool
+
+    Every thread keeps its own `requests.Session`, so the connections to
+    a server are kept alive and reused from one resume to the next. Only
+    a few downloads per thread are in flight at any time, so memory stays
+    bounded however many URLs are read. Downloaded resumes are
+    `io.BytesIO` objects named after their URL, with the URL itself in
+    their `url` attribute, ready for `ResumeParser` or `ParserPool`.
+
+    :param fetchers: number of download threads
+    :param timeout: seconds to wait for a server
+    :param max_bytes: downloads larger than this many bytes are stopped
+                      and reported as errors
+    :param headers: dictionary of extra request headers
+    '''
+
+    def __init__(
+        self,
+        fetchers=DEFAULT_FETCHERS,
+        timeout=DEFAULT_TIMEOUT,
+        max_bytes=None,
+        headers=None
+    ):
+        self.__fetchers = fetchers
+        self.__timeout = timeout
+        self.__max_bytes = max_bytes
+        self.__headers = {'User-Agent': USER_AGENT}
+        self.__headers.update(headers or {})
+        self.__executor = ThreadPoolExecutor(fetchers)
+        self.__local = threading.local()
+        self.__sessions = []
+        self.__lock = threading.Lock()
+        self.__stats = {
+            'downloads': 0,
+            'errors': 0,
+            'bytes': 0,
+            'sessions': 0,
+        }
+
+    @property
+    def stats(self):
+        '''
+        :return: dictionary with the number of downloads, errors, bytes
+                 downloaded and sessions opened
+        '''
+        with self.__lock:
+            return dict(self.__stats)
+
+    def __session(self):
+        session = getattr(self.__local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.__headers)
+            self.__local.session = session
+            with self.__lock:
+                self.__sessions.append(session)
+                self.__stats['sessions'] += 1
+        return session
+
+    def fetch(self, url):
+        '''
+        Download one resume
+
+        :param url: URL of the resume
+        :return: `FetchResult`, with the error message instead of the
+                 resume when the download failed or the type of the
+                 resume is not supported
+        '''
+        started = time.perf_counter()
+        try:
+            resume = self.__download(url)
+            error = None
+        except (
+            requests.RequestException,
+            DownloadTooLarge,
+            UnsupportedType
+        ) as exception:
+            resume = None
+            error = repr(exception)
+        with self.__lock:
+            if error is None:
+                self.__stats['downloads'] += 1
+                self.__stats['bytes'] += len(resume.getbuffer())
+            else:
+                self.__stats['errors'] += 1
+        return FetchResult(url, resume, error, time.perf_counter() - started)
+
+    def __download(self, url):
+        with self.__session().get(
+            url,
+            timeout=self.__timeout,
+            stream=True
+        ) as response:
+            response.raise_for_status()
+            content_type = response.headers.get('Content-Type')
+            name = resume_filename(url, content_type)
+            # checked before the body is read, the parser picks the
+            # backend by extension
+            if os.path.splitext(name)[1].lower() not in MIME_TYPES:
+                raise UnsupportedType(
+                    'Unsupported type {!r} of {}'.format(content_type, url)
+                )
+            resume = io.BytesIO()
+            for chunk in response.iter_content(_CHUNK_SIZE):
+                resume.write(chunk)
+                if self.__max_bytes is not None and \
+                        resume.tell() > self.__max_bytes:
+                    raise DownloadTooLarge(
+                        'More than {} bytes'.format(self.__max_bytes)
+                    )
+        resume.seek(0)
+        resume.name = name
+        resume.url = url
+        return resume
+
+    def imap(self, urls):
+        '''
+        Download resumes concurrently
+
+        :param urls: iterable of URLs, read lazily
+        :return: iterator of `FetchResult` in order of completion
+        '''
+        window = self.__fetchers * PENDING_DOWNLOADS
+        pending = set()
+        for url in urls:
+            pending.add(self.__executor.submit(self.fetch, url))
+            if len(pending) >= window:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+    def close(self):
+        self.__executor.shutdown(wait=True)
+        with self.__lock:
+            for session in self.__sessions:
+                session.close()
+            self.__sessions = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -1,12 +1,14 @@
 
 import os
-import warnings
-import multiprocessing as mp
+import itertools
 import io
-import spacy
+import collections
 import pprint
-from spacy.matcher import Matcher
+from . import models
+from . import plan
 from . import utils
+from .contacts import scan_contacts
+from .sections import get_segmenter, section_lines
 
 
 class ResumeParser(object):
@@ -15,28 +17,322 @@ class ResumeParser(object):
         self,
         resume,
         skills_file=None,
-        custom_regex=None
+        custom_regex=None,
+        fields=None,
+        cache=None,
+        limits=None,
+        section_headers=None,
+        nlp_options=None
     ):
-        nlp = spacy.load('en_core_web_sm')
-        custom_model_path = os.path.dirname(os.path.abspath(__file__))
-        self.__custom_model_fallback = False
-        try:
-            custom_nlp = spacy.load(custom_model_path)
-        except (OSError, IOError):
-            # Custom model packaged with the library was trained on an older
-            # spaCy version and might not contain the configuration needed for
-            # newer spaCy releases (v3+). In that case we gracefully fall back
-            # to the default English model so that parsing still works.
-            custom_nlp = nlp
-            self.__custom_model_fallback = True
-            warnings.warn(
-                "Falling back to spaCy 'en_core_web_sm' model because the custom "
-                "NER model could not be loaded. Results might be less accurate.",
-                RuntimeWarning,
+        self.__load(
+            resume,
+            skills_file,
+            custom_regex,
+            fields,
+            cache,
+            limits,
+            section_headers,
+            nlp_options
+        )
+        if not self.__cached:
+            self.__parse(
+                self.__plan(self.__fields, self.__nlp_options).run(
+                    self.__views()
+                )
+            )
+
+    @classmethod
+    def parse_many(
+        cls,
+        resumes,
+        skills_file=None,
+        custom_regex=None,
+        fields=None,
+        cache=None,
+        limits=None,
+        section_headers=None,
+        nlp_options=None,
+        batch_size=32,
+        n_process=1
+    ):
+        '''
+        Parse several resumes, streaming their text through spaCy in
+        batches instead of running the pipelines once per document
+
+        :param resumes: iterable of resume file paths or `io.BytesIO`
+                        objects
+        :param skills_file: custom skills CSV file
+        :param custom_regex: custom regex for parsing mobile numbers
+        :param fields: names of the fields to extract, all when None
+        :param cache: object of `pyresparser.cache.ResultCache`
+        :param limits: object of `pyresparser.extraction.ExtractionLimits`
+        :param section_headers: header phrases of the resume sections, or
+                                dictionary of header phrase to section
+                                name
+        :param nlp_options: object of `pyresparser.plan.NLPOptions`
+        :param batch_size: number of texts spaCy processes per batch
+        :param n_process: number of processes used by `nlp.pipe`
+        :return: iterator of extracted data dictionaries, in input order
+        '''
+        fields = plan.select_fields(fields)
+        nlp_options = nlp_options or plan.NLPOptions()
+        parsers = (
+            cls.__loaded(
+                resume,
+                skills_file,
+                custom_regex,
+                fields,
+                cache,
+                limits,
+                section_headers,
+                nlp_options
+            )
+            for resume in resumes
+        )
+        parsers, plan_parsers = itertools.tee(parsers)
+        docs = cls.__plan(fields, nlp_options).pipe(
+            (
+                parser.__views() for parser in plan_parsers
+                if not parser.__cached
+            ),
+            batch_size=batch_size,
+            n_process=n_process
+        )
+        for parser in parsers:
+            if not parser.__cached:
+                parser.__parse(next(docs))
+            yield parser.get_extracted_data()
+
+    @classmethod
+    def parse_documents(
+        cls,
+        documents,
+        skills_file=None,
+        custom_regex=None,
+        fields=None,
+        limits=None,
+        section_headers=None,
+        nlp_options=None,
+        batch_size=32,
+        n_process=1
+    ):
+        '''
+        Parse resumes whose text was already extracted, streaming it
+        through spaCy in batches; a resume that fails to parse is reported
+        instead of stopping the stream
+
+        :param documents: iterable of (resume, `ExtractedText`) pairs
+        :param skills_file: custom skills CSV file
+        :param custom_regex: custom regex for parsing mobile numbers
+        :param fields: names of the fields to extract, all when None
+        :param limits: object of `pyresparser.extraction.ExtractionLimits`
+                       the text was extracted with
+        :param section_headers: header phrases of the resume sections, or
+                                dictionary of header phrase to section
+                                name
+        :param nlp_options: object of `pyresparser.plan.NLPOptions`
+        :param batch_size: number of texts spaCy processes per batch
+        :param n_process: number of processes used by `nlp.pipe`
+        :return: iterator of (resume, data, error) triples, in input
+                 order; data is None and error the error message when
+                 parsing failed
+        '''
+        fields = plan.select_fields(fields)
+        nlp_options = nlp_options or plan.NLPOptions()
+        execution_plan = cls.__plan(fields, nlp_options)
+        # resumes read by spaCy and not reported yet, in input order; those
+        # that failed before reaching spaCy carry their error instead of a
+        # parser
+        pending = collections.deque()
+        errors = []
+
+        def views():
+            try:
+                for resume, document in documents:
+                    try:
+                        parser = cls.__loaded(
+                            resume,
+                            skills_file,
+                            custom_regex,
+                            fields,
+                            None,
+                            limits,
+                            section_headers,
+                            nlp_options,
+                            document
+                        )
+                        text_views = parser.__views()
+                    except Exception as exception:
+                        pending.append((resume, None, repr(exception)))
+                        continue
+                    pending.append((resume, parser, None))
+                    yield text_views
+            except Exception as exception:
+                # raised once the resumes read before it are reported
+                errors.append(exception)
+                raise
+
+        def parsed(resume, parser, docs=None):
+            try:
+                if docs is None:
+                    docs = execution_plan.run(parser.__views())
+                parser.__parse(docs)
+            except Exception as exception:
+                return resume, None, repr(exception)
+            return resume, parser.get_extracted_data(), None
+
+        stream = views()
+        doc_stream = execution_plan.pipe(
+            stream,
+            batch_size=batch_size,
+            n_process=n_process
+        )
+        while True:
+            try:
+                docs = next(doc_stream)
+            except StopIteration:
+                break
+            except Exception:
+                # nlp.pipe reads a whole batch ahead, so the error may come
+                # from any resume read so far: those are parsed one at a
+                # time, then the rest of the stream goes through a new pipe
+                while pending:
+                    resume, parser, error = pending.popleft()
+                    if parser is None:
+                        yield resume, None, error
+                    else:
+                        yield parsed(resume, parser)
+                if errors:
+                    raise errors[0]
+                doc_stream = execution_plan.pipe(
+                    stream,
+                    batch_size=batch_size,
+                    n_process=n_process
+                )
+                continue
+            while pending[0][1] is None:
+                yield pending.popleft()
+            resume, parser, _ = pending.popleft()
+            yield parsed(resume, parser, docs)
+        while pending:
+            yield pending.popleft()
+
+    @classmethod
+    def warm_up(cls, fields=None, nlp_options=None):
+        '''
+        Load the spaCy pipelines needed for the given fields, e.g. before
+        forking worker processes
+
+        :param fields: names of the fields to extract, all when None
+        :param nlp_options: object of `pyresparser.plan.NLPOptions`
+        '''
+        cls.__plan(
+            plan.select_fields(fields),
+            nlp_options or plan.NLPOptions()
+        )
+
+    @staticmethod
+    def __plan(fields, nlp_options):
+        targeted = nlp_options.mode == 'targeted'
+        roles = plan.roles_for(fields)
+        annotations = plan.ROLE_ANNOTATIONS
+        execution_plan = plan.ExecutionPlan()
+        if 'nlp' in roles:
+            execution_plan.add(
+                'nlp',
+                models.get_nlp(),
+                'header' if targeted else 'text',
+                annotations['nlp']
+            )
+        if 'tokens' in roles:
+            # shares the Doc of the base pipeline when both run over the
+            # whole text
+            execution_plan.add(
+                'tokens',
+                models.get_nlp(),
+                'text',
+                annotations['tokens']
+            )
+        if 'custom_nlp' in roles:
+            # the custom model is trained on the raw text; when it falls
+            # back to the default pipeline it runs over the same text as
+            # the base pipeline
+            custom_view = 'text_raw'
+            if targeted:
+                custom_view = 'sections'
+            elif models.registry.custom_model_fallback:
+                custom_view = 'text'
+            execution_plan.add(
+                'custom_nlp',
+                models.get_custom_nlp(),
+                custom_view,
+                annotations['custom_nlp']
             )
+        return execution_plan
+
+    @classmethod
+    def __loaded(
+        cls,
+        resume,
+        skills_file,
+        custom_regex,
+        fields,
+        cache,
+        limits,
+        section_headers,
+        nlp_options,
+        document=None
+    ):
+        parser = cls.__new__(cls)
+        parser.__load(
+            resume,
+            skills_file,
+            custom_regex,
+            fields,
+            cache,
+            limits,
+            section_headers,
+            nlp_options,
+            document
+        )
+        return parser
+
+    def __load(
+        self,
+        resume,
+        skills_file,
+        custom_regex,
+        fields,
+        cache,
+        limits,
+        section_headers,
+        nlp_options,
+        document=None
+    ):
         self.__skills_file = skills_file
         self.__custom_regex = custom_regex
-        self.__matcher = Matcher(nlp.vocab)
+        self.__section_headers = section_headers
+        self.__sections = None
+        self.__nlp_options = nlp_options or plan.NLPOptions()
+        self.__fields = plan.select_fields(fields)
+        self.__resume = resume
+        self.__cache = cache
+        self.__cached = False
+        if cache is not None:
+            self.__cache_key = cache.key(
+                resume,
+                skills_file,
+                custom_regex,
+                self.__fields,
+                limits,
+                section_headers,
+                nlp_options
+            )
+            details = cache.get(self.__cache_key)
+            if details is not None:
+                self.__details = details
+                self.__cached = True
+                return
         self.__details = {
             'name': None,
             'email': None,
@@ -50,120 +346,201 @@ class ResumeParser(object):
             'no_of_pages': None,
             'total_experience': None,
         }
-        self.__resume = resume
-        if not isinstance(self.__resume, io.BytesIO):
-            ext = os.path.splitext(self.__resume)[1].split('.')[1]
+        if limits is not None:
+            # only reported when limits are set, so that the output of
+            # unlimited runs keeps its shape
+            self.__details['truncated'] = None
+        if document is None:
+            if not isinstance(self.__resume, io.BytesIO):
+                ext = os.path.splitext(self.__resume)[1].split('.')[1]
+            else:
+                ext = self.__resume.name.split('.')[1]
+            document = utils.extract_document(
+                self.__resume,
+                '.' + ext,
+                limits=limits
+            )
+        if limits is not None:
+            self.__details['truncated'] = document.truncated
+        self.__page_count = document.page_count
+        self.__text_raw = document.text
+        self.__text = document.normalized
+
+    def __views(self):
+        options = self.__nlp_options
+        if options.mode == 'targeted':
+            views = {
+                'header': plan.head(self.__text, options.name_window),
+                'text': self.__text,
+                'sections': self.__ner_text(),
+            }
         else:
-            ext = self.__resume.name.split('.')[1]
-        self.__text_raw = utils.extract_text(self.__resume, '.' + ext)
-        self.__text = ' '.join(self.__text_raw.split())
-        self.__nlp = nlp(self.__text)
-        custom_text = self.__text_raw
-        if self.__custom_model_fallback:
-            custom_text = self.__text
-        self.__custom_nlp = custom_nlp(custom_text)
-        self.__noun_chunks = list(self.__nlp.noun_chunks)
+            views = {'text': self.__text, 'text_raw': self.__text_raw}
+        if options.max_tokens is not None:
+            views = dict(
+                (view, plan.head(text, options.max_tokens))
+                for view, text in views.items()
+            )
+        return views
+
+    def __get_sections(self):
+        if self.__sections is None:
+            self.__sections = get_segmenter(self.__section_headers).segment(
+                self.__text_raw
+            )
+        return self.__sections
+
+    def __ner_text(self):
+        # header window, where the name is, followed by the sections
+        # holding degrees, designations and companies
+        window = self.__nlp_options.name_window
+        sections = [
+            section for section in self.__get_sections()
+            if section.name in plan.NER_SECTIONS
+        ]
+        if not sections or window is None:
+            return self.__text_raw
+        parts = [plan.head(self.__text_raw, window)]
+        parts.extend(
+            self.__text_raw[section.start:section.end]
+            for section in sections
+        )
+        return '\n'.join(parts)
+
+    def __parse(self, docs):
+        self.__nlp = docs.get('nlp')
+        self.__tokens = docs.get('tokens')
+        self.__custom_nlp = docs.get('custom_nlp')
         self.__get_basic_details()
+        if self.__cache is not None:
+            self.__cache.set(self.__cache_key, self.__details)
 
     def get_extracted_data(self):
         return self.__details
 
     def __get_basic_details(self):
-        cust_ent = utils.extract_entities_wih_custom_model(
-                            self.__custom_nlp
-                        )
-        name = utils.extract_name(self.__nlp, matcher=self.__matcher)
-        email = utils.extract_email(self.__text)
-        mobile = utils.extract_mobile_number(self.__text, self.__custom_regex)
-        skills = utils.extract_skills(
-                    self.__nlp,
-                    self.__noun_chunks,
-                    self.__skills_file
-                )
+        fields = self.__fields
+        cust_ent = {}
+        if self.__custom_nlp is not None:
+            cust_ent = utils.extract_entities_wih_custom_model(
+                                self.__custom_nlp
+                            )
+        entities = {}
+        if fields & plan.SECTION_FIELDS:
+            entities = dict(
+                (section.name, section_lines(self.__text_raw, section))
+                for section in self.__get_sections()
+            )
         # edu = utils.extract_education(
         #               [sent.string.strip() for sent in self.__nlp.sents]
         #       )
-        entities = utils.extract_entity_sections_grad(self.__text_raw)
 
         # extract name
-        try:
-            self.__details['name'] = cust_ent['Name'][0]
-        except (IndexError, KeyError):
-            self.__details['name'] = name
-
-        # extract email
-        self.__details['email'] = email
+        if 'name' in fields:
+            try:
+                self.__details['name'] = cust_ent['Name'][0]
+            except (IndexError, KeyError):
+                self.__details['name'] = utils.extract_name(
+                    self.__nlp,
+                    window=self.__nlp_options.name_window
+                )
 
-        # extract mobile number
-        self.__details['mobile_number'] = mobile
+        # extract email and mobile number in one pass over the text
+        if fields & {'email', 'mobile_number'}:
+            contacts = scan_contacts(
+                self.__text,
+                self.__custom_regex,
+                date_ranges=False
+            )
+            if 'email' in fields:
+                self.__details['email'] = contacts.email
+            if 'mobile_number' in fields:
+                self.__details['mobile_number'] = contacts.mobile_number
 
-        # extract skills
-        self.__details['skills'] = skills
+        # extract skills, multi-word skills are matched on the tokens so
+        # the parser and its noun chunks are not needed
+        if 'skills' in fields:
+            self.__details['skills'] = utils.extract_skills(
+                self.__tokens,
+                (),
+                self.__skills_file
+            )
 
         # extract college name
-        try:
-            self.__details['college_name'] = entities['College Name']
-        except KeyError:
-            pass
+        if 'college_name' in fields:
+            try:
+                self.__details['college_name'] = entities['College Name']
+            except KeyError:
+                pass
 
         # extract education Degree
-        try:
-            self.__details['degree'] = cust_ent['Degree']
-        except KeyError:
-            pass
+        if 'degree' in fields:
+            try:
+                self.__details['degree'] = cust_ent['Degree']
+            except KeyError:
+                pass
 
         # extract designation
-        try:
-            self.__details['designation'] = cust_ent['Designation']
-        except KeyError:
-            pass
+        if 'designation' in fields:
+            try:
+                self.__details['designation'] = cust_ent['Designation']
+            except KeyError:
+                pass
 
         # extract company names
-        try:
-            self.__details['company_names'] = cust_ent['Companies worked at']
-        except KeyError:
-            pass
+        if 'company_names' in fields:
+            try:
+                self.__details['company_names'] = \
+                    cust_ent['Companies worked at']
+            except KeyError:
+                pass
 
-        try:
-            self.__details['experience'] = entities['experience']
+        if fields & {'experience', 'total_experience'}:
             try:
-                exp = round(
-                    utils.get_total_experience(entities['experience']) / 12,
-                    2
-                )
-                self.__details['total_experience'] = exp
+                if 'experience' in fields:
+                    self.__details['experience'] = entities['experience']
+                if 'total_experience' in fields:
+                    try:
+                        exp = round(
+                            utils.get_total_experience(
+                                entities['experience']
+                            ) / 12,
+                            2
+                        )
+                        self.__details['total_experience'] = exp
+                    except KeyError:
+                        self.__details['total_experience'] = 0
             except KeyError:
-                self.__details['total_experience'] = 0
-        except KeyError:
-            self.__details['total_experience'] = 0
-        self.__details['no_of_pages'] = utils.get_number_of_pages(
-                                            self.__resume
-                                        )
+                if 'total_experience' in fields:
+                    self.__details['total_experience'] = 0
+        if 'no_of_pages' in fields:
+            self.__details['no_of_pages'] = self.__page_count
         return
 
 
 def resume_result_wrapper(resume):
+    '''
+    Helper function to parse a single resume with the default options,
+    e.g. as the target of a `multiprocessing.Pool`; prefer
+    `pyresparser.workers.ParserPool` for parsing many resumes
+
+    :param resume: path of the resume file or `io.BytesIO` object
+    :return: dictionary of extracted data
+    '''
     parser = ResumeParser(resume)
     return parser.get_extracted_data()
 
 
 if __name__ == '__main__':
-    pool = mp.Pool(mp.cpu_count())
+    from .workers import ParserPool
 
     resumes = []
-    data = []
     for root, directories, filenames in os.walk('resumes/'):
         for filename in filenames:
             file = os.path.join(root, filename)
             resumes.append(file)
 
-    results = [
-        pool.apply_async(
-            resume_result_wrapper,
-            args=(x,)
-        ) for x in resumes
-    ]
-
-    results = [p.get() for p in results]
+    with ParserPool() as pool:
+        results = [result.data for result in pool.imap(resumes)]
 
     pprint.pprint(results)
@@ -0,0 +1,159 @@
+import re
+import threading
+from collections import namedtuple
+from . import constants as cs
+
+# longest line, in words, that is still considered a section header
+MAX_HEADER_WORDS = 4
+
+_WORD_RE = re.compile(r'\w+')
+
+Section = namedtuple('Section', ['name', 'start', 'end'])
+
+
+class SectionSegmenter(object):
+    '''
+    Splits the raw text of a resume into sections
+
+    The header vocabulary is compiled once into a dictionary of word
+    sequences, so multi-word headers such as 'career objective' are
+    recognised. A line is a header when it has at most
+    `max_header_words` words and contains a header phrase; the longest
+    phrase of the line names the section.
+
+    :param headers: iterable of header phrases, or dictionary of header
+                    phrase to section name
+    :param max_header_words: longest line, in words, taken as a header
+    '''
+
+    def __init__(self, headers, max_header_words=MAX_HEADER_WORDS):
+        if not isinstance(headers, dict):
+            headers = dict((header, header) for header in headers)
+        self.__headers = {}
+        for header, name in headers.items():
+            words = tuple(_WORD_RE.findall(header.lower()))
+            if words:
+                self.__headers[words] = name
+        self.__longest = max([len(words) for words in self.__headers] or [0])
+        self.__max_header_words = max_header_words
+        # cheap upper bound used to skip long lines without splitting them
+        self.__max_header_chars = max_header_words * 25
+
+    @property
+    def names(self):
+        return frozenset(self.__headers.values())
+
+    def match_header(self, line):
+        '''
+        Find the section a line is the header of
+
+        :param line: single line of text
+        :return: section name, or None if the line is not a header
+        '''
+        if len(line) > self.__max_header_chars:
+            return None
+        words = _WORD_RE.findall(line.lower())
+        if not words or len(words) > self.__max_header_words:
+            return None
+        for size in range(min(self.__longest, len(words)), 0, -1):
+            for index in range(len(words) - size + 1):
+                name = self.__headers.get(tuple(words[index:index + size]))
+                if name is not None:
+                    return name
+        return None
+
+    def segment(self, text):
+        '''
+        Split a text into sections in a single pass
+
+        :param text: raw text of resume, with line breaks
+        :return: list of `Section` in document order, whose offsets
+                 delimit the section body without its header line
+        '''
+        sections = []
+        name = None
+        body_start = 0
+        position = 0
+        length = len(text)
+        while position <= length:
+            end = text.find('\n', position)
+            if end == -1:
+                end = length
+            header = self.match_header(text[position:end])
+            if header is not None:
+                if name is not None:
+                    sections.append(Section(name, body_start, position))
+                name = header
+                body_start = min(end + 1, length)
+            position = end + 1
+        if name is not None:
+            sections.append(Section(name, body_start, length))
+        return sections
+
+    def extract(self, text):
+        '''
+        Collect the lines of every section
+
+        :param text: raw text of resume, with line breaks
+        :return: dictionary of section name to list of non-empty lines;
+                 when a section occurs twice the last one is kept
+        '''
+        return dict(
+            (section.name, section_lines(text, section))
+            for section in self.segment(text)
+        )
+
+
+def section_lines(text, section):
+    '''
+    Helper function to get the non-empty, stripped lines of a section
+
+    :param text: text the section was found in
+    :param section: object of `Section`
+    :return: list of lines
+    '''
+    lines = text[section.start:section.end].split('\n')
+    return [line.strip() for line in lines if line.strip()]
+
+
+def headers_with_aliases(sections):
+    '''
+    Helper function to map every header of `sections` to its section
+    name following `constants.RESUME_SECTION_ALIASES`
+
+    :param sections: list of header phrases
+    :return: dictionary of header phrase to section name
+    '''
+    return dict(
+        (header, cs.RESUME_SECTION_ALIASES.get(header, header))
+        for header in sections
+    )
+
+
+_segmenters = {}
+_lock = threading.Lock()
+
+
+def get_segmenter(headers=None):
+    '''
+    Return a `SectionSegmenter`, compiled once per process
+
+    :param headers: iterable of header phrases, or dictionary of header
+                    phrase to section name; defaults to the headers of
+                    `constants.RESUME_SECTIONS_GRAD`
+    :return: object of `SectionSegmenter`
+    '''
+    if headers is None:
+        headers = headers_with_aliases(cs.RESUME_SECTIONS_GRAD)
+    if isinstance(headers, dict):
+        key = tuple(sorted(headers.items()))
+    else:
+        key = tuple(headers)
+    segmenter = _segmenters.get(key)
+    if segmenter is None:
+        with _lock:
+            segmenter = _segmenters.get(key)
+            if segmenter is None:
+                segmenter = SectionSegmenter(headers)
+                _segmenters[key] = segmenter
+    return segmenter
@@ -0,0 +1,208 @@
+import os
+import re
+import csv
+import threading
+from collections import deque
+
+DEFAULT_SKILLS_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    'skills.csv'
+)
+
+
+# words and single punctuation marks, e.g. 'object-oriented design'
+# becomes ['object', '-', 'oriented', 'design']
+_WORD_RE = re.compile(r'\w+|[^\w\s]')
+
+
+def normalize_skill(skill):
+    return ' '.join(skill.lower().split())
+
+
+class PhraseAutomaton(object):
+    '''
+    Aho-Corasick automaton over word sequences
+
+    All phrases are found in a single pass over the words of a
+    document, so the matching cost grows with the length of the document
+    and the number of matches but not with the number of phrases.
+    '''
+
+    def __init__(self, phrases):
+        self.__goto = [{}]
+        self.__fail = [0]
+        self.__output = {}
+        for phrase in phrases:
+            self.__add(phrase)
+        self.__link()
+
+    def __len__(self):
+        return len(self.__goto)
+
+    def __add(self, phrase):
+        words = _WORD_RE.findall(phrase)
+        if not words:
+            return
+        node = 0
+        for word in words:
+            child = self.__goto[node].get(word)
+            if child is None:
+                child = len(self.__goto)
+                self.__goto[node][word] = child
+                self.__goto.append({})
+                self.__fail.append(0)
+            node = child
+        self.__output[node] = ((phrase, len(words)),)
+
+    def __link(self):
+        # breadth first, so the failure target of a node is always
+        # complete before the node itself is linked
+        goto, fail, output = self.__goto, self.__fail, self.__output
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for word, child in goto[node].items():
+                queue.append(child)
+                target = fail[node]
+                while target and word not in goto[target]:
+                    target = fail[target]
+                target = goto[target].get(word, 0)
+                fail[child] = target
+                if target in output:
+                    output[child] = output.get(child, ()) + output[target]
+
+    def search(self, words, starts, ends):
+        '''
+        Find the phrases occurring in a sequence of words
+
+        :param words: list of words as produced by `_WORD_RE`
+        :param starts: list of booleans, True where a word starts a token
+        :param ends: list of booleans, True where a word ends a token
+        :return: set of phrases found on token boundaries
+        '''
+        goto, fail, output = self.__goto, self.__fail, self.__output
+        found = set()
+        node = 0
+        for index, word in enumerate(words):
+            while node and word not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(word, 0)
+            if node in output and ends[index]:
+                for phrase, length in output[node]:
+                    if starts[index - length + 1]:
+                        found.add(phrase)
+        return found
+
+
+class SkillsIndex(object):
+    '''
+    Compiled skills vocabulary
+
+    Skills are normalised (lower case, single spaces) into a hash set so
+    every lookup costs a constant amount of work regardless of the size
+    of the vocabulary. Skills of several words or punctuation marks, e.g.
+    'machine learning', 'scikit-learn' or 'c#', are additionally compiled
+    into a `PhraseAutomaton`, which finds them anywhere in the document
+    however the tokenizer splits them.
+    '''
+
+    def __init__(self, skills):
+        self.__skills = frozenset(
+            normalize_skill(skill) for skill in skills if skill.strip()
+        )
+        self.__phrases = frozenset(
+            skill for skill in self.__skills
+            if len(_WORD_RE.findall(skill)) > 1
+        )
+        self.__automaton = PhraseAutomaton(self.__phrases)
+
+    @classmethod
+    def from_csv(cls, skills_file):
+        '''
+        Build an index from a skills CSV file, whose header row holds
+        the skills
+
+        :param skills_file: path of the CSV file
+        :return: object of `SkillsIndex`
+        '''
+        with open(skills_file, 'r', encoding='utf-8', newline='') as fd:
+            header = next(csv.reader(fd), [])
+        return cls(header)
+
+    @property
+    def skills(self):
+        return self.__skills
+
+    @property
+    def phrases(self):
+        return self.__phrases
+
+    def __len__(self):
+        return len(self.__skills)
+
+    def __contains__(self, skill):
+        return normalize_skill(skill) in self.__skills
+
+    def extract(self, nlp_text, noun_chunks=()):
+        '''
+        Find the skills mentioned in a document
+
+        :param nlp_text: object of `spacy.tokens.doc.Doc`
+        :param noun_chunks: noun chunks extracted from nlp text, optional
+        :return: list of skills extracted
+        '''
+        skills = self.__skills
+        skillset = set()
+        words, starts, ends = [], [], []
+        for token in nlp_text:
+            if token.is_space:
+                continue
+            # check for one-grams
+            if not token.is_stop and token.lower_ in skills:
+                skillset.add(token.lower_)
+            pieces = _WORD_RE.findall(token.lower_)
+            last = len(pieces) - 1
+            for index, piece in enumerate(pieces):
+                words.append(piece)
+                starts.append(index == 0)
+                ends.append(index == last)
+
+        # check for skills of several words anywhere in the text
+        skillset.update(self.__automaton.search(words, starts, ends))
+
+        # noun chunks may still equal a single-word skill that is also a
+        # stop word
+        for chunk in noun_chunks:
+            chunk = normalize_skill(chunk.text)
+            if chunk in skills:
+                skillset.add(chunk)
+        return [skill.capitalize() for skill in skillset]
+
+
+_indexes = {}
+_lock = threading.Lock()
+
+
+def load_skills(skills_file=None):
+    '''
+    Return the compiled `SkillsIndex` of a skills file
+
+    Indexes are built once per process and rebuilt only when the file
+    is modified.
+
+    :param skills_file: path of the skills CSV file, defaults to the
+                        bundled skills.csv
+    :return: object of `SkillsIndex`
+    '''
+    path = os.path.abspath(skills_file or DEFAULT_SKILLS_FILE)
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _indexes.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    with _lock:
+        cached = _indexes.get(path)
+        if cached is None or cached[0] != key:
+            cached = (key, SkillsIndex.from_csv(path))
+            _indexes[path] = cached
+        return cached[1]
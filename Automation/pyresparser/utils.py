@@ -1,20 +1,19 @@
 # Author: Omkar Pathak
 
 import io
-import os
 import re
 import nltk
-import pandas as pd
-import docx2txt
 from datetime import datetime
 from dateutil import relativedelta
 from . import constants as cs
-from pdfminer.converter import TextConverter
-from pdfminer.pdfinterp import PDFPageInterpreter
-from pdfminer.pdfinterp import PDFResourceManager
-from pdfminer.layout import LAParams
-from pdfminer.pdfpage import PDFPage
-from pdfminer.pdfparser import PDFSyntaxError
+from . import pdf
+from . import doc
+from . import docx_reader
+from . import models
+from . import backends
+from .skills import load_skills
+from .contacts import scan_contacts
+from .sections import get_segmenter, headers_with_aliases
 from nltk.stem import WordNetLemmatizer
 from nltk.corpus import stopwords
 
@@ -26,111 +25,33 @@ def extract_text_from_pdf(pdf_path):
     :param pdf_path: path to PDF file to be extracted (remote or local)
     :return: iterator of string of extracted text
     '''
-    # https://www.blog.pythonlibrary.org/2018/05/03/exporting-data-from-pdfs-with-python/
-    if not isinstance(pdf_path, io.BytesIO):
-        # extract text from local pdf file
-        with open(pdf_path, 'rb') as fh:
-            try:
-                for page in PDFPage.get_pages(
-                        fh,
-                        caching=True,
-                        check_extractable=True
-                ):
-                    resource_manager = PDFResourceManager()
-                    fake_file_handle = io.StringIO()
-                    converter = TextConverter(
-                        resource_manager,
-                        fake_file_handle,
-                        codec='utf-8',
-                        laparams=LAParams()
-                    )
-                    page_interpreter = PDFPageInterpreter(
-                        resource_manager,
-                        converter
-                    )
-                    page_interpreter.process_page(page)
-
-                    text = fake_file_handle.getvalue()
-                    yield text
-
-                    # close open handles
-                    converter.close()
-                    fake_file_handle.close()
-            except PDFSyntaxError:
-                return
-    else:
-        # extract text from remote pdf file
-        try:
-            for page in PDFPage.get_pages(
-                    pdf_path,
-                    caching=True,
-                    check_extractable=True
-            ):
-                resource_manager = PDFResourceManager()
-                fake_file_handle = io.StringIO()
-                converter = TextConverter(
-                    resource_manager,
-                    fake_file_handle,
-                    codec='utf-8',
-                    laparams=LAParams()
-                )
-                page_interpreter = PDFPageInterpreter(
-                    resource_manager,
-                    converter
-                )
-                page_interpreter.process_page(page)
-
-                text = fake_file_handle.getvalue()
-                yield text
-
-                # close open handles
-                converter.close()
-                fake_file_handle.close()
-        except PDFSyntaxError:
-            return
+    for text, _ in pdf.iter_pages(pdf_path):
+        yield text
 
 
 def get_number_of_pages(file_name):
-    try:
-        if isinstance(file_name, io.BytesIO):
-            # for remote pdf file
-            count = 0
-            for page in PDFPage.get_pages(
-                        file_name,
-                        caching=True,
-                        check_extractable=True
-            ):
-                count += 1
-            return count
-        else:
-            # for local pdf file
-            if file_name.endswith('.pdf'):
-                count = 0
-                with open(file_name, 'rb') as fh:
-                    for page in PDFPage.get_pages(
-                            fh,
-                            caching=True,
-                            check_extractable=True
-                    ):
-                        count += 1
-                return count
-            else:
-                return None
-    except PDFSyntaxError:
+    '''
+    Helper function to get the number of pages of a .pdf file, counted
+    while `pyresparser.pdf.extract_pdf` extracts its text
+
+    :param file_name: path to PDF file or `io.BytesIO` object
+    :return: number of pages, None for other files and unreadable PDFs
+    '''
+    if not isinstance(file_name, io.BytesIO) and \
+            not file_name.endswith('.pdf'):
         return None
+    return pdf.extract_pdf(file_name).page_count
 
 
 def extract_text_from_docx(doc_path):
     '''
     Helper function to extract plain text from .docx files
 
-    :param doc_path: path to .docx file to be extracted
+    :param doc_path: path to .docx file to be extracted (remote or local)
     :return: string of extracted text
     '''
     try:
-        temp = docx2txt.process(doc_path)
-        text = [line.replace('\t', ' ') for line in temp.split('\n') if line]
-        return ' '.join(text)
+        return docx_reader.extract_docx(doc_path)
     except KeyError:
         return ' '
 
@@ -139,20 +60,45 @@ def extract_text_from_doc(doc_path):
     '''
     Helper function to extract plain text from .doc files
 
-    :param doc_path: path to .doc file to be extracted
+    :param doc_path: path to .doc file to be extracted (remote or local)
     :return: string of extracted text
     '''
+    # converted in a child process with a timeout, see `pyresparser.doc`
+    if not doc.available():
+        return ' '
     try:
-        try:
-            import textract
-        except ImportError:
-            return ' '
-        text = textract.process(doc_path).decode('utf-8')
-        return text
-    except KeyError:
+        return doc.convert(doc_path)
+    except doc.DocConversionError:
         return ' '
 
 
+backends.register(backends.FunctionBackend(
+    'docx',
+    backends.DOCX,
+    extract_text_from_docx,
+    speed=20
+))
+backends.register(backends.FunctionBackend(
+    'textract',
+    backends.DOC,
+    extract_text_from_doc,
+    capabilities=['lines']
+))
+
+
+def extract_document(file_path, extension, limits=None):
+    '''
+    Wrapper function to detect the file extension and call text
+    extraction function accordingly
+
+    :param file_path: path of file of which text is to be extracted
+    :param extension: extension of file `file_name`
+    :param limits: object of `pyresparser.extraction.ExtractionLimits`
+    :return: object of `pyresparser.extraction.ExtractedText`
+    '''
+    return backends.extract(file_path, extension, limits=limits)
+
+
 def extract_text(file_path, extension):
     '''
     Wrapper function to detect the file extension and call text
@@ -161,15 +107,7 @@ def extract_text(file_path, extension):
     :param file_path: path of file of which text is to be extracted
     :param extension: extension of file `file_name`
     '''
-    text = ''
-    if extension == '.pdf':
-        for page in extract_text_from_pdf(file_path):
-            text += ' ' + page
-    elif extension == '.docx':
-        text = extract_text_from_docx(file_path)
-    elif extension == '.doc':
-        text = extract_text_from_doc(file_path)
-    return text
+    return extract_document(file_path, extension).text
 
 
 def extract_entity_sections_grad(text):
@@ -180,43 +118,7 @@ def extract_entity_sections_grad(text):
     :param text: Raw text of resume
     :return: dictionary of entities
     '''
-    text_split = [i.strip() for i in text.split('\n')]
-    # sections_in_resume = [i for i in text_split if i.lower() in sections]
-    entities = {}
-    key = False
-    for phrase in text_split:
-        if len(phrase) == 1:
-            p_key = phrase
-        else:
-            p_key = set(phrase.lower().split()) & set(cs.RESUME_SECTIONS_GRAD)
-        try:
-            p_key = list(p_key)[0]
-        except IndexError:
-            pass
-        if p_key in cs.RESUME_SECTIONS_GRAD:
-            entities[p_key] = []
-            key = p_key
-        elif key and phrase.strip():
-            entities[key].append(phrase)
-
-    # entity_key = False
-    # for entity in entities.keys():
-    #     sub_entities = {}
-    #     for entry in entities[entity]:
-    #         if u'\u2022' not in entry:
-    #             sub_entities[entry] = []
-    #             entity_key = entry
-    #         elif entity_key:
-    #             sub_entities[entity_key].append(entry)
-    #     entities[entity] = sub_entities
-
-    # pprint.pprint(entities)
-
-    # make entities that are not found None
-    # for entity in cs.RESUME_SECTIONS:
-    #     if entity not in entities.keys():
-    #         entities[entity] = None
-    return entities
+    return get_segmenter().extract(text)
 
 
 def extract_entities_wih_custom_model(custom_nlp_text):
@@ -242,23 +144,39 @@ def get_total_experience(experience_list):
     '''
     Wrapper function to extract total months of experience from a resume
 
+    The date ranges come from one scan of the experience section with
+    `pyresparser.contacts.scan_contacts`, the first range of a line is
+    counted.
+
     :param experience_list: list of experience text extracted
     :return: total months of experience
     '''
-    exp_ = []
-    for line in experience_list:
-        experience = re.search(
-            r'(?P<fmonth>\w+.\d+)\s*(\D|to)\s*(?P<smonth>\w+.\d+|present)',
-            line,
-            re.I
+    text = '\n'.join(experience_list)
+    counted = set()
+    line = 0
+    position = 0
+    total_exp = 0
+    for match in scan_contacts(text).date_ranges:
+        line += text.count('\n', position, match.start)
+        position = match.start
+        if line in counted:
+            continue
+        counted.add(line)
+        start, end = match.value
+        total_exp += get_number_of_months_from_dates(
+            _month_and_year(start),
+            _month_and_year(end)
         )
-        if experience:
-            exp_.append(experience.groups())
-    total_exp = sum(
-        [get_number_of_months_from_dates(i[0], i[2]) for i in exp_]
-    )
-    total_experience_in_months = total_exp
-    return total_experience_in_months
+    return total_exp
+
+
+def _month_and_year(date):
+    # 'Sept. 2015', 'March,2015' and 'Jan 2015' become '%b %Y' dates,
+    # 'current' and 'now' mean the same as 'present'
+    found = re.match(r'([a-z]+)\W*(\d{4})', date, re.I)
+    if found is None:
+        return 'present'
+    return found.group(1)[:3] + ' ' + found.group(2)
 
 
 def get_number_of_months_from_dates(date1, date2):
@@ -299,25 +217,9 @@ def extract_entity_sections_professional(text):
     :param text: Raw text of resume
     :return: dictionary of entities
     '''
-    text_split = [i.strip() for i in text.split('\n')]
-    entities = {}
-    key = False
-    for phrase in text_split:
-        if len(phrase) == 1:
-            p_key = phrase
-        else:
-            p_key = set(phrase.lower().split()) \
-                    & set(cs.RESUME_SECTIONS_PROFESSIONAL)
-        try:
-            p_key = list(p_key)[0]
-        except IndexError:
-            pass
-        if p_key in cs.RESUME_SECTIONS_PROFESSIONAL:
-            entities[p_key] = []
-            key = p_key
-        elif key and phrase.strip():
-            entities[key].append(phrase)
-    return entities
+    return get_segmenter(
+        headers_with_aliases(cs.RESUME_SECTIONS_PROFESSIONAL)
+    ).extract(text)
 
 
 def extract_email(text):
@@ -326,36 +228,30 @@ def extract_email(text):
 
     :param text: plain text extracted from resume file
     '''
-    email = re.findall(r"([^@|\s]+@[^@]+\.[^@|\s]+)", text)
-    if email:
-        try:
-            return email[0].split()[0].strip(';')
-        except IndexError:
-            return None
+    return scan_contacts(text, date_ranges=False).email
 
 
-def extract_name(nlp_text, matcher):
+def extract_name(nlp_text, matcher=None, window=None):
     '''
     Helper function to extract name from spacy nlp text
 
     :param nlp_text: object of `spacy.tokens.doc.Doc`
-    :param matcher: object of `spacy.matcher.Matcher`
+    :param matcher: object of `spacy.matcher.Matcher`, defaults to the
+                    shared matcher of the pipeline
+    :param window: number of tokens at the start of the document the
+                   name is searched in, the whole document when None
     :return: string of full name
     '''
-    pattern = [cs.NAME_PATTERN]
-    # Remove existing NAME patterns to avoid duplicates when the matcher is reused
-    try:
-        matcher.remove('NAME')
-    except (KeyError, ValueError):
-        # Pattern doesn't exist yet, which is fine
-        pass
-    matcher.add('NAME', pattern)
+    if matcher is None:
+        matcher = models.get_name_matcher(nlp_text.vocab)
+    elif 'NAME' not in matcher:
+        matcher.add('NAME', [cs.NAME_PATTERN])
 
-    matches = matcher(nlp_text)
+    if window is not None:
+        nlp_text = nlp_text[:window]
 
-    for _, start, end in matches:
-        span = nlp_text[start:end]
-        if 'name' not in span.text.lower():
+    for span in matcher(nlp_text, as_spans=True):
+        if span.label_ == 'NAME' and 'name' not in span.text.lower():
             return span.text
 
 
@@ -366,25 +262,11 @@ def extract_mobile_number(text, custom_regex=None):
     :param text: plain text extracted from resume file
     :return: string of extracted mobile numbers
     '''
-    # Found this complicated regex on :
-    # https://zapier.com/blog/extract-links-email-phone-regex/
-    # mob_num_regex = r'''(?:(?:\+?([1-9]|[0-9][0-9]|
-    #     [0-9][0-9][0-9])\s*(?:[.-]\s*)?)?(?:\(\s*([2-9]1[02-9]|
-    #     [2-9][02-8]1|[2-9][02-8][02-9])\s*\)|([0-9][1-9]|
-    #     [0-9]1[02-9]|[2-9][02-8]1|
-    #     [2-9][02-8][02-9]))\s*(?:[.-]\s*)?)?([2-9]1[02-9]|
-    #     [2-9][02-9]1|[2-9][02-9]{2})\s*(?:[.-]\s*)?([0-9]{7})
-    #     (?:\s*(?:#|x\.?|ext\.?|
-    #     extension)\s*(\d+))?'''
-    if not custom_regex:
-        mob_num_regex = r'''(\d{3}[-\.\s]??\d{3}[-\.\s]??\d{4}|\(\d{3}\)
-                        [-\.\s]*\d{3}[-\.\s]??\d{4}|\d{3}[-\.\s]??\d{4})'''
-        phone = re.findall(re.compile(mob_num_regex), text)
-    else:
-        phone = re.findall(re.compile(custom_regex), text)
-    if phone:
-        number = ''.join(phone[0])
-        return number
+    return scan_contacts(
+        text,
+        custom_regex,
+        date_ranges=False
+    ).mobile_number
 
 
 def extract_skills(nlp_text, noun_chunks, skills_file=None):
@@ -393,28 +275,10 @@ def extract_skills(nlp_text, noun_chunks, skills_file=None):
 
     :param nlp_text: object of `spacy.tokens.doc.Doc`
     :param noun_chunks: noun chunks extracted from nlp text
+    :param skills_file: custom skills CSV file
     :return: list of skills extracted
     '''
-    tokens = [token.text for token in nlp_text if not token.is_stop]
-    if not skills_file:
-        data = pd.read_csv(
-            os.path.join(os.path.dirname(__file__), 'skills.csv')
-        )
-    else:
-        data = pd.read_csv(skills_file)
-    skills = list(data.columns.values)
-    skillset = []
-    # check for one-grams
-    for token in tokens:
-        if token.lower() in skills:
-            skillset.append(token)
-
-    # check for bi-grams and tri-grams
-    for token in noun_chunks:
-        token = token.text.lower().strip()
-        if token in skills:
-            skillset.append(token)
-    return [i.capitalize() for i in set([i.lower() for i in skillset])]
+    return load_skills(skills_file).extract(nlp_text, noun_chunks)
 
 
 def cleanup(token, lower=True):
@@ -0,0 +1,393 @@
+import io
+import os
+import sys
+import math
+import time
+import queue
+import itertools
+import multiprocessing as mp
+from collections import deque, namedtuple
+from . import doc
+from .cache import format_stats, get_cache
+from .skills import load_skills
+from .resume_parser import ResumeParser
+
+# upper bound of the resumes sent to a worker at once; resumes differ a
+# lot in parsing time, small chunks keep the workers evenly loaded
+MAX_CHUNKSIZE = 16
+
+# chunk size when the number of resumes is not known up front
+STREAM_CHUNKSIZE = 4
+
+# chunks submitted per worker ahead of the results being consumed
+PENDING_CHUNKS = 2
+
+ParseResult = namedtuple(
+    'ParseResult',
+    ['resume', 'data', 'error', 'worker', 'seconds']
+)
+
+
+def get_chunksize(count, processes):
+    '''
+    Helper function to pick the number of resumes handed to a worker at
+    once: about four chunks per worker, at most `MAX_CHUNKSIZE`
+
+    :param count: number of resumes
+    :param processes: number of worker processes
+    :return: chunk size
+    '''
+    chunks = processes * 4
+    return max(1, min(MAX_CHUNKSIZE, int(math.ceil(count / float(chunks)))))
+
+
+def iter_resumes(directory):
+    '''
+    Helper function to list the files below a directory lazily
+
+    :param directory: path of the directory
+    :return: iterator of file paths
+    '''
+    for root, _, filenames in os.walk(directory):
+        for filename in filenames:
+            yield os.path.join(root, filename)
+
+
+def resume_name(resume):
+    if isinstance(resume, io.BytesIO):
+        # downloaded resumes are reported by their URL
+        return getattr(resume, 'url', None) or getattr(resume, 'name', None)
+    return resume
+
+
+def _warm_up(options):
+    ResumeParser.warm_up(options['fields'], options['nlp_options'])
+    load_skills(options['skills_file'])
+
+
+# options of the pool, set once per worker by `_init_worker`
+_options = {}
+
+
+def _init_worker(options):
+    _options.clear()
+    _options.update(options)
+    doc.configure(timeout=options['doc_timeout'])
+    # a no-op when the models were preloaded before the fork
+    _warm_up(options)
+
+
+def _iter_chunks(resumes, chunksize):
+    resumes = iter(resumes)
+    while True:
+        chunk = list(itertools.islice(resumes, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _collect(done):
+    results = done.get()
+    if isinstance(results, BaseException):
+        raise results
+    return results
+
+
+def _parse_chunk(resumes):
+    # the cache of a worker lives in the worker, its statistics are sent
+    # back with every chunk
+    cache_dir = _options['cache_dir']
+    if not cache_dir:
+        return [_parse(resume) for resume in resumes], None
+    cache = get_cache(cache_dir)
+    before = cache.stats
+    results = [_parse(resume) for resume in resumes]
+    after = cache.stats
+    return results, dict(
+        (name, count - before[name]) for name, count in after.items()
+    )
+
+
+def _parse(resume):
+    started = time.perf_counter()
+    try:
+        cache_dir = _options['cache_dir']
+        data = ResumeParser(
+            resume,
+            _options['skills_file'],
+            _options['custom_regex'],
+            fields=_options['fields'],
+            cache=get_cache(cache_dir) if cache_dir else None,
+            limits=_options['limits'],
+            section_headers=_options['section_headers'],
+            nlp_options=_options['nlp_options']
+        ).get_extracted_data()
+        error = None
+    except Exception as exception:
+        data = None
+        error = repr(exception)
+    return ParseResult(
+        resume_name(resume),
+        data,
+        error,
+        os.getpid(),
+        time.perf_counter() - started
+    )
+
+
+class ParserPool(object):
+    '''
+    Pool of worker processes that parse resumes with warm models
+
+    The models, skills index and matchers are loaded in the parent before
+    the workers are forked, so every worker shares their memory pages
+    copy-on-write; the initializer loads them again only where the
+    workers are spawned instead. Options common to every resume are sent
+    to each worker once, tasks only carry the resume. A resume that fails
+    to parse is reported in its `ParseResult` instead of stopping the
+    run.
+
+    :param processes: number of worker processes, defaults to the number
+                      of CPUs
+    :param chunksize: resumes per task, see `get_chunksize` for the
+                      default
+    :param doc_timeout: seconds allowed to convert a .doc file
+    '''
+
+    def __init__(
+        self,
+        processes=None,
+        skills_file=None,
+        custom_regex=None,
+        fields=None,
+        cache_dir=None,
+        limits=None,
+        section_headers=None,
+        nlp_options=None,
+        doc_timeout=doc.DEFAULT_TIMEOUT,
+        chunksize=None
+    ):
+        self.__processes = processes or mp.cpu_count()
+        self.__chunksize = chunksize
+        self.__options = {
+            'skills_file': skills_file,
+            'custom_regex': custom_regex,
+            'fields': fields,
+            'cache_dir': cache_dir,
+            'limits': limits,
+            'section_headers': section_headers,
+            'nlp_options': nlp_options,
+            'doc_timeout': doc_timeout,
+        }
+        self.__pool = None
+        self.__started = None
+        self.__workers = {}
+        self.__cache_stats = None
+
+    @property
+    def processes(self):
+        return self.__processes
+
+    def start(self):
+        '''
+        Load the models and start the workers
+        '''
+        if self.__pool is not None:
+            return
+        _warm_up(self.__options)
+        self.__pool = mp.Pool(
+            self.__processes,
+            initializer=_init_worker,
+            initargs=(self.__options,)
+        )
+        self.__started = time.perf_counter()
+
+    def imap(self, resumes, ordered=True):
+        '''
+        Parse resumes in the workers
+
+        Resumes are read from `resumes` lazily and only a few chunks per
+        worker are in flight at any time, so memory stays bounded however
+        many resumes a generator yields.
+
+        :param resumes: iterable of resume file paths or `io.BytesIO`
+                        objects
+        :param ordered: whether results are yielded in input order or as
+                        soon as they are ready
+        :return: iterator of `ParseResult`
+        '''
+        if isinstance(resumes, (list, tuple)):
+            chunksize = self.__chunksize or get_chunksize(
+                len(resumes),
+                self.__processes
+            )
+        else:
+            chunksize = self.__chunksize or STREAM_CHUNKSIZE
+        self.start()
+        chunks = _iter_chunks(resumes, chunksize)
+        window = self.__processes * PENDING_CHUNKS
+        if ordered:
+            results = self.__ordered(chunks, window)
+        else:
+            results = self.__unordered(chunks, window)
+        for chunk, cache_stats in results:
+            if cache_stats is not None:
+                if self.__cache_stats is None:
+                    self.__cache_stats = dict.fromkeys(cache_stats, 0)
+                for name, count in cache_stats.items():
+                    self.__cache_stats[name] += count
+            for result in chunk:
+                worker = self.__workers.setdefault(result.worker, [0, 0.0])
+                worker[0] += 1
+                worker[1] += result.seconds
+                yield result
+
+    def __ordered(self, chunks, window):
+        pending = deque()
+        for chunk in chunks:
+            pending.append(self.__pool.apply_async(_parse_chunk, (chunk,)))
+            if len(pending) >= window:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+
+    def __unordered(self, chunks, window):
+        done = queue.Queue()
+        pending = 0
+        for chunk in chunks:
+            self.__pool.apply_async(
+                _parse_chunk,
+                (chunk,),
+                callback=done.put,
+                error_callback=done.put
+            )
+            pending += 1
+            if pending >= window:
+                yield _collect(done)
+                pending -= 1
+        while pending:
+            yield _collect(done)
+            pending -= 1
+
+    def map(self, resumes):
+        return list(self.imap(resumes))
+
+    @property
+    def stats(self):
+        '''
+        :return: dictionary of worker process id to the number of resumes
+                 it parsed and the seconds it spent on them
+        '''
+        return dict(
+            (worker, {'resumes': count, 'seconds': seconds})
+            for worker, (count, seconds) in self.__workers.items()
+        )
+
+    @property
+    def cache_stats(self):
+        '''
+        :return: dictionary of the cache hits, misses, writes and
+                 evictions summed over the workers, None when the pool
+                 has no cache
+        '''
+        if self.__cache_stats is None:
+            return None
+        return dict(self.__cache_stats)
+
+    def report(self):
+        '''
+        :return: multi-line string with the throughput of every worker
+                 and of the whole pool, and the cache statistics
+        '''
+        lines = []
+        for worker, (count, seconds) in sorted(self.__workers.items()):
+            lines.append('worker {}: {} resumes, {:.2f} resumes/s'.format(
+                worker,
+                count,
+                count / seconds if seconds else 0.0
+            ))
+        total = sum(count for count, _ in self.__workers.values())
+        elapsed = time.perf_counter() - self.__started \
+            if self.__started is not None else 0.0
+        lines.append('{} workers: {} resumes in {:.1f} s, {:.2f} '
+                     'resumes/s'.format(
+                         self.__processes,
+                         total,
+                         elapsed,
+                         total / elapsed if elapsed else 0.0
+                     ))
+        if self.__cache_stats is not None:
+            lines.append(format_stats(self.__cache_stats))
+        return '\n'.join(lines)
+
+    def close(self):
+        if self.__pool is not None:
+            self.__pool.close()
+            self.__pool.join()
+            self.__pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        if exc_info[0] is not None and self.__pool is not None:
+            self.__pool.terminate()
+        self.close()
+
+
+class Progress(object):
+    '''
+    Live progress and throughput line
+
+    On a terminal the line is rewritten in place a few times per second;
+    elsewhere, e.g. in a log file, a new line is printed every
+    `interval` seconds.
+
+    :param stream: text stream the line is written to, defaults to stderr
+    :param interval: seconds between two updates
+    '''
+
+    def __init__(self, stream=None, interval=None):
+        self.__stream = stream or sys.stderr
+        self.__tty = getattr(self.__stream, 'isatty', lambda: False)()
+        if interval is None:
+            interval = 0.5 if self.__tty else 10
+        self.__interval = interval
+        self.__started = time.perf_counter()
+        self.__shown = self.__started
+        self.done = 0
+        self.failed = 0
+
+    def update(self, result):
+        '''
+        :param result: object of `ParseResult`
+        '''
+        self.done += 1
+        if result.error is not None:
+            self.failed += 1
+        now = time.perf_counter()
+        if now - self.__shown >= self.__interval:
+            self.__shown = now
+            self.__show()
+
+    def close(self):
+        self.__show()
+        if self.__tty:
+            self.__stream.write('\n')
+        self.__stream.flush()
+
+    def line(self):
+        elapsed = time.perf_counter() - self.__started
+        return '{} resumes, {} failed, {:.2f} resumes/s, {:.0f} s'.format(
+            self.done,
+            self.failed,
+            self.done / elapsed if elapsed else 0.0,
+            elapsed
+        )
+
+    def __show(self):
+        if self.__tty:
+            self.__stream.write('\r' + self.line())
+        else:
+            self.__stream.write(self.line() + '\n')
+        self.__stream.flush()
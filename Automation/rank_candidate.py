@@ -1,8 +1,8 @@
 from multiprocessing import cpu_count, Pool
 from typing import Set
-from pyresparser.utils import extract_skills
+from pyresparser import models, plan
+from pyresparser.skills import load_skills, normalize_skill
 import pandas as pd
-import spacy
 
 
 def get_candidate_score(
@@ -38,7 +38,8 @@ def get_candidate_score_wrapper(args: tuple) -> float:
 
 def sort_candidates(
         job_desc_text: str,
-        candidates_df: pd.DataFrame
+        candidates_df: pd.DataFrame,
+        skills_file: str = None
 ) -> pd.DataFrame:
     """
     This function compares the skills of a number of candidates
@@ -46,16 +47,20 @@ def sort_candidates(
     
     :param job_desc_text: Job description text
     :param candidates_df: DataFrame containing candidate details and skills
+    :param skills_file: Custom skills CSV file
     :return: DataFrame with candidates sorted as per their match
      with the given job description
     """
 
     # Get the list of required skills from the Job description
     # and convert them to a set
-    nlp = spacy.load("en_core_web_sm")
+    skills_index = load_skills(skills_file)
+    # skills are matched on the tokens, the tokenizer is all it takes
+    nlp = plan.Tokenizer(models.get_nlp())
     doc = nlp(job_desc_text)
     job_skills = set([
-        skill.lower() for skill in extract_skills(doc, doc.noun_chunks)
+        skill.lower()
+        for skill in skills_index.extract(doc)
     ])
     job_skill_count = len(job_skills)
 
@@ -64,7 +69,7 @@ def sort_candidates(
     candidates_skills = candidates_df["Skills"].values.tolist()
     candidates_skills = [
         set([
-            skill.strip().lower() for skill in skill_list.split(",")
+            normalize_skill(skill) for skill in skill_list.split(",")
         ])
         for skill_list in candidates_skills
     ]
@@ -0,0 +1,54 @@
+import io
+import pytest
+from pyresparser import backends
+from pyresparser.extraction import ExtractedText, ExtractionLimits
+
+
+def get_buffer(data, extension):
+    buffer = io.BytesIO(data)
+    buffer.name = 'resume' + extension
+    return buffer
+
+
+def test_plain_text():
+    resume = get_buffer(b'Omkar Pathak\nPython', '.txt')
+    document = backends.extract(resume, '.txt')
+    assert 'Omkar Pathak\nPython' == document.pages[0]
+    document = backends.extract(
+        resume,
+        '.txt',
+        limits=ExtractionLimits(max_chars=5)
+    )
+    assert 'Omkar' == document.text.strip()
+    assert 'max_chars' == document.truncated
+    assert [] == backends.extract(resume, '.xyz').pages
+
+
+def test_fallback_and_preference():
+    def broken(resume):
+        raise ValueError('broken')
+
+    registry = backends.BackendRegistry()
+    registry.register(backends.FunctionBackend(
+        'slow', backends.TEXT, lambda resume: 'slow', speed=50
+    ))
+    registry.register(backends.FunctionBackend(
+        'broken', backends.TEXT, broken, speed=10
+    ))
+    registry.register(backends.FunctionBackend(
+        'missing', backends.TEXT, broken, speed=0, requires=['no_such_mod']
+    ))
+    resume = get_buffer(b'', '.txt')
+    assert ['broken', 'slow'] == [
+        backend.name for backend in registry.backends('.txt')
+    ]
+    with pytest.warns(UserWarning):
+        assert 'slow' == registry.extract(resume, '.txt').text.strip()
+    registry.prefer('.txt', 'slow')
+    assert 'slow' == registry.backends(backends.TEXT)[0].name
+    assert [] == registry.extract(resume, '.txt', require=['pages']).pages
+    assert isinstance(registry.extract(resume, '.pdf'), ExtractedText)
+    with pytest.raises(ValueError):
+        registry.register(backends.FunctionBackend(
+            'ocr', backends.PDF, broken, capabilities=['ocr']
+        ))
@@ -0,0 +1,85 @@
+import io
+import os
+import json
+from pyresparser.cache import ResultCache
+
+
+def get_resume(tmp_path, content=b'%PDF-1.4 resume'):
+    path = tmp_path / 'resume.pdf'
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_path_and_buffer_share_key(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache'))
+    resume = get_resume(tmp_path)
+    buffer = io.BytesIO(open(resume, 'rb').read())
+    buffer.name = 'resume.pdf'
+    assert cache.key(resume) == cache.key(buffer)
+
+
+def test_key_depends_on_options(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache'))
+    resume = get_resume(tmp_path)
+    assert cache.key(resume) != cache.key(resume, custom_regex=r'\d+')
+    assert cache.key(resume) != cache.key(resume, fields=['email'])
+
+
+def test_hit_and_miss_stats(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache'))
+    key = cache.key(get_resume(tmp_path))
+    assert cache.get(key) is None
+    cache.set(key, {'name': 'Omkar Pathak'})
+    assert {'name': 'Omkar Pathak'} == cache.get(key)
+    assert 1 == cache.stats['hits']
+    assert 1 == cache.stats['misses']
+
+
+def test_eviction(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache'), max_bytes=1000)
+    keys = []
+    for i in range(20):
+        key = cache.key(get_resume(tmp_path, str(i).encode()))
+        cache.set(key, {'skills': ['Python'] * 10})
+        keys.append(key)
+    assert cache.stats['evictions'] > 0
+    assert cache.get(keys[-1]) is not None
+    assert cache.get(keys[0]) is None
+
+
+def test_key_depends_on_skills_and_model_version(tmp_path, tiny_model):
+    from pyresparser import skills
+    cache = ResultCache(str(tmp_path / 'cache'))
+    resume = get_resume(tmp_path)
+    bundled = cache.key(resume)
+    assert bundled == cache.key(resume, skills.DEFAULT_SKILLS_FILE)
+    skills_file = tmp_path / 'skills.csv'
+    skills_file.write_text(open(skills.DEFAULT_SKILLS_FILE).read())
+    assert bundled == cache.key(resume, str(skills_file))
+    skills_file.write_text('python,java')
+    assert bundled != cache.key(resume, str(skills_file))
+
+    meta_path = os.path.join(tiny_model, 'meta.json')
+    meta = json.load(open(meta_path))
+    meta['version'] = '9.9.9'
+    with open(meta_path, 'w') as fh:
+        json.dump(meta, fh)
+    os.utime(meta_path, ns=(0, os.stat(meta_path).st_mtime_ns + 10 ** 9))
+    assert bundled != cache.key(resume)
+
+
+def test_overwrite_keeps_usage(tmp_path):
+    cache = ResultCache(str(tmp_path), max_bytes=10 ** 6)
+    data = {'skills': ['python'] * 1000}
+    cache.set('a' * 64, data)
+    size = sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, names in os.walk(str(tmp_path)) for name in names
+    )
+    cache = ResultCache(str(tmp_path), max_bytes=10 ** 6)
+    cache.set('a' * 64, data)
+    cache.set('a' * 64, data)
+    assert size == cache.size
+    cache.set('b' * 64, data)
+    assert 2 * size == cache.size
+    assert data == cache.get('a' * 64)
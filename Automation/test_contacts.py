@@ -0,0 +1,48 @@
+from pyresparser.contacts import get_scanner, scan_contacts
+from pyresparser.utils import get_total_experience
+
+
+def test_scan():
+    text = (
+        'John Smith john.smith@example.com; 555-123-4567 '
+        'Acme Jan 2015 - Mar 2018 Initech April 2018 to present'
+    )
+    result = scan_contacts(text)
+    assert 'john.smith@example.com' == result.email
+    assert '555-123-4567' == result.mobile_number
+    assert [
+        ('Jan 2015', 'Mar 2018'),
+        ('April 2018', 'present')
+    ] == [match.value for match in result.date_ranges]
+    match = result.emails[0]
+    assert text[match.start:match.end].startswith('john.smith@')
+
+
+def test_phone_inside_email_is_ignored():
+    result = scan_contacts(
+        'jsmith5551234567@example.com 555 987 6543 Jan 2015 - Mar 2018',
+        date_ranges=False
+    )
+    assert '555 987 6543' == result.mobile_number
+    assert [] == result.date_ranges
+
+
+def test_custom_regex():
+    result = scan_contacts('call +44 20 7946 0958', r'\+(\d+) (\d+)')
+    assert '4420' == result.mobile_number
+    assert get_scanner(r'\+(\d+) (\d+)') is get_scanner(r'\+(\d+) (\d+)')
+
+
+def test_nothing_found():
+    result = scan_contacts('no contact details')
+    assert result.email is None
+    assert result.mobile_number is None
+
+
+def test_total_experience_from_date_ranges():
+    assert 55 == get_total_experience([
+        'Engineer at Acme Jan 2015 to Mar 2018',
+        'Lead, Initech Sept. 2018 - Dec 2019 and Jan 2020 - Feb 2020',
+        'Python 3 developer, April 2020 – June 2020'
+    ])
+    assert 0 == get_total_experience(['Acme 2015 - 2018'])
@@ -0,0 +1,32 @@
+import io
+import pytest
+from pyresparser import doc
+
+CONVERTER = '''#!/bin/sh
+if [ "$(cat "$1")" = hang ]; then
+    sleep 30
+fi
+if [ "$(cat "$1")" = broken ]; then
+    echo "not a Word document" >&2
+    exit 1
+fi
+tr a-z A-Z < "$1"
+'''
+
+
+def test_convert_with_timeout(tmp_path, monkeypatch):
+    converter = tmp_path / 'antiword'
+    converter.write_text(CONVERTER)
+    converter.chmod(0o755)
+    monkeypatch.setattr(doc, 'ANTIWORD', str(converter))
+    assert doc.available()
+    assert 'OMKAR' == doc.convert(io.BytesIO(b'omkar'))
+    resume = tmp_path / 'resume.doc'
+    resume.write_bytes(b'python')
+    assert 'PYTHON' == doc.convert(str(resume))
+    with pytest.raises(doc.DocConversionTimeout):
+        doc.convert(io.BytesIO(b'hang'), timeout=1)
+    with pytest.raises(doc.DocConversionError, match='not a Word'):
+        doc.convert(io.BytesIO(b'broken'))
+    monkeypatch.setattr(doc, 'ANTIWORD', str(tmp_path / 'missing'))
+    assert not doc.available()
@@ -0,0 +1,33 @@
+import io
+import zipfile
+from pyresparser import docx_reader
+
+W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+
+def test_lines_and_text(make_docx):
+    data = make_docx(['Omkar Pathak', 'Python\tSQL'], images=1, image_size=10)
+    lines = list(docx_reader.iter_lines(io.BytesIO(data)))
+    assert ['Omkar Pathak', 'Python\tSQL'] == lines
+    text = docx_reader.extract_docx(io.BytesIO(data))
+    assert 'Omkar Pathak Python SQL' == text
+
+
+def test_headers_breaks_and_images(tmp_path):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr(
+            'word/document.xml',
+            '<w:document {}><w:body><w:p><w:r><w:t>a</w:t><w:br/>'
+            '<w:t>b</w:t></w:r></w:p></w:body></w:document>'.format(W)
+        )
+        archive.writestr(
+            'word/header1.xml',
+            '<w:hdr {}><w:p><w:r><w:t>top</w:t></w:r></w:p></w:hdr>'.format(W)
+        )
+        archive.writestr('word/media/image1.png', b'png')
+    assert ['top', 'a', 'b'] == list(docx_reader.iter_lines(buffer))
+    assert ['a', 'b'] == list(docx_reader.iter_lines(buffer, headers=False))
+    text = docx_reader.extract_docx(buffer, images_dir=str(tmp_path))
+    assert 'top a b' == text
+    assert b'png' == (tmp_path / 'image1.png').read_bytes()
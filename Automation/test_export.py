@@ -0,0 +1,66 @@
+import io
+import json
+import pandas as pd
+import pytest
+from pyresparser import export, workers
+
+
+def test_jsonl_writer():
+    fh = io.StringIO()
+    writer = export.get_writer('jsonl', fh)
+    writer.write('a.pdf', {'name': 'Omkar Pathak'})
+    writer.write('b.pdf', None, 'ValueError()')
+    records = [json.loads(line) for line in fh.getvalue().splitlines()]
+    assert 'Omkar Pathak' == records[0]['name']
+    assert 'a.pdf' == records[0]['file']
+    assert 'ValueError()' == records[1]['error']
+
+
+def test_csv_writer_appends():
+    fh = io.StringIO()
+    export.get_writer('csv', fh).write('a.pdf', {'skills': ['Python', 'SQL']})
+    export.get_writer('csv', fh).write('b.pdf', {'name': 'Omkar'})
+    lines = fh.getvalue().splitlines()
+    assert 3 == len(lines)
+    assert lines[0].startswith('file,error,name')
+    assert '"Python, SQL"' in lines[1]
+
+
+def test_progress():
+    fh = io.StringIO()
+    progress = workers.Progress(fh, interval=0)
+    progress.update(workers.ParseResult('a.pdf', {}, None, 1, 0.1))
+    progress.update(workers.ParseResult('b.pdf', None, 'error', 1, 0.1))
+    progress.close()
+    assert fh.getvalue().splitlines()[-1].startswith('2 resumes, 1 failed')
+
+
+def test_batch_where_every_file_fails(tmp_path, tiny_model):
+    import export_to_csv
+    resumes = tmp_path / 'resumes'
+    resumes.mkdir()
+    (resumes / 'README').write_text('not a resume')
+    manifest = tmp_path / 'out' / 'manifest.sqlite'
+    manifest.parent.mkdir()
+    export_to_csv.run_batch(str(resumes), 'Python developer', str(manifest))
+    exports = list(manifest.parent.glob('Extracted-Resumes-*.csv'))
+    assert 1 == len(exports)
+    df = pd.read_csv(str(exports[0]))
+    assert df.empty
+    assert export_to_csv.fields + ['Score'] == list(df.columns)
+
+
+def test_cli_single_file_export(tmp_path, tiny_model, monkeypatch):
+    import sys
+    from pyresparser.command_line import ResumeParserCli
+    resume = tmp_path / 'resume.txt'
+    resume.write_text('Omkar Pathak\nomkar@example.com')
+    output = tmp_path / 'out.jsonl'
+    monkeypatch.setattr(sys, 'argv', [
+        'pyresparser', '-f', str(resume), '-e', 'jsonl', '-o', str(output)
+    ])
+    with pytest.raises(SystemExit):
+        ResumeParserCli().extract_resume_data()
+    record = json.loads(output.read_text().splitlines()[0])
+    assert str(resume) == record['file']
+    assert 'omkar@example.com' == record['email']
@@ -0,0 +1,19 @@
+from pyresparser.extraction import ExtractedText, ExtractionLimits
+
+
+def test_text_views():
+    document = ExtractedText(['Omkar  Pathak', 'Python\n SQL', ''])
+    assert ' Omkar  Pathak Python\n SQL ' == document.text
+    # the normalised text is the same as normalising the raw text
+    assert 'Omkar Pathak Python SQL' == document.normalized
+    assert ' '.join(document.text.split()) == document.normalized
+    assert '' == ExtractedText([]).text == ExtractedText([]).normalized
+
+
+def test_truncate_resets_views():
+    document = ExtractedText(['Omkar Pathak', 'Python SQL'])
+    assert 'Omkar Pathak Python SQL' == document.normalized
+    ExtractionLimits(max_chars=5).apply(document)
+    assert 'max_chars' == document.truncated
+    assert ' Omkar' == document.text
+    assert 'Omkar' == document.normalized
@@ -0,0 +1,58 @@
+import os
+from pyresparser.manifest import BatchManifest, DONE, FAILED
+
+
+def write(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_pending_skips_unchanged_done(tmp_path):
+    done = write(tmp_path, 'done.pdf', b'done')
+    failed = write(tmp_path, 'failed.pdf', b'failed')
+    new = write(tmp_path, 'new.pdf', b'new')
+    with BatchManifest(str(tmp_path / 'manifest.sqlite')) as manifest:
+        manifest.record(done, DONE, 1.5)
+        manifest.record(failed, FAILED, 0.5, 'ValueError()')
+
+    with BatchManifest(str(tmp_path / 'manifest.sqlite')) as manifest:
+        assert [failed, new] == list(manifest.pending([done, failed, new]))
+        assert 1 == manifest.stats['skipped']
+        assert {DONE: 1, FAILED: 1} == manifest.counts()
+
+
+def test_pending_compares_content(tmp_path):
+    touched = write(tmp_path, 'touched.pdf', b'same')
+    changed = write(tmp_path, 'changed.pdf', b'before')
+    manifest = BatchManifest(str(tmp_path / 'manifest.sqlite'))
+    manifest.record(touched, DONE)
+    manifest.record(changed, DONE)
+
+    stat = os.stat(touched)
+    os.utime(touched, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    with open(changed, 'wb') as fh:
+        fh.write(b'after!')
+    assert [changed] == list(manifest.pending([touched, changed]))
+    # the new modification time is kept, the next check is a stat again
+    assert manifest.is_done(touched)
+    manifest.close()
+
+
+def test_snapshot_taken_before_parsing(tmp_path):
+    resume = write(tmp_path, 'resume.pdf', b'before')
+    missing = str(tmp_path / 'missing.pdf')
+    manifest = BatchManifest(str(tmp_path / 'manifest.sqlite'))
+    assert [resume, missing] == list(manifest.pending([resume, missing]))
+    # modified while it was parsed
+    with open(resume, 'wb') as fh:
+        fh.write(b'after!')
+    manifest.record(resume, DONE)
+    manifest.record(missing, FAILED, error='FileNotFoundError()')
+    assert [resume, missing] == list(manifest.pending([resume, missing]))
+    assert {DONE: 1, FAILED: 1} == manifest.counts()
+    snapshot = manifest.snapshot(resume)
+    manifest.record(resume, DONE, snapshot=snapshot)
+    assert manifest.is_done(resume)
+    assert manifest.snapshot(missing) is None
+    manifest.close()
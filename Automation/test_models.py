@@ -0,0 +1,26 @@
+import threading
+from pyresparser import models
+
+
+def test_pipeline_loaded_once(tiny_model):
+    registry = models.ModelRegistry(tiny_model, tiny_model)
+    nlp = registry.get_nlp()
+    assert nlp is registry.get_nlp()
+    assert nlp is registry.warm_up().get_nlp()
+    registry.configure(model=tiny_model)
+    assert nlp is not registry.get_nlp()
+
+
+def test_pipeline_shared_between_threads(tiny_model):
+    registry = models.ModelRegistry(tiny_model, tiny_model)
+    loaded = []
+    threads = [
+        threading.Thread(target=lambda: loaded.append(registry.get_nlp()))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert 8 == len(loaded)
+    assert 1 == len(set(id(nlp) for nlp in loaded))
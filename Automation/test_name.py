@@ -39,3 +39,26 @@ def test_local_name():
 def test_local_phone_number():
     data = get_local_data()
     assert '8087996634' == data['mobile_number']
+
+def get_doc():
+    import spacy
+    from spacy.tokens import Doc
+    words = ['Resume', 'of', 'Omkar', 'Pathak', 'and', 'John', 'Smith']
+    pos = ['NOUN', 'ADP', 'PROPN', 'PROPN', 'CCONJ', 'PROPN', 'PROPN']
+    return Doc(spacy.blank('en').vocab, words=words, pos=pos)
+
+def test_name_matcher_is_shared():
+    from pyresparser import models
+    from pyresparser.utils import extract_name
+    doc = get_doc()
+    matcher = models.get_name_matcher(doc.vocab)
+    assert matcher is models.get_name_matcher(doc.vocab)
+    assert 'Omkar Pathak' == extract_name(doc)
+    assert 'Omkar Pathak' == extract_name(doc)
+    assert 1 == len(matcher)
+
+def test_name_window():
+    from pyresparser.utils import extract_name
+    doc = get_doc()
+    assert extract_name(doc, window=3) is None
+    assert 'Omkar Pathak' == extract_name(doc, window=4)
@@ -0,0 +1,101 @@
+import io
+import multiprocessing as mp
+from pyresparser import pdf
+from pyresparser.extraction import ExtractionLimits
+
+
+def get_buffer(make_pdf, pages):
+    buffer = io.BytesIO(make_pdf(pages))
+    buffer.name = 'resume.pdf'
+    return buffer
+
+
+def test_page_count_and_text(make_pdf):
+    document = pdf.extract_pdf(
+        get_buffer(make_pdf, [['Omkar Pathak'], ['Python']])
+    )
+    assert 2 == document.page_count
+    assert 2 == len(document.timings)
+    assert 'Omkar Pathak' in document.pages[0]
+    assert 'Python' in document.text
+
+
+def test_local_file(tmp_path, make_pdf):
+    path = tmp_path / 'resume.pdf'
+    path.write_bytes(make_pdf([['Omkar Pathak']]))
+    document = pdf.extract_pdf(str(path))
+    assert 1 == document.page_count
+    assert 'Omkar Pathak' in document.text
+
+
+def test_invalid_pdf():
+    buffer = io.BytesIO(b'not a pdf')
+    assert pdf.extract_pdf(buffer).page_count is None
+
+
+def test_number_of_pages(tmp_path, make_pdf):
+    from pyresparser.utils import get_number_of_pages
+    path = tmp_path / 'resume.pdf'
+    path.write_bytes(make_pdf([['Omkar Pathak'], ['Python'], ['Java']]))
+    assert 3 == get_number_of_pages(str(path))
+    assert 2 == get_number_of_pages(get_buffer(make_pdf, [['a'], ['b']]))
+    assert get_number_of_pages(io.BytesIO(b'not a pdf')) is None
+    assert get_number_of_pages(str(tmp_path / 'resume.docx')) is None
+
+
+def test_parallel_keeps_page_order(make_pdf):
+    data = make_pdf([['Page {}'.format(i)] for i in range(6)])
+    document = pdf.extract_pdf_parallel(
+        io.BytesIO(data),
+        threshold=2,
+        processes=2
+    )
+    pdf.shutdown_executor()
+    assert 6 == document.page_count
+    assert pdf.extract_pdf(io.BytesIO(data)).pages == document.pages
+
+
+def test_parallel_in_daemonic_worker(make_pdf):
+    data = make_pdf([['Page {}'.format(i)] for i in range(4)])
+    with mp.Pool(1) as pool:
+        document = pool.apply(
+            pdf.extract_pdf_parallel,
+            (io.BytesIO(data),),
+            {'threshold': 2}
+        )
+    assert pdf.extract_pdf(io.BytesIO(data)).pages == document.pages
+
+
+def test_parallel_out_of_time(make_pdf):
+    data = make_pdf([['Page {}'.format(i)] for i in range(6)])
+    document = pdf.extract_pdf_parallel(
+        io.BytesIO(data),
+        threshold=2,
+        processes=2,
+        limits=ExtractionLimits(max_seconds=0)
+    )
+    assert 'max_seconds' == document.truncated
+    document = pdf.extract_pdf_parallel(
+        io.BytesIO(data),
+        threshold=2,
+        processes=2
+    )
+    pdf.shutdown_executor()
+    assert 6 == len(document.pages)
+
+
+def test_limits(make_pdf):
+    pages = [['page {}'.format(i)] for i in range(5)]
+    document = pdf.extract_pdf(
+        get_buffer(make_pdf, pages),
+        limits=ExtractionLimits(max_pages=2)
+    )
+    assert 'max_pages' == document.truncated
+    assert 2 == len(document.pages)
+    assert 5 == document.page_count
+    document = pdf.extract_pdf(
+        get_buffer(make_pdf, pages),
+        limits=ExtractionLimits(max_bytes=10)
+    )
+    assert 'max_bytes' == document.truncated
+    assert '' == document.text
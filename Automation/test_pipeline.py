@@ -0,0 +1,59 @@
+import threading
+from multiprocessing.pool import Pool
+import pytest
+from pyresparser.pipeline import STAGES, StagedPipeline
+
+
+def test_staged_pipeline(tmp_path, make_pdf):
+    resumes = []
+    for index in range(6):
+        path = tmp_path / 'resume{}.pdf'.format(index)
+        path.write_bytes(make_pdf([['omkar{}@example.com'.format(index)]]))
+        resumes.append(str(path))
+    resumes.append(str(tmp_path / 'missing.pdf'))
+    (tmp_path / 'broken.pdf').write_bytes(b'not a pdf')
+    resumes.append(str(tmp_path / 'broken.pdf'))
+    pipeline = StagedPipeline(
+        readers=2,
+        extractors=2,
+        batch_size=2,
+        fields=['email']
+    )
+    with pipeline:
+        results = dict(
+            (result.resume, result) for result in pipeline.imap(resumes)
+        )
+    assert set(resumes) == set(results)
+    for index, resume in enumerate(resumes[:6]):
+        email = 'omkar{}@example.com'.format(index)
+        assert email == results[resume].data['email']
+    assert results[resumes[6]].error
+    stats = pipeline.stats
+    assert set(STAGES) == set(stats)
+    assert 8 == stats['read']['items']
+    assert 2 == stats['extract']['workers']
+    assert 0 == stats['nlp']['queue']
+
+
+def test_dispatch_failure_ends_stream(tmp_path, make_pdf, monkeypatch):
+    path = tmp_path / 'resume.pdf'
+    path.write_bytes(make_pdf([['omkar@example.com']]))
+    pipeline = StagedPipeline(readers=1, extractors=1, fields=['email'])
+    outcome = []
+
+    def run():
+        with pytest.raises(ValueError):
+            list(pipeline.imap([str(path)]))
+        outcome.append(True)
+
+    with pipeline:
+        pipeline.start()
+
+        def apply_async(*args, **kwargs):
+            raise ValueError('Pool not running')
+
+        monkeypatch.setattr(Pool, 'apply_async', apply_async)
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        thread.join(30)
+    assert [True] == outcome
@@ -0,0 +1,85 @@
+import pytest
+import spacy
+from pyresparser import plan
+
+
+def test_head():
+    text = 'Omkar  Pathak\nPython developer'
+    assert 'Omkar  Pathak' == plan.head(text, 2)
+    assert text == plan.head(text, 10)
+    assert text == plan.head(text, None)
+    assert '' == plan.head(text, 0)
+
+
+def test_nlp_options():
+    with pytest.raises(ValueError):
+        plan.NLPOptions(mode='fast')
+    assert {'tokens'} == plan.roles_for(['skills'])
+
+
+def test_tokenizer_step():
+    tokenizer = plan.Tokenizer(spacy.blank('en'))
+    execution_plan = plan.ExecutionPlan().add('tokens', tokenizer, 'text')
+    docs = list(execution_plan.pipe([{'text': 'a b'}, {'text': 'c'}]))
+    assert ['a b', 'c'] == [doc['tokens'].text for doc in docs]
+    assert 'a' == execution_plan.run({'text': 'a'})['tokens'].text
+
+
+def test_excluded_components(tmp_path):
+    from pyresparser import models
+    nlp = spacy.blank('en')
+    nlp.add_pipe('tagger').add_label('NN')
+    nlp.add_pipe('ner').add_label('NAME')
+    nlp.initialize()
+    nlp.to_disk(tmp_path)
+    assert ['ner'] == models.excluded_components(str(tmp_path), ['POS'])
+    assert ['tagger'] == models.excluded_components(str(tmp_path), ['ENT'])
+    assert [] == models.excluded_components(str(tmp_path), None)
+    loaded = models.ModelRegistry(str(tmp_path)).get_nlp()
+    assert ['tagger', 'ner'] == loaded.pipe_names
+    assert ['tagger'] == models.disabled_components(loaded, ['ENT'])
+    assert [] == models.disabled_components(loaded, None)
+
+
+def test_fallback_shares_doc(tiny_model, tmp_path):
+    from pyresparser import models
+    registry = models.ModelRegistry(tiny_model, str(tmp_path / 'missing'))
+    with pytest.warns(RuntimeWarning):
+        nlp = registry.get_custom_nlp()
+    assert nlp is registry.get_nlp()
+    execution_plan = plan.ExecutionPlan()
+    execution_plan.add('nlp', nlp, 'text', ['POS'])
+    execution_plan.add('custom_nlp', nlp, 'text', ['ENT'])
+    execution_plan.add('tokens', nlp, 'text', [])
+    assert 1 == len(execution_plan.steps)
+    docs = execution_plan.run({'text': 'Omkar Pathak works at Acme'})
+    assert docs['nlp'] is docs['custom_nlp'] is docs['tokens']
+    assert 'PROPN' == docs['nlp'][0].pos_
+    # only the tokenizer runs for a pass that reads no annotations
+    tokens = plan.ExecutionPlan().add('tokens', nlp, 'text', [])
+    doc = tokens.run({'text': 'Omkar Pathak'})['tokens']
+    assert '' == doc[0].pos_
+
+
+def test_shared_step_runs_once():
+    calls = []
+    nlp = spacy.blank('en')
+
+    @spacy.Language.component('count_calls')
+    def count_calls(doc):
+        calls.append(doc.text)
+        return doc
+
+    nlp.add_pipe('count_calls')
+    execution_plan = plan.ExecutionPlan()
+    execution_plan.add('nlp', nlp, 'text').add('custom_nlp', nlp, 'text')
+    assert 1 == len(execution_plan.steps)
+    docs = execution_plan.run({'text': 'a b'})
+    assert docs['nlp'] is docs['custom_nlp']
+    docs = list(execution_plan.pipe([{'text': 'a'}, {'text': 'b'}]))
+    assert all(doc['nlp'] is doc['custom_nlp'] for doc in docs)
+    assert ['a b', 'a', 'b'] == calls
+    # same text under another view is still processed once
+    execution_plan.add('tokens', nlp, 'text_raw')
+    execution_plan.run({'text': 'c', 'text_raw': 'c'})
+    assert ['a b', 'a', 'b', 'c'] == calls
@@ -0,0 +1,72 @@
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from pyresparser import remote, workers
+
+
+class KeepAliveHandler(SimpleHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(tmp_path):
+    httpd = ThreadingHTTPServer(
+        ('127.0.0.1', 0),
+        partial(KeepAliveHandler, directory=str(tmp_path))
+    )
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield 'http://127.0.0.1:{}/'.format(httpd.server_address[1])
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_resume_filename():
+    assert 'cv.pdf' == remote.resume_filename('http://host/a/cv.pdf?v=2')
+    assert 'cv.docx' == remote.resume_filename(
+        'http://host/cv',
+        remote.MIME_TYPES['.docx'] + '; charset=binary'
+    )
+
+
+def test_fetcher_reuses_connections(tmp_path, server):
+    for index in range(12):
+        (tmp_path / '{}.pdf'.format(index)).write_bytes(b'%PDF ' * index)
+    urls = [server + '{}.pdf'.format(index) for index in range(12)]
+    with remote.RemoteFetcher(fetchers=3) as fetcher:
+        results = list(fetcher.imap(urls + [server + 'missing.pdf']))
+        stats = fetcher.stats
+    fetched = dict((result.url, result) for result in results)
+    assert 13 == len(fetched)
+    assert b'%PDF ' * 5 == fetched[urls[5]].resume.getvalue()
+    assert '5.pdf' == fetched[urls[5]].resume.name
+    assert fetched[server + 'missing.pdf'].error
+    assert 12 == stats['downloads'] and 1 == stats['errors']
+    assert stats['sessions'] <= 3
+
+
+def test_unsupported_type(tmp_path, server):
+    (tmp_path / 'cv').write_bytes(b'%PDF ')
+    assert 'cv' == remote.resume_filename(server + 'cv')
+    with remote.RemoteFetcher(fetchers=1) as fetcher:
+        result = fetcher.fetch(server + 'cv')
+        stats = fetcher.stats
+    assert result.resume is None
+    assert 'UnsupportedType' in result.error
+    assert 1 == stats['errors']
+
+
+def test_downloads_feed_parser_pool(tmp_path, server, make_pdf):
+    (tmp_path / 'cv.pdf').write_bytes(make_pdf([['omkar@example.com']]))
+    with remote.RemoteFetcher(fetchers=2) as fetcher, \
+            workers.ParserPool(processes=2, fields=['email']) as pool:
+        resumes = (
+            fetched.resume for fetched in fetcher.imap([server + 'cv.pdf'])
+        )
+        results = list(pool.imap(resumes, ordered=False))
+    assert [server + 'cv.pdf'] == [result.resume for result in results]
+    assert 'omkar@example.com' == results[0].data['email']
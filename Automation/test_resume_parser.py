@@ -0,0 +1,113 @@
+import io
+from pyresparser import ResumeParser
+from pyresparser.cache import ResultCache
+
+
+def text_resume(text, name='resume.txt'):
+    resume = io.BytesIO(text.encode('utf-8'))
+    resume.name = name
+    return resume
+
+
+def get_resumes(count):
+    return [
+        text_resume('Candidate {0}\ncandidate{0}@example.com'.format(index))
+        for index in range(count)
+    ]
+
+
+def test_parse_many_keeps_input_order():
+    results = list(ResumeParser.parse_many(
+        get_resumes(7),
+        fields=['email'],
+        batch_size=3
+    ))
+    assert ['candidate{}@example.com'.format(index) for index in range(7)] \
+        == [data['email'] for data in results]
+
+
+def test_parse_many_skips_cached(tmp_path, tiny_model):
+    cache = ResultCache(str(tmp_path / 'cache'))
+    first = list(ResumeParser.parse_many(
+        get_resumes(3)[1:],
+        fields=['email', 'name'],
+        cache=cache
+    ))
+    assert 2 == cache.stats['misses']
+    results = list(ResumeParser.parse_many(
+        get_resumes(3),
+        fields=['email', 'name'],
+        cache=cache
+    ))
+    assert 2 == cache.stats['hits']
+    assert first == results[1:]
+    assert 'candidate0@example.com' == results[0]['email']
+
+
+def test_parse_many_with_processes(tiny_model):
+    resumes = get_resumes(6)
+    expected = [
+        ResumeParser(resume, fields=['email', 'name']).get_extracted_data()
+        for resume in get_resumes(6)
+    ]
+    results = list(ResumeParser.parse_many(
+        resumes,
+        fields=['email', 'name'],
+        batch_size=2,
+        n_process=2
+    ))
+    assert expected == results
+
+
+def test_only_requested_fields(tmp_path):
+    from pyresparser import models
+    previous = models.registry.model
+    # regex and section fields never load a model
+    models.configure(model=str(tmp_path / 'missing'))
+    try:
+        resume = text_resume(
+            'Omkar Pathak\nomkar@example.com\n'
+            'Experience\nEngineer at Acme Jan 2015 to Mar 2018'
+        )
+        data = ResumeParser(
+            resume,
+            fields=['email', 'total_experience']
+        ).get_extracted_data()
+    finally:
+        models.configure(model=previous)
+    assert 'omkar@example.com' == data['email']
+    assert 3.17 == data['total_experience']
+    assert [None] * 9 == [
+        value for field, value in data.items()
+        if field not in ('email', 'total_experience')
+    ]
+
+
+def test_resume_result_wrapper(tiny_model):
+    from pyresparser.resume_parser import resume_result_wrapper
+    data = resume_result_wrapper(get_resumes(1)[0])
+    assert ResumeParser(get_resumes(1)[0]).get_extracted_data() == data
+    assert 'candidate0@example.com' == data['email']
+
+
+def test_parse_documents_survives_bad_document(tiny_model):
+    from pyresparser import models
+    from pyresparser.extraction import ExtractedText
+    models.get_nlp().max_length = 200
+    texts = [
+        'Candidate {0}\ncandidate{0}@example.com'.format(index)
+        for index in range(6)
+    ]
+    # longer than spaCy accepts, in the middle of the first batch
+    texts[2] = 'candidate2@example.com ' + 'word ' * 100
+    results = list(ResumeParser.parse_documents(
+        ((index, ExtractedText([text])) for index, text in enumerate(texts)),
+        fields=['name', 'email', 'skills'],
+        batch_size=4
+    ))
+    assert list(range(6)) == [resume for resume, _, _ in results]
+    assert 'E088' in results[2][2] and results[2][1] is None
+    assert [
+        'candidate{}@example.com'.format(index)
+        for index in range(6) if index != 2
+    ] == [data['email'] for _, data, _ in results if data is not None]
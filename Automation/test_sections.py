@@ -0,0 +1,38 @@
+from pyresparser.sections import SectionSegmenter, get_segmenter
+from pyresparser.utils import extract_entity_sections_grad
+
+TEXT = '''John Smith
+Career Objective:
+Build things
+PROFESSIONAL EXPERIENCE
+Software Engineer at Acme Jan 2015 to Mar 2018
+Worked on projects with a lot of experience in many teams
+Education
+B.E. Computer Engineering
+'''
+
+
+def test_segment_offsets():
+    sections = get_segmenter().segment(TEXT)
+    assert ['objective', 'experience', 'education'] == [
+        section.name for section in sections
+    ]
+    body = TEXT[sections[1].start:sections[1].end]
+    assert body.startswith('Software Engineer')
+    assert body.endswith('many teams\n')
+
+
+def test_long_lines_are_not_headers():
+    entities = extract_entity_sections_grad(TEXT)
+    assert [
+        'Software Engineer at Acme Jan 2015 to Mar 2018',
+        'Worked on projects with a lot of experience in many teams'
+    ] == entities['experience']
+    assert ['B.E. Computer Engineering'] == entities['education']
+
+
+def test_custom_headers():
+    segmenter = SectionSegmenter({'employment history': 'experience'})
+    entities = segmenter.extract('Employment History\nAcme\nEducation\nX')
+    assert {'experience': ['Acme', 'Education', 'X']} == entities
+    assert segmenter.match_header('Skills') is None
@@ -0,0 +1,73 @@
+import os
+import spacy
+from pyresparser.skills import PhraseAutomaton, SkillsIndex, load_skills
+
+
+def test_index_normalises_skills():
+    index = SkillsIndex(['Python', ' machine   learning', ''])
+    assert 2 == len(index)
+    assert 'PYTHON' in index
+    assert frozenset(['machine learning']) == index.phrases
+
+
+def test_extract():
+    nlp = spacy.blank('en')
+    doc = nlp('Python and machine learning')
+    index = SkillsIndex(['python', 'machine learning'])
+    assert ['Machine learning', 'Python'] == sorted(
+        index.extract(doc, [doc[2:4]])
+    )
+
+
+def test_phrases_found_anywhere():
+    nlp = spacy.blank('en')
+    doc = nlp('Built\nmachine learning and object-oriented design on '
+              'asp.net core')
+    index = SkillsIndex([
+        'machine learning',
+        'object-oriented design',
+        'learning and',
+        'net core'
+    ])
+    assert [
+        'Learning and',
+        'Machine learning',
+        'Object-oriented design'
+    ] == sorted(index.extract(doc))
+
+
+def test_punctuated_skills():
+    nlp = spacy.blank('en')
+    doc = nlp('I used django-suit, scikit-learn and C# with Python')
+    index = SkillsIndex(['django', 'django-suit', 'scikit-learn', 'c#',
+                         'python'])
+    assert {'django-suit', 'scikit-learn', 'c#'} <= index.phrases
+    # the tokenizer splits these skills into several tokens
+    assert [
+        'C#',
+        'Django',
+        'Django-suit',
+        'Python',
+        'Scikit-learn'
+    ] == sorted(index.extract(doc))
+
+
+def test_automaton_overlapping_phrases():
+    automaton = PhraseAutomaton(['a b c', 'b c d', 'c'])
+    words = ['a', 'b', 'c', 'd']
+    assert {'a b c', 'b c d', 'c'} == automaton.search(
+        words,
+        [True] * 4,
+        [True] * 4
+    )
+
+
+def test_load_skills_is_cached_by_mtime(tmp_path):
+    path = tmp_path / 'skills.csv'
+    path.write_text('python,java\n')
+    index = load_skills(str(path))
+    assert index is load_skills(str(path))
+    path.write_text('python,java,rust\n')
+    os.utime(str(path), ns=(0, 0))
+    assert 'rust' in load_skills(str(path))
+    assert 'python' in load_skills()
@@ -0,0 +1,58 @@
+from pyresparser import workers
+
+
+def test_chunksize():
+    assert 1 == workers.get_chunksize(3, 4)
+    assert 4 == workers.get_chunksize(64, 4)
+    assert workers.MAX_CHUNKSIZE == workers.get_chunksize(10 ** 6, 4)
+
+
+def test_parser_pool(tmp_path, make_pdf):
+    resumes = []
+    for index in range(3):
+        path = tmp_path / 'resume{}.pdf'.format(index)
+        path.write_bytes(make_pdf([['Omkar Pathak', 'omkar@example.com']]))
+        resumes.append(str(path))
+    resumes.append(str(tmp_path / 'missing.pdf'))
+    pool = workers.ParserPool(processes=2, fields=['email'])
+    with pool:
+        results = list(pool.imap(resumes))
+    assert resumes == [result.resume for result in results]
+    assert ['omkar@example.com'] * 3 == [
+        result.data['email'] for result in results[:3]
+    ]
+    assert results[3].data is None and results[3].error
+    assert 4 == sum(stats['resumes'] for stats in pool.stats.values())
+    assert '4 resumes' in pool.report()
+
+
+def test_streaming_unordered(tmp_path, make_pdf):
+    data = make_pdf([['omkar@example.com']])
+    for index in range(10):
+        (tmp_path / '{}.pdf'.format(index)).write_bytes(data)
+    pool = workers.ParserPool(processes=2, fields=['email'], chunksize=1)
+    with pool:
+        results = list(pool.imap(
+            workers.iter_resumes(str(tmp_path)),
+            ordered=False
+        ))
+    assert 10 == len(results)
+    assert {'omkar@example.com'} == set(
+        result.data['email'] for result in results
+    )
+
+
+def test_parser_pool_reports_cache(tmp_path, tiny_model):
+    resume = tmp_path / 'resume.txt'
+    resume.write_text('Omkar Pathak\nomkar@example.com')
+    pool = workers.ParserPool(
+        processes=1,
+        fields=['email'],
+        cache_dir=str(tmp_path / 'cache')
+    )
+    with pool:
+        list(pool.imap([str(resume)]))
+        list(pool.imap([str(resume)]))
+    assert 1 == pool.cache_stats['hits']
+    assert 1 == pool.cache_stats['misses']
+    assert 'cache: 1 hits, 1 misses, 1 writes' in pool.report()